@@ -2,32 +2,99 @@
 
 import asyncio
 import logging
+import struct
+from collections.abc import Callable
 from datetime import timedelta
+from time import monotonic, time
+from typing import Any
 
 # Import pro ASYNCHRONNÍ Modbus komunikaci
-from pymodbus.client import AsyncModbusTcpClient # Používáme Async klienta
 from pymodbus.exceptions import ConnectionException, ModbusIOException
-from pymodbus.payload import BinaryPayloadDecoder, BinaryPayloadBuilder
-from pymodbus.constants import Endian
 
 # Importy z Home Assistant Core
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    CONF_HOST,
-    CONF_PORT,
-    CONF_SCAN_INTERVAL,
     CONF_SLAVE
 )
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
 
 # Importy z naší integrace (.const)
 from .const import (
     DOMAIN,
-    SENSOR_DESCRIPTIONS,
+    CONF_MAX_REGISTER_GAP,
+    DEFAULT_MAX_REGISTER_GAP,
+    DEFAULT_SCAN_INTERVALS,
+    CONF_SCAN_FLOOR_SUFFIX,
+    CONF_SCAN_CEILING_SUFFIX,
+    DEFAULT_SCAN_FLOORS,
+    DEFAULT_SCAN_CEILINGS,
+    ADAPTIVE_STATUS_KEY,
+    ADAPTIVE_STANDBY_STATUSES,
+    ADAPTIVE_POWER_KEY,
+    ADAPTIVE_RAMP_RATE,
+    ADAPTIVE_STABLE_TOLERANCE,
+    ADAPTIVE_WRITE_BOOST,
+    ALWAYS_POLLED_KEYS,
+    PROFILE_SERIAL_KEY,
+    PROFILE_FIRMWARE_KEY,
+    CONF_MAX_IN_FLIGHT,
+    DEFAULT_MAX_IN_FLIGHT,
+    CONF_REQUEST_TIMEOUT,
+    DEFAULT_REQUEST_TIMEOUT,
+    CONF_WRITE_DEBOUNCE,
+    DEFAULT_WRITE_DEBOUNCE,
+    CONF_HISTORY_SIZE,
+    DEFAULT_HISTORY_SIZE,
+    CONF_STATE_INTERVAL,
+    DEFAULT_STATE_INTERVAL,
+    SCAN_GROUP_REALTIME,
+    CONF_ENERGY_STATISTICS,
+    DEFAULT_ENERGY_STATISTICS,
+    MODBUS_MAX_WRITE_REGISTERS,
+    MODBUS_REJECT_EXCEPTION_CODES,
+    PROFILE_CONFIRM_READS,
     RW_REGISTER_MAP,
+    SENSOR_DESCRIPTIONS,
+    DERIVED_SENSOR_DESCRIPTIONS,
+    DIAGNOSTIC_SENSOR_DESCRIPTIONS,
+    KEEPALIVE_INTERVAL,
+    KEEPALIVE_ADDRESS,
+    SERVICE_WRITE_SETTINGS,
+    SERVICE_GET_SAMPLES,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_VALUES,
+    ATTR_KEYS,
+    ATTR_WINDOW,
 )
+from .bus import async_acquire_bus, async_release_bus
+from .metrics import (
+    PDU_ERROR_RESPONSE,
+    PDU_READ_REQUEST,
+    PDU_READ_RESPONSE,
+    PDU_WRITE_MULTIPLE_REQUEST,
+    PDU_WRITE_MULTIPLE_RESPONSE,
+    PDU_WRITE_SINGLE,
+    PollMetrics,
+)
+from .transport import TransportConfig
+from .pipeline import RequestExpired
+from .planner import ReadBlock, RegisterRange, encode_value, plan_read_blocks
+from .profiles import async_get_profile_cache, profile_key
+from .quarantine import RegisterQuarantine
+from .write_queue import WriteCoalescer
+from .register_index import REGISTER_INDEX
+from .value_store import ValueStore
+from .timeseries import SampleHistory
+from .derived import DerivedValues
+from .energy import EnergyAccumulator, async_remove_energy_state
+from .scheduler import ACTIVITY_BUSY, ACTIVITY_IDLE, ACTIVITY_NORMAL, ScanGroupScheduler
 
 # Nastavení loggeru
 _LOGGER = logging.getLogger(__name__)
@@ -35,17 +102,120 @@ _LOGGER = logging.getLogger(__name__)
 # Platformy
 PLATFORMS = ["sensor", "switch", "number"] # Upravte podle potřeby
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+def _valid_write_values(values: dict[str, Any]) -> dict[str, Any]:
+    """Ověří zapisované hodnoty podle RW_REGISTER_MAP (typ entity, min/max, rozsah datového typu)."""
+    for key, value in values.items():
+        params = RW_REGISTER_MAP[key]
+        if params["type"] == "switch":
+            if not isinstance(value, bool) and value not in params["write_map"].values():
+                raise vol.Invalid(f"'{key}' přijímá jen true/false", path=[key])
+            continue
+        if isinstance(value, bool):
+            raise vol.Invalid(f"'{key}' očekává číslo, ne true/false", path=[key])
+        if params["type"] == "select" and value != int(value):
+            raise vol.Invalid(f"'{key}' očekává celé číslo, ne {value}", path=[key])
+        min_value, max_value = params.get("min_value"), params.get("max_value")
+        if (min_value is not None and value < min_value) or (max_value is not None and value > max_value):
+            raise vol.Invalid(f"Hodnota {value} pro '{key}' je mimo rozsah {min_value} až {max_value}", path=[key])
+        slot = REGISTER_INDEX.slot_by_key[key]
+        try:
+            encode_value(REGISTER_INDEX.data_types[slot], REGISTER_INDEX.scales[slot], value)
+        except ValueError as e:
+            raise vol.Invalid(f"Hodnotu {value} pro '{key}' nelze zapsat: {e}", path=[key]) from e
+    return values
+
+WRITE_SETTINGS_SCHEMA = vol.Schema({
+    vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Required(ATTR_VALUES): vol.All(
+        {vol.In(list(RW_REGISTER_MAP)): vol.Any(bool, vol.Coerce(float))},
+        vol.Length(min=1),
+        _valid_write_values, # Hodnota mimo rozsah se nezapíše, služba skončí chybou
+    ),
+})
+
+GET_SAMPLES_SCHEMA = vol.Schema({
+    vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_KEYS): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_WINDOW): vol.All(vol.Coerce(float), vol.Range(min=0)), # posledních N sekund
+})
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Registruje služby integrace."""
+    hass.data.setdefault(DOMAIN, {})
+
+    def get_coordinator(call: ServiceCall) -> "SunwayFveCoordinator":
+        """Coordinator záznamu ze služby."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        coordinator = hass.data[DOMAIN].get(entry_id)
+        if coordinator is None:
+            raise HomeAssistantError(f"Sunway FVE záznam {entry_id} nebyl nalezen")
+        return coordinator
+
+    async def async_handle_write_settings(call: ServiceCall) -> None:
+        """Zapíše více RW hodnot jednou dávkou."""
+        coordinator = get_coordinator(call)
+        if not await coordinator.async_write_values(call.data[ATTR_VALUES]):
+            raise HomeAssistantError(f"Zápis hodnot {call.data[ATTR_VALUES]} selhal")
+
+    async def async_handle_get_samples(call: ServiceCall) -> ServiceResponse:
+        """Vrátí surové vzorky realtime hodnot z paměťové historie."""
+        return get_coordinator(call).get_samples(call.data.get(ATTR_KEYS), call.data.get(ATTR_WINDOW))
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_WRITE_SETTINGS, async_handle_write_settings, schema=WRITE_SETTINGS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_GET_SAMPLES, async_handle_get_samples,
+        schema=GET_SAMPLES_SCHEMA, supports_response=SupportsResponse.ONLY,
+    )
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Nastaví Sunway FVE z konfiguračního záznamu."""
     hass.data.setdefault(DOMAIN, {})
-    host = entry.data[CONF_HOST]
-    port = entry.data[CONF_PORT]
+    transport = TransportConfig.from_entry_data(entry.data)
     slave_id = entry.data[CONF_SLAVE]
-    scan_interval = timedelta(seconds=entry.data.get(CONF_SCAN_INTERVAL, 30))
+    await async_migrate_unique_ids(hass, entry, transport.host or transport.serial_port, slave_id)
+    # Intervaly jednotlivých skenovacích skupin z Options
+    scan_intervals = {
+        group: entry.options.get(group, default_interval)
+        for group, default_interval in DEFAULT_SCAN_INTERVALS.items()
+    }
+    # Meze adaptivního intervalu (floor/ceiling) nestatických skupin
+    scan_floors = {
+        group: entry.options.get(group + CONF_SCAN_FLOOR_SUFFIX, default_floor)
+        for group, default_floor in DEFAULT_SCAN_FLOORS.items()
+    }
+    scan_ceilings = {
+        group: entry.options.get(group + CONF_SCAN_CEILING_SUFFIX, default_ceiling)
+        for group, default_ceiling in DEFAULT_SCAN_CEILINGS.items()
+    }
+    max_register_gap = entry.options.get(CONF_MAX_REGISTER_GAP, DEFAULT_MAX_REGISTER_GAP)
+    max_in_flight = entry.options.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT)
+    request_timeout = entry.options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT)
+    write_debounce = entry.options.get(CONF_WRITE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE)
+    history_size = entry.options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE)
+    state_interval = entry.options.get(CONF_STATE_INTERVAL, DEFAULT_STATE_INTERVAL)
+    energy_statistics = entry.options.get(CONF_ENERGY_STATISTICS, DEFAULT_ENERGY_STATISTICS)
 
-    _LOGGER.info(f"Nastavuje se integrace Sunway FVE pro {host}:{port} (Slave ID: {slave_id}) s ASYNC klientem")
+    _LOGGER.info(
+        f"Nastavuje se integrace Sunway FVE pro {transport.endpoint} ({transport.transport}, Slave ID: {slave_id}) s ASYNC klientem"
+    )
 
-    coordinator = SunwayFveCoordinator(hass, host, port, slave_id, scan_interval, entry.entry_id)
+    coordinator = SunwayFveCoordinator(
+        hass, transport, slave_id, scan_intervals, entry.entry_id,
+        scan_floors=scan_floors,
+        scan_ceilings=scan_ceilings,
+        max_register_gap=max_register_gap,
+        max_in_flight=max_in_flight,
+        request_timeout=request_timeout,
+        write_debounce=write_debounce,
+        history_size=history_size,
+        state_interval=state_interval,
+        energy_statistics=energy_statistics,
+    )
 
     try:
         await coordinator.async_config_entry_first_refresh()
@@ -60,6 +230,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.info(f"Sunway FVE integrace pro {entry.title} byla úspěšně nastavena (async).")
     return True
 
+def entity_unique_id_prefix(host: str, slave_id: int) -> str:
+    """Prefix unique_id entit zařízení (následuje klíč hodnoty)."""
+    return f"{DOMAIN}_{host}_{slave_id}_"
+
+async def async_migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry, host: str, slave_id: int) -> None:
+    """Doplní slave ID do unique_id entit ze starších verzí (jen host a klíč)."""
+    old_prefix = f"{DOMAIN}_{host}_"
+    new_prefix = entity_unique_id_prefix(host, slave_id)
+    keys = (
+        set(REGISTER_INDEX.keys)
+        | {desc.key for desc in DERIVED_SENSOR_DESCRIPTIONS}
+        | {desc.key for desc in DIAGNOSTIC_SENSOR_DESCRIPTIONS}
+    )
+
+    @callback
+    def migrate(entity: er.RegistryEntry) -> dict[str, Any] | None:
+        key = entity.unique_id[len(old_prefix):]
+        if not entity.unique_id.startswith(old_prefix) or key not in keys:
+            return None # Nový formát nebo cizí entita
+        _LOGGER.debug(f"Migruji unique_id {entity.unique_id} -> {new_prefix}{key}")
+        return {"new_unique_id": f"{new_prefix}{key}"}
+
+    await er.async_migrate_entries(hass, entry.entry_id, migrate)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Odstraní konfigurační záznam."""
     _LOGGER.info(f"Odebírám integraci Sunway FVE pro {entry.title} (async)")
@@ -76,6 +270,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Smaže uložená data záznamu (karanténu registrů, stav čítačů energie)."""
+    await RegisterQuarantine(hass, entry.entry_id).async_remove()
+    await async_remove_energy_state(hass, entry.entry_id)
+
 async def options_update_listener(hass: HomeAssistant, entry: ConfigEntry):
     """Handle options update."""
     _LOGGER.debug(f"Aktualizuji konfiguraci pro {entry.title} (async)")
@@ -85,206 +284,893 @@ async def options_update_listener(hass: HomeAssistant, entry: ConfigEntry):
 class SunwayFveCoordinator(DataUpdateCoordinator):
     """ASYNC Coordinator pro získávání dat ze Sunway FVE."""
 
-    def __init__(self, hass: HomeAssistant, host: str, port: int, slave_id: int, scan_interval: timedelta, entry_id: str):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        transport: TransportConfig,
+        slave_id: int,
+        scan_intervals: dict[str, int],
+        entry_id: str,
+        scan_floors: dict[str, int] | None = None,
+        scan_ceilings: dict[str, int] | None = None,
+        max_register_gap: int = DEFAULT_MAX_REGISTER_GAP,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        write_debounce: float = DEFAULT_WRITE_DEBOUNCE,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        state_interval: float = DEFAULT_STATE_INTERVAL,
+        energy_statistics: bool = DEFAULT_ENERGY_STATISTICS,
+    ):
         """Inicializace async coordinatora."""
         _LOGGER.debug(f"Initializing ASYNC SunwayFveCoordinator for {entry_id}")
+        # Každá skenovací skupina má vlastní interval; coordinator se probouzí
+        # vždy jen k nejbližšímu čtení některé skupiny. Interval se přizpůsobuje
+        # aktivitě (FV výkon, running_status, změny hodnot) mezi floor a ceiling.
+        self._scheduler = ScanGroupScheduler(scan_intervals, floors=scan_floors, ceilings=scan_ceilings)
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN} ({entry_id})_async",
-            update_interval=scan_interval,
+            update_interval=timedelta(seconds=min(scan_intervals.values())),
         )
         self.hass = hass # Uložíme si hass pro pozdější použití v _read_registers
-        self.host = host
-        self.port = port
+        self.transport = transport
+        # host slouží i jako identifikátor zařízení; u sériové linky je to port
+        self.host = transport.host or transport.serial_port
+        self.port = transport.port
         self.slave_id = slave_id
+        # Prefix unique_id entit - slave ID rozliší střídače za jednou bránou
+        self.unique_id_prefix = entity_unique_id_prefix(self.host, slave_id)
         self.entry_id = entry_id
-        # Zvýšíme timeout pro jistotu na 10s
-        self._client = AsyncModbusTcpClient(host, port=port, timeout=10)
-        self._lock = asyncio.Lock()
+        # Spojení je sdílené se všemi záznamy na stejném endpointu (více slave ID
+        # za jednou bránou); fronta je mezi nimi střídá po jednotlivých požadavcích
+        self._bus = async_acquire_bus(hass, transport, entry_id, max_in_flight, request_timeout)
+        self._client = self._bus.client
+        self._connection = self._bus.connection
+        # Po obnově spojení se statické údaje (SN, firmware) čtou znovu
+        self._reconnects_seen = self._connection.reconnects
+        self._pipeline = self._bus.pipeline
+        self._lock = asyncio.Lock() # jeden cyklus čtení najednou
+        # Zápisy nečekají na cyklus čtení: mají vlastní zámek (dávky zápisů se nepřekrývají)
+        # a ve frontě předbíhají čekající bloky cyklu
+        self._write_lock = asyncio.Lock()
+        # Registry zapsané během právě běžícího cyklu (None = cyklus neběží)
+        self._cycle_writes: list[tuple[int, int]] | None = None
+        # Zápisy number entit se v okně write_debounce sdružují do jedné dávky
+        self._write_queue = WriteCoalescer(hass, self.async_write_values, self.value_confirmed, write_debounce)
+        # Plán čtení: souvislé bloky registrů místo jednoho požadavku na senzor.
+        # Plány se sestavují pro každou kombinaci právě čtených skupin a cachují se.
+        # Popisy hodnot bere coordinator ze sdíleného zkompilovaného indexu.
+        self._index = REGISTER_INDEX
+        # Hodnoty drží předalokované úložiště aktualizované na místě; coordinator.data
+        # je po prvním refreshi vždy tento objekt a entity čtou přímo svůj slot
+        self._store = ValueStore(self._index)
+        # Odvozené hodnoty (součty, poměry) se přepočítají jednou za cyklus z úložiště
+        self.derived = DerivedValues(self._index, DERIVED_SENSOR_DESCRIPTIONS)
+        # Entity s context = slot (nebo klíč odvozené hodnoty) se budí jen při změně
+        # svého slotu; ostatní při každé aktualizaci.
+        # Jednou za heartbeat (nejkratší max_state_age) se upozorní všechny entity.
+        self._slot_listeners: dict[int | str, list[Callable[[], None]]] = {}
+        self._unslotted_listeners: list[Callable[[], None]] = []
+        self._notified_success: bool | None = None
+        self.heartbeat = min(desc.max_state_age for desc in SENSOR_DESCRIPTIONS)
+        self.full_dispatch = False # True během upozornění všech entit (heartbeat, změna dostupnosti)
+        self._next_full_dispatch = 0.0
+        # Kruhový buffer vzorků číselných realtime hodnot; entity s historií zapisují
+        # stav nejvýše jednou za state_interval (s min/max/průměrem za interval)
+        self.history = SampleHistory(
+            [
+                slot
+                for slot in self._index.group_slots.get(SCAN_GROUP_REALTIME, ())
+                if self._index.data_types[slot] != "STR"
+            ],
+            history_size,
+        ) if history_size else None
+        self.state_interval = state_interval
+        self._next_history_dispatch = 0.0
+        # Čítače energie se sčítají s kontrolou nulování a chybných čtení;
+        # hodinové součty jdou do HA jako externí statistiky
+        self.energy = EnergyAccumulator(
+            hass,
+            entry_id,
+            f"{self.host}_{self.slave_id}",
+            self._index,
+            [
+                desc for desc in SENSOR_DESCRIPTIONS
+                if desc.state_class == SensorStateClass.TOTAL_INCREASING and desc.device_class == SensorDeviceClass.ENERGY
+            ],
+        ) if energy_statistics else None
+        self._max_register_gap = max_register_gap
+        self._read_plans: dict[frozenset[str], list[ReadBlock]] = {}
+        # Sloty zakázaných entit se vynechají z plánu čtení; při změně v registru
+        # entit (zakázání/povolení, vytvoření, odebrání) se plány sestaví znovu
+        self._always_polled = {self._index.slot_by_key[key] for key in ALWAYS_POLLED_KEYS}
+        self._disabled_slots: set[int] = set()
+        # Rozsahy, které zařízení nepodporuje (profil podle SN/firmwaru, viz profiles.py),
+        # a rozsahy v karanténě po odmítnutí (quarantine.py); plán čtení je obchází
+        self._unsupported_ranges: list[RegisterRange] = []
+        self._quarantine = RegisterQuarantine(hass, entry_id)
+        self._avoided_ranges: list[RegisterRange] = []
+        self._skipped_slots: set[int] = set() # zakázané + hodnoty v obcházených rozsazích
+        self._profile_cache = async_get_profile_cache(hass)
+        self._profile_checked = False
+        self.async_update_disabled_slots()
+        self._unsub_entity_registry = hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED,
+            self._async_entity_registry_updated,
+            event_filter=self._disabled_by_changed,
+        )
+        # Metriky cyklů pro diagnostické entity a stažení diagnostiky
+        self.metrics = PollMetrics()
+        self._failed_blocks: set[RegisterRange] = set()
+        self._rejected_blocks: set[RegisterRange] = set() # zařízení vrátilo chybovou odpověď (ne timeout)
+        # Keepalive: levné čtení jednoho registru drží spojení a odhalí polootevřený socket
+        self._keepalive_block = ReadBlock(address=KEEPALIVE_ADDRESS, count=1)
+        self._unsub_keepalive = async_track_time_interval(
+            hass, self._async_keepalive, timedelta(seconds=KEEPALIVE_INTERVAL)
+        )
         _LOGGER.debug(f"ASYNC SunwayFveCoordinator initialization finished for {entry_id}")
 
     async def _ensure_connection(self) -> bool:
         """Zajistí, že klient je připojen (voláno z async metod)."""
-        if not self._client.connected:
-            _LOGGER.info(f"Async Modbus klient není připojen, pokouším se připojit k {self.host}:{self.port}")
-            try:
-                await self._client.connect()
-                return self._client.connected
-            except Exception as e:
-                _LOGGER.warning(f"Selhalo připojení Async Modbus klienta: {e}", exc_info=True)
-                return False
-        return True
+        return await self._connection.async_ensure_connected()
+
+    async def _async_keepalive(self, _now) -> None:
+        """Udržuje spojení při nečinnosti a po výpadku zkouší obnovu."""
+        if self._connection.known_down:
+            return
+        if not self._connection.connected:
+            await self._connection.async_ensure_connected()
+            return
+        if self._connection.idle_for >= KEEPALIVE_INTERVAL:
+            _LOGGER.debug(f"Keepalive čtení pro {self.transport.endpoint}")
+            await self._read_block(self._keepalive_block)
 
     async def async_shutdown(self) -> None:
-        """Zavře Modbus spojení při ukončení."""
-        _LOGGER.info("Async Coordinator shutdown - Zavírám Modbus spojení.")
-        if self._client.connected:
-             self._client.close()
+        """Uvolní sdílené Modbus spojení při ukončení (poslední záznam ho zavře)."""
+        _LOGGER.info("Async Coordinator shutdown - Uvolňuji Modbus spojení.")
+        # Čekající dávku zápisů ještě odešleme
+        await self._write_queue.async_flush()
+        # Shutdown může proběhnout dvakrát (unload + async_on_unload) - odhlášení jen jednou
+        for unsub in (self._unsub_keepalive, self._unsub_entity_registry):
+            if unsub is not None:
+                unsub()
+        self._unsub_keepalive = self._unsub_entity_registry = None
+        async_release_bus(self.hass, self._bus, self.entry_id)
         await super().async_shutdown()
 
-    async def _read_registers(self, address: int, count: int, data_type: str, scale: float, read_func) -> any:
-        """Pomocná ASYNC funkce pro čtení a dekódování registrů."""
-        # read_func je nyní předána z _async_update_data
+    @callback
+    def async_update_disabled_slots(self) -> None:
+        """Zjistí z registru entit sloty zakázaných entit a případně zahodí plány čtení."""
+        prefix = self.unique_id_prefix
+        disabled = set()
+        disabled_derived = set()
+        for entity in er.async_entries_for_config_entry(er.async_get(self.hass), self.entry_id):
+            if entity.disabled_by is None or not entity.unique_id.startswith(prefix):
+                continue
+            key = entity.unique_id[len(prefix):]
+            slot = self._index.slot_by_key.get(key)
+            if slot is not None and slot not in self._always_polled:
+                disabled.add(slot)
+            elif key in self.derived.slot_by_key:
+                disabled_derived.add(key)
+        # Vstupy povolených odvozených hodnot se čtou, i když je jejich vlastní entita zakázaná
+        disabled -= self.derived.input_slots(key for key in self.derived.keys if key not in disabled_derived)
+        if disabled == self._disabled_slots:
+            return
+        _LOGGER.debug(f"Zakázané entity pro {self.entry_id}: {len(disabled)} hodnot se nebude číst")
+        self._disabled_slots = disabled
+        self._update_skipped_slots()
+
+    @callback
+    def _update_skipped_slots(self) -> None:
+        """Sloučí zakázané sloty s nepodporovanými a karanténními rozsahy; při změně zahodí plány čtení."""
+        avoided = self._unsupported_ranges + self._quarantine.active_ranges(time())
+        skipped = self._disabled_slots.union(
+            *(self._index.slots_overlapping(register_type, address, address + count)
+              for register_type, address, count in avoided)
+        )
+        if skipped == self._skipped_slots and avoided == self._avoided_ranges:
+            return
+        # Hodnoty, které se přestanou číst, by jinak zůstaly viset jako platné
+        for slot in skipped - self._skipped_slots:
+            self._store.invalidate(slot)
+        self._skipped_slots = skipped
+        self._avoided_ranges = avoided
+        self._read_plans.clear()
+
+    @callback
+    def _disabled_by_changed(self, event_data) -> bool:
+        """Filtr událostí registru entit - jen změny, které mohou ovlivnit plán čtení."""
+        # HA 2024.4+ předává filtru data události, starší verze celou událost
+        event_data = getattr(event_data, "data", event_data)
+        return event_data["action"] != "update" or "disabled_by" in event_data.get("changes", {})
+
+    @callback
+    def _async_entity_registry_updated(self, event) -> None:
+        """Přepočítá zakázané sloty po změně v registru entit."""
+        self.async_update_disabled_slots()
+
+    def _read_plan_for(self, groups: list[str]) -> list[ReadBlock]:
+        """Vrátí (cachovaný) plán bloků pro dané skenovací skupiny (bez vynechaných slotů)."""
+        plan_key = frozenset(groups)
+        read_plan = self._read_plans.get(plan_key)
+        if read_plan is None:
+            read_plan = plan_read_blocks(
+                [
+                    self._index.specs[slot]
+                    for group in plan_key
+                    for slot in self._index.group_slots.get(group, ())
+                    if slot not in self._skipped_slots
+                ],
+                max_gap=self._max_register_gap,
+                avoid=self._avoided_ranges,
+            )
+            self._read_plans[plan_key] = read_plan
+            _LOGGER.debug(f"Plán čtení pro skupiny {sorted(plan_key)}: {len(read_plan)} bloků")
+        return read_plan
+
+    async def _read_block(
+        self, block: ReadBlock, deadline: float | None = None, priority: bool = False
+    ) -> list[int] | None:
+        """Přečte jeden souvislý blok registrů ASYNCHRONNĚ přes frontu požadavků."""
+        # Input registry (0x04) a holding registry (0x03) se čtou různými funkcemi
+        if block.register_type == "input":
+            read_func = self._client.read_input_registers
+        else:
+            read_func = self._client.read_holding_registers
+        block_id = block.register_range
+        if block_id in self._failed_blocks:
+            self.metrics.retries += 1
+        overhead = self.transport.frame_overhead
+        loop = asyncio.get_running_loop()
+        started = loop.time()
         try:
             _LOGGER.debug(
-                f"Attempting ASYNC read: Func={read_func.__name__}, Address={address}, Count={count}, SlaveID={self.slave_id}"
+                f"Attempting ASYNC block read: Func={read_func.__name__}, Address={block.address}, Count={block.count}, SlaveID={self.slave_id}"
             )
             # Používáme explicitní pojmenování argumentů
-            result = await read_func(address=address, count=count, slave=self.slave_id)
+            result = await self._pipeline.submit(
+                lambda: read_func(address=block.address, count=block.count, slave=self.slave_id),
+                deadline=deadline,
+                lane=self.slave_id,
+                priority=priority,
+            )
 
+            # I chybová odpověď zařízení potvrzuje, že spojení žije
+            self._connection.record_success()
             if result.isError():
-                _LOGGER.warning(f"Async Modbus read error for address {address}: {result}")
+                self.metrics.record_request(
+                    loop.time() - started, overhead + PDU_READ_REQUEST, overhead + PDU_ERROR_RESPONSE
+                )
+                self.metrics.errors += 1
+                self._failed_blocks.add(block_id)
+                # Půlení a karanténa jen pro odmítnuté adresy; Busy a chyby brány se zkusí znovu
+                if getattr(result, "exception_code", None) in MODBUS_REJECT_EXCEPTION_CODES:
+                    self._rejected_blocks.add(block_id)
+                else:
+                    self._rejected_blocks.discard(block_id)
+                _LOGGER.warning(f"Async Modbus read error for block {block.address}-{block.end - 1}: {result}")
                 return None
-            else:
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug(f"Async Modbus read successful for address {address}, Raw Registers: {result.registers}")
-
-            decoder = BinaryPayloadDecoder.fromRegisters(
-                result.registers, byteorder=Endian.BIG, wordorder=Endian.BIG
+            self.metrics.record_request(
+                loop.time() - started,
+                overhead + PDU_READ_REQUEST,
+                overhead + PDU_READ_RESPONSE + 2 * block.count,
             )
-            raw_value = None
-            if data_type == "U16": raw_value = decoder.decode_16bit_uint()
-            elif data_type == "I16": raw_value = decoder.decode_16bit_int()
-            elif data_type == "U32": raw_value = decoder.decode_32bit_uint()
-            elif data_type == "I32": raw_value = decoder.decode_32bit_int()
-            elif data_type == "STR":
-                 string_length = count * 2
-                 raw_value = decoder.decode_string(string_length).rstrip(b'\x00').decode('utf-8', errors='ignore')
-            else:
-                _LOGGER.warning(f"Neznámý datový typ '{data_type}' pro adresu {address}")
-                return None
-
-            if raw_value is not None and data_type != "STR":
-                 if scale != 1.0:
-                     try:
-                         scaled_value = float(raw_value)
-                         if scale > 1: return scaled_value / scale
-                         elif scale < 1 and scale != 0: return scaled_value * scale
-                         else: return scaled_value
-                     except (ValueError, TypeError) as e:
-                         _LOGGER.error(f"Chyba při ASYNC scale {scale} na {raw_value} pro adresu {address}: {e}")
-                         return None
-                 else: return raw_value
-            elif raw_value is not None and data_type == "STR": return raw_value
-            else: return None
+            self._failed_blocks.discard(block_id)
+            self._rejected_blocks.discard(block_id)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(f"Async Modbus read successful for block {block.address}, Raw Registers: {result.registers}")
+            return result.registers
 
+        except RequestExpired:
+            self.metrics.expired += 1
+            _LOGGER.warning(f"Čtení bloku {block.address}-{block.end - 1} nestihlo frontu, přeskakuji")
+            return None
+        except asyncio.TimeoutError:
+            self.metrics.record_request(None, overhead + PDU_READ_REQUEST, 0)
+            self.metrics.timeouts += 1
+            self._failed_blocks.add(block_id)
+            _LOGGER.warning(f"Timeout při čtení bloku {block.address}-{block.end - 1}")
+            self._connection.record_timeout()
+            return None
         except ModbusIOException as e:
-             _LOGGER.warning(f"Async Modbus IO chyba při čtení registru {address}: {e}")
+             self._failed_blocks.add(block_id)
+             _LOGGER.warning(f"Async Modbus IO chyba při čtení bloku {block.address}: {e}")
              return None
         except ConnectionException as e:
-            _LOGGER.warning(f"Async Modbus Connection chyba při čtení registru {address}: {e}")
-            if self._client.connected: self._client.close()
+            self._failed_blocks.add(block_id)
+            _LOGGER.warning(f"Async Modbus Connection chyba při čtení bloku {block.address}: {e}")
+            # Bloky ve frontě po výpadku dostanou "Not connected" - výpadek už je zaznamenaný
+            if self._connection.connected:
+                self._connection.mark_failed()
             return None
         except Exception as e:
-            _LOGGER.error(f"Neočekávaná chyba v ASYNC _read_registers pro adresu {address}: {e}", exc_info=True)
+            self._failed_blocks.add(block_id)
+            _LOGGER.error(f"Neočekávaná chyba v ASYNC _read_block pro adresu {block.address}: {e}", exc_info=True)
             return None
 
     async def _async_update_data(self):
         """ASYNCHRONNÍ získávání dat ze zařízení."""
-        data = {}
+        # Hodnoty skupin, které se v tomto cyklu nečtou, zůstávají z minula
+        store = self._store
+        # Během backoffu po výpadku selžeme hned - bez čekání na zámek a timeout
+        if self._connection.known_down:
+            self.metrics.failed_cycles += 1
+            raise UpdateFailed(
+                f"{self.transport.endpoint} je nedostupné, další pokus o připojení za {self._connection.retry_in:.0f} s"
+            )
+        lock_requested = asyncio.get_event_loop().time()
         async with self._lock:
+            self.metrics.record_lock_wait(asyncio.get_event_loop().time() - lock_requested)
             try:
                 is_connected = await self._ensure_connection()
                 if not is_connected:
-                    raise UpdateFailed(f"Nepodařilo se připojit k {self.host}:{self.port}")
+                    raise UpdateFailed(f"Nepodařilo se připojit k {self.transport.endpoint}")
+                if self._connection.reconnects != self._reconnects_seen:
+                    # Střídač mohl mezitím dostat nový firmware
+                    self._reconnects_seen = self._connection.reconnects
+                    self._scheduler.rearm_static()
+                if not self._profile_checked:
+                    await self._quarantine.async_load()
+                    if self.energy is not None:
+                        await self.energy.async_load()
+                    await self._async_load_register_profile()
+                elif self._quarantine:
+                    # Rozsahům, jejichž prodleva uplynula, dáme další šanci
+                    self._update_skipped_slots()
 
-                _LOGGER.debug(f"Zahajuji ASYNC čtení dat pro {self.name}")
                 start_time = asyncio.get_event_loop().time()
+                self._cycle_writes = []
+                # Mimořádný refresh (např. po zápisu) čte alespoň nejrychlejší skupinu
+                due_groups = self._scheduler.due_groups(start_time) or [self._scheduler.fastest_group]
+                read_plan = self._read_plan_for(due_groups)
+                _LOGGER.debug(f"Zahajuji ASYNC čtení dat pro {self.name}, skupiny: {due_groups}")
+
+                # Jeden požadavek na každý souvislý blok registrů; fronta omezí
+                # souběh. Bloky, které nestihnou začít do dalšího cyklu, zahodíme.
+                stats = self._pipeline.stats_for(self.slave_id)
+                stats.reset()
+                deadline = start_time + self._scheduler.current[self._scheduler.fastest_group]
+                results = await asyncio.gather(
+                    *(self._read_block(block, deadline) for block in read_plan)
+                )
+
+                # Blok odmítnutý zařízením rozpůlíme: zdravé části se přečtou zvlášť,
+                # vadné registry půjdou do karantény a příští plán je obejde
+                pieces: list[tuple[ReadBlock, list[int] | None]] = []
+                rejected: list[RegisterRange] = []
+                for block, registers in zip(read_plan, results):
+                    if registers is None and block.register_range in self._rejected_blocks:
+                        pieces.extend(await self._async_bisect_block(block, rejected, deadline))
+                    else:
+                        pieces.append((block, registers))
+                if rejected:
+                    self._quarantine_ranges(rejected)
+
+                # Zpracujeme výsledky - celý blok dekódujeme předkompilovaným formátem
+                decode_started = asyncio.get_event_loop().time()
+                failed_groups: set[str] = set()
+                reread = self._decode_pieces(pieces, start_time, failed_groups)
+                decode_time = asyncio.get_event_loop().time() - decode_started
+                if reread:
+                    # Bloky přečtené před souběžným zápisem by přepsaly ověřené hodnoty - přečteme
+                    # je znovu až po zápisu (další zápis během opakování je nechá na příští cyklus)
+                    writes_seen = len(self._cycle_writes)
+                    results = await asyncio.gather(*(self._read_block(block, deadline) for block in reread))
+                    decode_started = asyncio.get_event_loop().time()
+                    self._decode_pieces(list(zip(reread, results)), start_time, failed_groups, writes_seen)
+                    decode_time += asyncio.get_event_loop().time() - decode_started
+                if self.history is not None and SCAN_GROUP_REALTIME in due_groups:
+                    # Hodnoty, které se v tomto cyklu nepřečetly, se do vzorku nepočítají
+                    self.history.record(time(), store, start_time)
+                if self.energy is not None:
+                    self.energy.record(store, due_groups, time())
 
-                # V této verzi NEROZLIŠUJEME holding/input, čteme vše jako holding
-                read_func_to_use = self._client.read_holding_registers
-
-                tasks = []
-                valid_sensor_descriptions = []
-                # Smyčka pro senzory
-                for desc in SENSOR_DESCRIPTIONS:
-                     # Použijeme vždy stejnou funkci (v této verzi)
-                     tasks.append(self._read_registers(desc.register_address, desc.register_count, desc.data_type, desc.scale, read_func_to_use))
-                     valid_sensor_descriptions.append(desc)
-
-                valid_rw_params = []
-                 # Smyčka pro RW registry
-                for key, params in RW_REGISTER_MAP.items():
-                    rw_count = params.get('count', 1)
-                    rw_type = params.get('data_type', 'U16')
-                    rw_scale = params.get('scale', 1.0)
-                    # Použijeme vždy stejnou funkci (v této verzi)
-                    tasks.append(self._read_registers(params['address'], rw_count, rw_type, rw_scale, read_func_to_use))
-                    valid_rw_params.append((key, params))
-
-                # Spustíme všechny čtecí úlohy paralelně
-                results = await asyncio.gather(*tasks)
-
-                # Zpracujeme výsledky
-                result_index = 0
-                for desc in valid_sensor_descriptions:
-                    value = results[result_index]
-                    if value is not None: data[desc.key] = value
-                    result_index += 1
-                for key, params in valid_rw_params:
-                    value = results[result_index]
-                    if value is not None: data[key] = value
-                    result_index += 1
+                for group in due_groups:
+                    self._scheduler.mark_polled(
+                        group, start_time, group not in failed_groups,
+                        self._group_activity(group, start_time),
+                    )
+                # Další běh naplánujeme k nejbližšímu čtení některé skupiny
+                self.update_interval = timedelta(
+                    seconds=self._scheduler.seconds_until_next(asyncio.get_event_loop().time())
+                )
 
                 end_time = asyncio.get_event_loop().time()
-                _LOGGER.debug(f"ASYNC Čtení dat dokončeno za {end_time - start_time:.3f} sekund. Získáno klíčů: {len(data)}")
+                self.metrics.record_cycle(end_time - start_time, decode_time, len(read_plan))
+                _LOGGER.debug(
+                    f"ASYNC Čtení dat dokončeno za {end_time - start_time:.3f} sekund "
+                    f"({len(read_plan)} bloků). Platných hodnot: {len(store)}, intervaly: {self._scheduler.current}"
+                )
+                _LOGGER.debug(
+                    f"Fronta: {stats.requests} požadavků, čekání {stats.queue_wait:.3f} s "
+                    f"(max {stats.max_queue_wait:.3f} s), sběrnice {stats.bus_time:.3f} s, "
+                    f"timeouty {stats.timeouts}, zahozeno {stats.expired}"
+                )
 
-                if not data and (valid_sensor_descriptions or valid_rw_params):
+                if read_plan and not any(store.valid):
                      _LOGGER.warning("Nezískaná žádná data z ASYNC čtení, i když definice existují.")
 
-                return data
+                return store
 
+            except UpdateFailed:
+                # Selhání připojení už zaznamenal správce spojení (backoff)
+                self.metrics.failed_cycles += 1
+                raise
             except ConnectionException as err:
+                self.metrics.failed_cycles += 1
                 _LOGGER.warning(f"ASYNC Chyba připojení při aktualizaci dat: {err}")
-                if self._client.connected: self._client.close()
+                self._connection.mark_failed()
                 raise UpdateFailed(f"ASYNC Chyba připojení: {err}") from err
             except Exception as err:
+                self.metrics.failed_cycles += 1
                 _LOGGER.error(f"Neočekávaná chyba v ASYNC _async_update_data: {err}", exc_info=True)
-                if self._client.connected: self._client.close()
+                self._connection.mark_failed()
                 raise UpdateFailed(f"Neočekávaná chyba v ASYNC update: {err}") from err
+            finally:
+                self._cycle_writes = None
+
+    async def _async_load_register_profile(self) -> None:
+        """Po prvním připojení zjistí, které bloky registrů zařízení podporuje.
+
+        Přečte sériové číslo a firmware a převezme uložený profil; pokud pro
+        ně profil chybí, otestuje každý blok mapy jedním čtením a výsledek
+        uloží. Volá se pod _lock.
+        """
+        index = self._index
+        identity = [index.specs[index.slot_by_key[key]] for key in (PROFILE_SERIAL_KEY, PROFILE_FIRMWARE_KEY)]
+        now = asyncio.get_event_loop().time()
+        for block in plan_read_blocks(identity, max_gap=self._max_register_gap):
+            registers = await self._read_block(block)
+            if registers is None:
+                if block.register_range in self._rejected_blocks:
+                    # Zařízení identifikaci nepodporuje - další pokusy nepomohou
+                    self._profile_checked = True
+                    _LOGGER.warning(f"{self.transport.endpoint} nepodporuje identifikaci, profil registrů se nepoužije")
+                else:
+                    _LOGGER.warning(f"Nelze přečíst identifikaci {self.transport.endpoint}, profil zkusím v dalším cyklu")
+                return
+            block.decode_into(registers, self._store, now)
+        self._profile_checked = True
+        serial_number = self._store.get(PROFILE_SERIAL_KEY)
+        firmware = self._store.get(PROFILE_FIRMWARE_KEY)
+        key = profile_key(serial_number, firmware)
+
+        unsupported = await self._profile_cache.async_get(key, index.layout)
+        if unsupported is None:
+            unsupported, complete = await self._async_probe_registers()
+            if complete:
+                await self._profile_cache.async_save(key, index.layout, unsupported)
+            else:
+                # Timeouty nic neříkají o podpoře bloku - profil se neuloží a zkusí se při dalším startu
+                _LOGGER.warning(f"Test registrů {self.transport.endpoint} nebyl úplný, profil se neuloží")
+            _LOGGER.info(
+                f"Profil registrů {self.transport.endpoint} (FW {firmware}) zjištěn: "
+                f"{len(unsupported)} nepodporovaných bloků"
+            )
+        self._unsupported_ranges = list(unsupported)
+        self._update_skipped_slots()
+
+    async def _async_probe_registers(self) -> tuple[list[RegisterRange], bool]:
+        """Otestuje každý blok celé mapy jedním čtením.
+
+        Vrátí rozsahy, které zařízení odmítlo (Illegal Data Address) i při
+        ověřovacích čteních, a zda test proběhl úplně (žádný blok neskončil
+        timeoutem). Odmítnuté bloky se rozpůlí až na jednotlivé hodnoty.
+        Přečtené hodnoty se rovnou uloží.
+        """
+        blocks = plan_read_blocks(list(self._index.specs), max_gap=self._max_register_gap)
+        now = asyncio.get_event_loop().time()
+        results = await asyncio.gather(*(self._read_block(block) for block in blocks))
+        pieces: list[tuple[ReadBlock, list[int] | None]] = []
+        unsupported: list[RegisterRange] = []
+        for block, registers in zip(blocks, results):
+            if registers is None and block.register_range in self._rejected_blocks:
+                pieces.extend(await self._async_bisect_block(block, unsupported))
+            else:
+                pieces.append((block, registers))
+        complete = True
+        for block, registers in pieces:
+            if registers is not None:
+                try:
+                    block.decode_into(registers, self._store, now)
+                except struct.error as e:
+                    _LOGGER.warning(f"Nelze dekódovat blok {block.address}-{block.end - 1}: {e}")
+            elif block.register_range not in unsupported:
+                complete = False
+        # Jednorázové odmítnutí může být přechodné - do profilu jde jen rozsah odmítnutý opakovaně
+        confirmed: list[RegisterRange] = []
+        for register_type, address, count in unsupported:
+            check = ReadBlock(address=address, count=count, register_type=register_type)
+            for _attempt in range(PROFILE_CONFIRM_READS):
+                if await self._read_block(check) is not None:
+                    _LOGGER.debug(f"Rozsah {check.register_range} se při ověření přečetl, není nepodporovaný")
+                    break
+                if check.register_range not in self._rejected_blocks:
+                    complete = False
+                    break
+            else:
+                confirmed.append(check.register_range)
+        return confirmed, complete
+
+    async def _async_bisect_block(
+        self, block: ReadBlock, rejected: list[RegisterRange], deadline: float | None = None
+    ) -> list[tuple[ReadBlock, list[int] | None]]:
+        """Rozpůlí blok odmítnutý zařízením a poloviny přečte zvlášť.
+
+        Vrátí přečtené části bloku (registry, nebo None při selhání). Do
+        rejected přidá hodnoty, které zařízení odmítá i samotné, a mezery
+        mezi polovinami, které samy projdou (díra v mapě zařízení).
+        """
+        if len(block.specs) == 1:
+            rejected.append(block.register_range)
+            return [(block, None)]
+        middle = len(block.specs) // 2
+        halves = [
+            half
+            for specs in (block.specs[:middle], block.specs[middle:])
+            for half in plan_read_blocks(specs, max_gap=block.count)
+        ]
+        pieces: list[tuple[ReadBlock, list[int] | None]] = []
+        halves_read = True
+        for half in halves:
+            registers = await self._read_block(half, deadline)
+            if registers is None and half.register_range in self._rejected_blocks:
+                pieces.extend(await self._async_bisect_block(half, rejected, deadline))
+                halves_read = False
+            else:
+                pieces.append((half, registers))
+                halves_read = halves_read and registers is not None
+        if halves_read:
+            for left, right in zip(halves, halves[1:]):
+                if right.address > left.end:
+                    rejected.append((block.register_type, left.end, right.address - left.end))
+        return pieces
+
+    def _decode_pieces(
+        self,
+        pieces: list[tuple[ReadBlock, list[int] | None]],
+        now: float,
+        failed_groups: set[str],
+        writes_seen: int = 0,
+    ) -> list[ReadBlock]:
+        """Dekóduje přečtené bloky do úložiště; nepřečtené hodnoty zneplatní.
+
+        Vrátí holding bloky překrývající zápis z tohoto cyklu (od pořadí
+        writes_seen), které se nedekódovaly.
+        """
+        store = self._store
+        writes = self._cycle_writes[writes_seen:] if self._cycle_writes else ()
+        overlapping = []
+        for block, registers in pieces:
+            if registers is not None:
+                if writes and block.register_type == "holding" and any(
+                    address < block.end and block.address < end for address, end in writes
+                ):
+                    overlapping.append(block)
+                    continue
+                if self._quarantine:
+                    self._quarantine.release(block.register_type, block.address, block.end)
+                try:
+                    block.decode_into(registers, store, now)
+                    continue
+                except struct.error as e:
+                    _LOGGER.warning(f"Nelze dekódovat blok {block.address}-{block.end - 1}: {e}")
+            for spec in block.specs:
+                store.invalidate(spec.slot)
+                failed_groups.add(spec.scan_group)
+        return overlapping
+
+    @callback
+    def _quarantine_ranges(self, rejected: list[RegisterRange]) -> None:
+        """Zařadí odmítnuté rozsahy do karantény a přeplánuje čtení bez nich."""
+        now = time()
+        for register_range in rejected:
+            backoff = self._quarantine.add(register_range, now)
+            _LOGGER.warning(
+                f"Registry {register_range} na {self.transport.endpoint} zařízení odmítá, "
+                f"další pokus za {backoff:.0f} s"
+            )
+        self._update_skipped_slots()
+
+    def _group_activity(self, group: str, now: float) -> str:
+        """Určí aktivitu skupiny pro adaptivní plánování.
+
+        Porovnává právě přečtené hodnoty s předchozími (ValueStore.previous).
+        Rychlá změna FV výkonu zrychlí čtení, standby (running_status) nebo
+        stabilní hodnoty skupiny ho exponenciálně zpomalí.
+        """
+        index = self._index
+        store = self._store
+        slots = index.group_slots.get(group, ())
+        last_polled = self._scheduler.last_polled.get(group)
+        power_slot = index.slot_by_key.get(ADAPTIVE_POWER_KEY)
+        if power_slot in slots and last_polled is not None and now > last_polled:
+            old, new = store.previous[power_slot], store.value(power_slot)
+            if old is not None and new is not None and abs(new - old) / (now - last_polled) > ADAPTIVE_RAMP_RATE:
+                return ACTIVITY_BUSY
+        if store.get(ADAPTIVE_STATUS_KEY) in ADAPTIVE_STANDBY_STATUSES:
+            return ACTIVITY_IDLE
+        for slot in slots:
+            if slot in self._skipped_slots:
+                continue
+            old, new = store.previous[slot], store.value(slot)
+            if isinstance(old, str) or isinstance(new, str):
+                continue
+            if old is None or new is None:
+                return ACTIVITY_NORMAL
+            if abs(new - old) > max(index.deadbands[slot], ADAPTIVE_STABLE_TOLERANCE * abs(old)):
+                return ACTIVITY_NORMAL
+        return ACTIVITY_IDLE
+
+    @callback
+    def _async_boost_polling(self) -> None:
+        """Po zápisu na chvíli zrychlí čtení, aby se projevila odezva střídače."""
+        now = asyncio.get_event_loop().time()
+        self._scheduler.boost(now, ADAPTIVE_WRITE_BOOST)
+        self.update_interval = timedelta(seconds=self._scheduler.seconds_until_next(now))
+        if self._listeners:
+            # Přeplánujeme už naplánovaný (delší) refresh
+            self._schedule_refresh()
+
+    @callback
+    def async_add_listener(self, update_callback, context: Any = None) -> Callable[[], None]:
+        """Registruje listener; context = slot (klíč odvozené hodnoty) ho zařadí jen k danému slotu."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if isinstance(context, (int, str)):
+            callbacks = self._slot_listeners.setdefault(context, [])
+        else:
+            callbacks = self._unslotted_listeners
+        callbacks.append(update_callback)
+
+        @callback
+        def remove_slot_listener() -> None:
+            callbacks.remove(update_callback)
+            remove_listener()
+
+        return remove_slot_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Upozorní jen entity, jejichž slot se od minula změnil.
+
+        Při změně dostupnosti (úspěch/selhání aktualizace) a jednou za
+        heartbeat se upozorní všechny entity, aby mohly zapsat stav.
+        """
+        # Odvozené hodnoty se přepočítají z vstupů změněných od minula (jednou za cyklus / ověření zápisu)
+        derived_changed = self.derived.evaluate(self._store, self._store.changed)
+        changed = self._store.pop_changed()
+        now = monotonic()
+        if self.last_update_success != self._notified_success or now >= self._next_full_dispatch:
+            self._notified_success = self.last_update_success
+            self._next_full_dispatch = now + self.heartbeat
+            self.full_dispatch = True
+            try:
+                super().async_update_listeners()
+            finally:
+                self.full_dispatch = False
+            return
+        for update_callback in list(self._unslotted_listeners):
+            update_callback()
+        for slot in changed + derived_changed:
+            for update_callback in list(self._slot_listeners.get(slot, ())):
+                update_callback()
+        if self.history is not None and now >= self._next_history_dispatch:
+            # Entity s historií mohly změnu v intervalu odložit - dostanou šanci ji zapsat
+            self._next_history_dispatch = now + self.state_interval
+            woken = set(changed)
+            for slot in self.history.slots:
+                if slot not in woken:
+                    for update_callback in list(self._slot_listeners.get(slot, ())):
+                        update_callback()
+
+    async def _async_read_back(self, address: int, values: list[int]) -> None:
+        """Ověří zápis přečtením zapsaných registrů a aktualizuje jen dotčené hodnoty.
+
+        Místo celého refreshe se čte jediný blok pokrývající zapsané registry
+        (a celé hodnoty, které do nich zasahují) prioritně před bloky cyklu.
+        Volá se pod _write_lock.
+        """
+        end = address + len(values)
+        specs = [self._index.specs[slot] for slot in self._index.slots_overlapping("holding", address, end)]
+        block_address = min([address] + [spec.address for spec in specs])
+        block_end = max([end] + [spec.end for spec in specs])
+        block = ReadBlock(address=block_address, count=block_end - block_address, specs=specs)
+        block.compile()
+
+        registers = await self._read_block(block, priority=True)
+        if registers is None:
+            _LOGGER.warning(f"Ověření zápisu od adresy {address} selhalo, vyžaduji refresh")
+            await self.async_request_refresh()
+            return
+
+        offset = address - block_address
+        read_values = registers[offset:offset + len(values)]
+        if read_values != [value & 0xFFFF for value in values]:
+            _LOGGER.warning(f"Zápis od adresy {address} nepotvrzen: zapsáno {values}, přečteno {read_values}")
+
+        try:
+            block.decode_into(registers, self._store, asyncio.get_event_loop().time())
+        except struct.error as e:
+            _LOGGER.warning(f"Nelze dekódovat ověřovací blok od adresy {block_address}: {e}")
+            return
+        self.data = self._store
+        self.async_update_listeners()
 
     # --- ASYNCHRONNÍ Metody pro zápis ---
     # Používají také explicitní pojmenování argumentů a slave=
 
-    async def async_write_register(self, address: int, value: int):
-        """Zapíše jeden 16bitový registr (Holding) ASYNCHRONNĚ."""
-        async with self._lock:
+    async def _async_write_unlocked(self, address: int, values: list[int]) -> bool:
+        """Zapíše souvislý rozsah registrů prioritně (volá se pod _write_lock).
+
+        Jeden registr se zapisuje funkcí 0x06, více registrů jedním požadavkem 0x10.
+        """
+        _LOGGER.debug(f"Pokus o ASYNC zápis hodnot {values} od adresy {address} (Slave: {self.slave_id})")
+        overhead = self.transport.frame_overhead
+        started = asyncio.get_running_loop().time()
+        if len(values) == 1:
+            sent, received = overhead + PDU_WRITE_SINGLE, overhead + PDU_WRITE_SINGLE
+            result = await self._pipeline.submit(
+                lambda: self._client.write_register(address=address, value=values[0], slave=self.slave_id),
+                lane=self.slave_id,
+                priority=True,
+            )
+        else:
+            sent = overhead + PDU_WRITE_MULTIPLE_REQUEST + 2 * len(values)
+            received = overhead + PDU_WRITE_MULTIPLE_RESPONSE
+            result = await self._pipeline.submit(
+                lambda: self._client.write_registers(address=address, values=values, slave=self.slave_id),
+                lane=self.slave_id,
+                priority=True,
+            )
+        self._connection.record_success()
+        latency = asyncio.get_running_loop().time() - started
+        if result.isError():
+            self.metrics.record_request(latency, sent, overhead + PDU_ERROR_RESPONSE)
+            self.metrics.errors += 1
+            _LOGGER.error(f"ASYNC Modbus chyba při zápisu od adresy {address}: {result}")
+            return False
+        self.metrics.record_request(latency, sent, received)
+        if self._cycle_writes is not None:
+            self._cycle_writes.append((address, address + len(values)))
+        _LOGGER.info(f"ASYNC Úspěšně zapsány hodnoty {values} od adresy {address}")
+        return True
+
+    async def _async_write_runs(self, runs: list[tuple[int, list[int]]]) -> bool:
+        """Zapíše souvislé rozsahy jednou dávkou a ověří je zpětným čtením.
+
+        Dávka nečeká na běžící cyklus čtení: zápisy i ověřovací čtení jdou
+        prioritní frontou a předběhnou bloky cyklu, které ještě nezačaly.
+        """
+        # Během backoffu po výpadku selžeme hned - bez čekání na zámek a timeout
+        if self._connection.known_down:
+            _LOGGER.error(
+                f"ASYNC Zápis selhal: {self.transport.endpoint} je nedostupné "
+                f"(další pokus o připojení za {self._connection.retry_in:.0f} s)"
+            )
+            return False
+        requested = asyncio.get_event_loop().time()
+        written = False
+        async with self._write_lock:
             try:
                 is_connected = await self._ensure_connection()
                 if not is_connected:
-                    _LOGGER.error(f"ASYNC Zápis selhal: Nepodařilo se připojit k {self.host}:{self.port}")
-                    return False
-                _LOGGER.debug(f"Pokus o ASYNC zápis hodnoty {value} na adresu {address} (Slave: {self.slave_id})")
-                result = await self._client.write_register(address=address, value=value, slave=self.slave_id)
-                if result.isError():
-                    _LOGGER.error(f"ASYNC Modbus chyba při zápisu na adresu {address}: {result}")
+                    _LOGGER.error(f"ASYNC Zápis selhal: Nepodařilo se připojit k {self.transport.endpoint}")
                     return False
-                else:
-                    _LOGGER.info(f"ASYNC Úspěšně zapsána hodnota {value} na adresu {address}")
-                    await self.async_request_refresh()
-                    return True
+                for address, values in runs:
+                    if not await self._async_write_unlocked(address, values):
+                        return False
+                written = True
+                self.metrics.record_write(asyncio.get_event_loop().time() - requested, True)
+                for address, values in runs:
+                    await self._async_read_back(address, values)
+                self._async_boost_polling()
+                return True
+            except asyncio.TimeoutError:
+                self.metrics.timeouts += 1
+                _LOGGER.error(f"Timeout při ASYNC zápisu {runs}")
+                self._connection.record_timeout()
+                return False
+            except ConnectionException as e:
+                _LOGGER.error(f"ASYNC Chyba připojení při zápisu {runs}: {e}")
+                if self._connection.connected:
+                    self._connection.mark_failed()
+                return False
             except Exception as e:
-                _LOGGER.error(f"Neočekávaná chyba při ASYNC zápisu na adresu {address}: {e}", exc_info=True)
+                _LOGGER.error(f"Neočekávaná chyba při ASYNC zápisu {runs}: {e}", exc_info=True)
                 return False
+            finally:
+                if not written:
+                    self.metrics.record_write(asyncio.get_event_loop().time() - requested, False)
+
+    async def async_write_register(self, address: int, value: int):
+        """Zapíše jeden 16bitový registr (Holding) ASYNCHRONNĚ."""
+        return await self._async_write_runs([(address, [value])])
 
     async def async_write_multiple_registers(self, address: int, values: list[int]):
         """Zapíše více 16bitových registrů (Holding) ASYNCHRONNĚ."""
-        async with self._lock:
+        return await self._async_write_runs([(address, list(values))])
+
+    def get_samples(self, keys: list[str] | None = None, window: float | None = None) -> dict[str, Any]:
+        """Surové vzorky z historie: {klíč: [[time(), hodnota], ...]} za posledních window sekund."""
+        history = self.history
+        if history is None:
+            raise HomeAssistantError(f"Historie vzorků je pro {self.entry_id} vypnutá ({CONF_HISTORY_SIZE} = 0)")
+        index = self._index
+        if keys is None:
+            slots = list(history.slots)
+        else:
+            slots = []
+            for key in keys:
+                slot = index.slot_by_key.get(key)
+                if slot is None or slot not in history:
+                    raise HomeAssistantError(f"Pro '{key}' se vzorky neukládají (jen číselné realtime hodnoty)")
+                slots.append(slot)
+        since = time() - window if window else 0.0
+        return {
+            "samples": {
+                index.keys[slot]: [[round(timestamp, 3), value] for timestamp, value in history.samples(slot, since)]
+                for slot in slots
+            }
+        }
+
+    def value_confirmed(self, key: str, value: Any) -> bool:
+        """True, pokud zařízení už hodnotu má (shodné zakódované registry)."""
+        index = self._index
+        slot = index.slot_by_key.get(key)
+        if slot is None or (current := self._store.value(slot)) is None:
+            return False
+        if isinstance(value, bool) and slot in index.write_maps:
+            value = index.write_maps[slot][value]
+        try:
+            return encode_value(index.data_types[slot], index.scales[slot], value) == encode_value(
+                index.data_types[slot], index.scales[slot], current
+            )
+        except (TypeError, ValueError):
+            return False
+
+    async def async_queue_write(self, key: str, value: Any) -> bool:
+        """Zapíše RW hodnotu přes frontu sdružující rychlé změny (number entity).
+
+        Během okna write_debounce vyhrává poslední hodnota klíče; hodnoty
+        shodné s potvrzeným stavem se nezapisují a zbytek dávky se zapíše
+        společně (sousední registry jedním požadavkem).
+        """
+        return await self._write_queue.async_write(key, value)
+
+    async def async_write_values(self, values: dict[str, Any]) -> bool:
+        """Zapíše více RW hodnot (klíče z RW_REGISTER_MAP) jako jednu dávku.
+
+        Hodnoty se zakódují podle data_type/scale (switch přijímá i True/False),
+        sousední registry se sloučí a každý souvislý rozsah se zapíše jediným
+        požadavkem - např. režim + celkový a fázové výkony 50202-50206 najednou.
+        """
+        index = self._index
+        registers: dict[int, int] = {}
+        for key, value in values.items():
+            slot = index.slot_by_key.get(key)
+            if slot is None or not index.writable[slot]:
+                _LOGGER.error(f"Neznámý RW klíč '{key}' pro zápis")
+                return False
+            if isinstance(value, bool) and slot in index.write_maps:
+                value = index.write_maps[slot][value]
             try:
-                is_connected = await self._ensure_connection()
-                if not is_connected:
-                    _LOGGER.error(f"ASYNC Zápis více registrů selhal: Nepodařilo se připojit k {self.host}:{self.port}")
-                    return False
-                _LOGGER.debug(f"Pokus o ASYNC zápis hodnot {values} od adresy {address} (Slave: {self.slave_id})")
-                result = await self._client.write_registers(address=address, values=values, slave=self.slave_id)
-                if result.isError():
-                    _LOGGER.error(f"ASYNC Modbus chyba při zápisu více registrů od adresy {address}: {result}")
-                    return False
-                else:
-                    _LOGGER.info(f"ASYNC Úspěšně zapsány hodnoty {values} od adresy {address}")
-                    await self.async_request_refresh()
-                    return True
-            except Exception as e:
-                _LOGGER.error(f"Neočekávaná chyba při ASYNC zápisu více registrů od adresy {address}: {e}", exc_info=True)
-                return False
\ No newline at end of file
+                encoded = encode_value(index.data_types[slot], index.scales[slot], value)
+            except (TypeError, ValueError) as e:
+                _LOGGER.error(f"Nelze zakódovat hodnotu {value} pro '{key}': {e}")
+                return False
+            address = index.addresses[slot]
+            for offset, register in enumerate(encoded):
+                registers[address + offset] = register
+
+        # Sloučení sousedních adres do souvislých rozsahů (max. limit PDU)
+        runs: list[tuple[int, list[int]]] = []
+        for address in sorted(registers):
+            if runs and runs[-1][0] + len(runs[-1][1]) == address and len(runs[-1][1]) < MODBUS_MAX_WRITE_REGISTERS:
+                runs[-1][1].append(registers[address])
+            else:
+                runs.append((address, [registers[address]]))
+        if not runs:
+            return True
+        return await self._async_write_runs(runs)
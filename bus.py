@@ -0,0 +1,74 @@
+# custom_components/sunway_fve/bus.py
+"""Sdílené Modbus spojení pro více střídačů za jednou bránou nebo linkou."""
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_BUSES
+from .connection import ModbusConnectionManager
+from .pipeline import ModbusRequestPipeline
+from .transport import TransportConfig
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ModbusBus:
+    """Klient, správce spojení a fronta požadavků jednoho endpointu.
+
+    Střídače zapojené za jednou RS485/TCP bránou (stejný host:port, různé
+    slave ID) sdílejí jediný socket; fronta je střídá po jednotlivých
+    požadavcích, takže se na sběrnici nepotkají.
+    """
+
+    def __init__(self, transport: TransportConfig, max_in_flight: int, request_timeout: float) -> None:
+        """Vytvoří klienta a frontu pro daný transport."""
+        self.transport = transport
+        self.client = transport.create_client(timeout=request_timeout)
+        self.connection = ModbusConnectionManager(self.client, transport.endpoint)
+        # Omezení souběžných transakcí - dongle zvládne jen 1-2 najednou
+        # U RTU navíc pauza t3.5 mezi rámci a vždy jen jedna transakce
+        self.pipeline = ModbusRequestPipeline(
+            max_in_flight=max_in_flight,
+            request_timeout=request_timeout,
+            inter_frame_delay=transport.inter_frame_delay,
+        )
+        self.users: set[str] = set() # entry_id záznamů, které spojení používají
+
+
+@callback
+def async_acquire_bus(
+    hass: HomeAssistant,
+    transport: TransportConfig,
+    entry_id: str,
+    max_in_flight: int,
+    request_timeout: float,
+) -> ModbusBus:
+    """Vrátí sdílené spojení pro endpoint transportu, případně ho vytvoří.
+
+    Nastavení fronty (souběh, timeout) určuje záznam, který spojení vytvořil.
+    """
+    buses: dict[str, ModbusBus] = hass.data.setdefault(DATA_BUSES, {})
+    bus = buses.get(transport.endpoint)
+    if bus is None:
+        bus = buses[transport.endpoint] = ModbusBus(transport, max_in_flight, request_timeout)
+    elif bus.transport != transport:
+        _LOGGER.warning(
+            f"Záznam {entry_id} používá pro {transport.endpoint} jiné parametry transportu, "
+            f"než sdílené spojení ({bus.transport.transport}); použijí se parametry spojení"
+        )
+    bus.users.add(entry_id)
+    _LOGGER.debug(f"Spojení {transport.endpoint} používá {len(bus.users)} záznam(ů)")
+    return bus
+
+
+@callback
+def async_release_bus(hass: HomeAssistant, bus: ModbusBus, entry_id: str) -> None:
+    """Uvolní spojení pro záznam; poslední uživatel ho zavře."""
+    bus.users.discard(entry_id)
+    if bus.users:
+        return
+    buses: dict[str, ModbusBus] = hass.data.get(DATA_BUSES, {})
+    if buses.get(bus.transport.endpoint) is bus:
+        del buses[bus.transport.endpoint]
+    bus.connection.close()
@@ -10,32 +10,78 @@ from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
     DOMAIN, DEFAULT_PORT, DEFAULT_SLAVE_ID,
-    SCAN_GROUP_REALTIME, SCAN_GROUP_DAILY_TOTALS, SCAN_GROUP_LIFETIME_TOTALS, SCAN_GROUP_INFO
+    SCAN_GROUP_REALTIME, SCAN_GROUP_DAILY_TOTALS, SCAN_GROUP_LIFETIME_TOTALS, SCAN_GROUP_INFO,
+    DEFAULT_SCAN_INTERVALS,
+    CONF_SCAN_FLOOR_SUFFIX, CONF_SCAN_CEILING_SUFFIX, DEFAULT_SCAN_FLOORS, DEFAULT_SCAN_CEILINGS,
+    CONF_MAX_REGISTER_GAP, DEFAULT_MAX_REGISTER_GAP, MODBUS_MAX_READ_REGISTERS,
+    CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT, CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT,
+    CONF_WRITE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE,
+    CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE, CONF_STATE_INTERVAL, DEFAULT_STATE_INTERVAL,
+    CONF_ENERGY_STATISTICS, DEFAULT_ENERGY_STATISTICS,
+    CONF_TRANSPORT, TRANSPORT_TCP, TRANSPORT_RTU_OVER_TCP, TRANSPORT_SERIAL,
+    CONF_SERIAL_PORT, CONF_BAUDRATE, CONF_PARITY, CONF_STOPBITS, CONF_BYTESIZE,
+    DEFAULT_BAUDRATE, DEFAULT_PARITY, DEFAULT_STOPBITS, DEFAULT_BYTESIZE,
 )
-from pymodbus.client import AsyncModbusTcpClient
+from .transport import TransportConfig
 
 _LOGGER = logging.getLogger(__name__)
 
+TRANSPORT_SCHEMA = vol.Schema({
+    vol.Required(CONF_TRANSPORT, default=TRANSPORT_TCP): vol.In(
+        [TRANSPORT_TCP, TRANSPORT_RTU_OVER_TCP, TRANSPORT_SERIAL]
+    ),
+})
+
 DATA_SCHEMA = vol.Schema({
     vol.Required(CONF_HOST): str,
     vol.Required(CONF_PORT, default=DEFAULT_PORT): cv.port,
     vol.Required(CONF_SLAVE, default=DEFAULT_SLAVE_ID): vol.Coerce(int),
 })
 
+# Parametry sériové linky (u RTU přes TCP jde o linku za převodníkem - určuje pauzy mezi rámci)
+SERIAL_LINE_SCHEMA = vol.Schema({
+    vol.Required(CONF_BAUDRATE, default=DEFAULT_BAUDRATE): vol.In(
+        [1200, 2400, 4800, 9600, 19200, 38400, 57600, 115200]
+    ),
+    vol.Required(CONF_PARITY, default=DEFAULT_PARITY): vol.In(["N", "E", "O"]),
+    vol.Required(CONF_STOPBITS, default=DEFAULT_STOPBITS): vol.In([1, 2]),
+    vol.Required(CONF_BYTESIZE, default=DEFAULT_BYTESIZE): vol.In([7, 8]),
+})
+
+SERIAL_SCHEMA = vol.Schema({
+    vol.Required(CONF_SERIAL_PORT): str,
+    vol.Required(CONF_SLAVE, default=DEFAULT_SLAVE_ID): vol.Coerce(int),
+}).extend(SERIAL_LINE_SCHEMA.schema)
+
+# Options záznamu - z tohoto schématu se sestavuje formulář options flow
 OPTIONS_SCHEMA = vol.Schema({
-    vol.Optional(SCAN_GROUP_REALTIME, default=30): vol.All(vol.Coerce(int), vol.Range(min=5)),
-    vol.Optional(SCAN_GROUP_DAILY_TOTALS, default=120): vol.All(vol.Coerce(int), vol.Range(min=30)),
-    vol.Optional(SCAN_GROUP_LIFETIME_TOTALS, default=600): vol.All(vol.Coerce(int), vol.Range(min=60)),
-    vol.Optional(SCAN_GROUP_INFO, default=3600): vol.All(vol.Coerce(int), vol.Range(min=300)),
+    vol.Optional(SCAN_GROUP_REALTIME, default=DEFAULT_SCAN_INTERVALS[SCAN_GROUP_REALTIME]): vol.All(vol.Coerce(int), vol.Range(min=5)),
+    vol.Optional(SCAN_GROUP_DAILY_TOTALS, default=DEFAULT_SCAN_INTERVALS[SCAN_GROUP_DAILY_TOTALS]): vol.All(vol.Coerce(int), vol.Range(min=30)),
+    vol.Optional(SCAN_GROUP_LIFETIME_TOTALS, default=DEFAULT_SCAN_INTERVALS[SCAN_GROUP_LIFETIME_TOTALS]): vol.All(vol.Coerce(int), vol.Range(min=60)),
+    vol.Optional(SCAN_GROUP_INFO, default=DEFAULT_SCAN_INTERVALS[SCAN_GROUP_INFO]): vol.All(vol.Coerce(int), vol.Range(min=300)),
+    vol.Optional(CONF_MAX_REGISTER_GAP, default=DEFAULT_MAX_REGISTER_GAP): vol.All(vol.Coerce(int), vol.Range(min=0, max=MODBUS_MAX_READ_REGISTERS)),
+    vol.Optional(CONF_MAX_IN_FLIGHT, default=DEFAULT_MAX_IN_FLIGHT): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+    vol.Optional(CONF_REQUEST_TIMEOUT, default=DEFAULT_REQUEST_TIMEOUT): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+    vol.Optional(CONF_WRITE_DEBOUNCE, default=DEFAULT_WRITE_DEBOUNCE): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+    vol.Optional(CONF_HISTORY_SIZE, default=DEFAULT_HISTORY_SIZE): vol.All(vol.Coerce(int), vol.Range(min=0, max=7200)),
+    vol.Optional(CONF_STATE_INTERVAL, default=DEFAULT_STATE_INTERVAL): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+    vol.Optional(CONF_ENERGY_STATISTICS, default=DEFAULT_ENERGY_STATISTICS): cv.boolean,
+}).extend({
+    # Adaptivní dotazování: meze intervalu pro nestatické skupiny
+    vol.Optional(group + CONF_SCAN_FLOOR_SUFFIX, default=floor): vol.All(vol.Coerce(int), vol.Range(min=5))
+    for group, floor in DEFAULT_SCAN_FLOORS.items()
+}).extend({
+    vol.Optional(group + CONF_SCAN_CEILING_SUFFIX, default=ceiling): vol.All(vol.Coerce(int), vol.Range(min=5))
+    for group, ceiling in DEFAULT_SCAN_CEILINGS.items()
 })
 
-async def test_connection(host: str, port: int, slave: int) -> bool:
+async def test_connection(transport: TransportConfig) -> bool:
     """Otestuje připojení k Modbus zařízení."""
     try:
-        client = AsyncModbusTcpClient(host, port=port)
+        client = transport.create_client(timeout=10)
         await client.connect()
         if client.connected:
-            await client.close()
+            client.close()
             return True
     except Exception as e:
         _LOGGER.error(f"Connection test failed: {e}")
@@ -45,28 +91,64 @@ class SunwayFveConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Sunway FVE Modbus."""
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Inicializace config flow."""
+        self._transport = TRANSPORT_TCP
+
     async def async_step_user(
         self, user_input: Optional[Dict[str, Any]] = None
     ) -> FlowResult:
-        """Handle the initial step."""
-        errors: Dict[str, str] = {}
+        """Handle the initial step - výběr transportu."""
         if user_input is not None:
-            unique_id = f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}-{user_input[CONF_SLAVE]}"
-            await self.async_set_unique_id(unique_id)
-            self._abort_if_unique_id_configured()
+            self._transport = user_input[CONF_TRANSPORT]
+            if self._transport == TRANSPORT_SERIAL:
+                return await self.async_step_serial()
+            return await self.async_step_tcp()
 
-            # Testujeme připojení
-            if not await test_connection(user_input[CONF_HOST], user_input[CONF_PORT], user_input[CONF_SLAVE]):
-                errors["base"] = "connection_error"  # Chybová zpráva pro zásadu
-                return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA, errors=errors)
+        return self.async_show_form(step_id="user", data_schema=TRANSPORT_SCHEMA)
 
-            # Uložíme data z úvodního kroku; scan intervaly se nastaví v Options
-            return self.async_create_entry(title=f"Sunway FVE ({user_input[CONF_HOST]})", data=user_input, options={})
+    async def async_step_tcp(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Modbus TCP nebo RTU přes TCP převodník."""
+        schema = DATA_SCHEMA
+        if self._transport == TRANSPORT_RTU_OVER_TCP:
+            schema = DATA_SCHEMA.extend(SERIAL_LINE_SCHEMA.schema)
+        if user_input is None:
+            return self.async_show_form(step_id="tcp", data_schema=schema)
+        unique_id = f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}-{user_input[CONF_SLAVE]}"
+        return await self._async_create_entry(
+            "tcp", schema, user_input, unique_id, f"Sunway FVE ({user_input[CONF_HOST]})"
+        )
 
-        return self.async_show_form(
-            step_id="user", data_schema=DATA_SCHEMA, errors=errors
+    async def async_step_serial(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Modbus RTU přes sériovou linku (RS485)."""
+        if user_input is None:
+            return self.async_show_form(step_id="serial", data_schema=SERIAL_SCHEMA)
+        unique_id = f"{user_input[CONF_SERIAL_PORT]}-{user_input[CONF_SLAVE]}"
+        return await self._async_create_entry(
+            "serial", SERIAL_SCHEMA, user_input, unique_id, f"Sunway FVE ({user_input[CONF_SERIAL_PORT]})"
         )
 
+    async def _async_create_entry(
+        self, step_id: str, schema: vol.Schema, user_input: Dict[str, Any], unique_id: str, title: str
+    ) -> FlowResult:
+        """Ověří spojení a vytvoří záznam."""
+        errors: Dict[str, str] = {}
+        await self.async_set_unique_id(unique_id)
+        self._abort_if_unique_id_configured()
+
+        data = {CONF_TRANSPORT: self._transport, **user_input}
+        # Testujeme připojení
+        if not await test_connection(TransportConfig.from_entry_data(data)):
+            errors["base"] = "connection_error"  # Chybová zpráva pro zásadu
+            return self.async_show_form(step_id=step_id, data_schema=schema, errors=errors)
+
+        # Uložíme data z úvodního kroku; scan intervaly se nastaví v Options
+        return self.async_create_entry(title=title, data=data, options={})
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
@@ -75,7 +157,7 @@ class SunwayFveConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
 class SunwayFveOptionsFlowHandler(config_entries.OptionsFlow):
-    """Zpracovává options flow pro Sunway FVE - pro intervaly skupin."""
+    """Zpracovává options flow pro Sunway FVE - pro intervaly skupin a jejich meze."""
 
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Inicializace options flow."""
@@ -93,9 +175,12 @@ class SunwayFveOptionsFlowHandler(config_entries.OptionsFlow):
             new_options.update(user_input)
             return self.async_create_entry(title="", data=new_options)
 
-        # Vytvoříme schéma s aktuálními/výchozími hodnotami intervalů
+        # Formulář = OPTIONS_SCHEMA (i s mezemi jednotlivých skupin) s aktuálními hodnotami jako výchozími
         options_schema_with_defaults = vol.Schema({
-             vol.Optional(
-                 group,
-                 default=self.config_entry.options.get(group, default_interval)
-             ): vol.All(vol.Coerce(int), vol.Range(min=5
+            vol.Optional(key.schema, default=self.config_entry.options.get(key.schema, key.default())): validator
+            for key, validator in OPTIONS_SCHEMA.schema.items()
+        })
+
+        return self.async_show_form(
+            step_id="init", data_schema=options_schema_with_defaults, errors=errors
+        )
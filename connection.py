@@ -0,0 +1,122 @@
+# custom_components/sunway_fve/connection.py
+"""Správa trvalého Modbus spojení s exponenciálním backoffem."""
+
+import asyncio
+import logging
+import random
+from time import monotonic
+
+from .const import (
+    RECONNECT_BACKOFF_MIN,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_JITTER,
+    HALF_OPEN_TIMEOUTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ModbusConnectionManager:
+    """Udržuje spojení klienta a řídí obnovu po výpadku.
+
+    Neúspěšné připojení naplánuje další pokus s exponenciálně rostoucí
+    (a náhodně rozptýlenou) prodlevou. Do té doby je zařízení považováno
+    za nedostupné a požadavky selžou okamžitě, místo čekání na timeout.
+    Opakované timeouty na otevřeném spojení znamenají polootevřený socket.
+    """
+
+    def __init__(self, client, name: str) -> None:
+        """Inicializace správce spojení."""
+        self._client = client
+        self._name = name
+        self._connect_lock = asyncio.Lock()
+        self._backoff = RECONNECT_BACKOFF_MIN
+        self._retry_at = 0.0
+        self._consecutive_timeouts = 0
+        self.last_activity = 0.0
+        self.reconnects = 0
+
+    @property
+    def connected(self) -> bool:
+        """True, pokud je klient připojen."""
+        return self._client.connected
+
+    @property
+    def known_down(self) -> bool:
+        """True, dokud po neúspěšném připojení běží backoff."""
+        return not self._client.connected and monotonic() < self._retry_at
+
+    @property
+    def retry_in(self) -> float:
+        """Počet sekund do dalšího pokusu o připojení."""
+        return max(0.0, self._retry_at - monotonic())
+
+    @property
+    def idle_for(self) -> float:
+        """Doba od poslední úspěšné transakce (s)."""
+        return monotonic() - self.last_activity
+
+    async def async_ensure_connected(self) -> bool:
+        """Zajistí připojení; během backoffu vrací okamžitě False."""
+        if self._client.connected:
+            return True
+        if self.known_down:
+            return False
+        async with self._connect_lock:
+            if self._client.connected:
+                return True
+            if self.known_down:
+                return False
+            _LOGGER.info(f"Async Modbus klient není připojen, pokouším se připojit k {self._name}")
+            try:
+                await self._client.connect()
+            except Exception as e:
+                _LOGGER.warning(f"Selhalo připojení Async Modbus klienta k {self._name}: {e}")
+            if self._client.connected:
+                if self.last_activity:
+                    self.reconnects += 1
+                self._backoff = RECONNECT_BACKOFF_MIN
+                self._consecutive_timeouts = 0
+                self.last_activity = monotonic()
+                return True
+            self._schedule_retry()
+            return False
+
+    def record_success(self) -> None:
+        """Zaznamená úspěšnou transakci."""
+        self._consecutive_timeouts = 0
+        self.last_activity = monotonic()
+
+    def record_timeout(self) -> None:
+        """Zaznamená timeout; opakované timeouty ukončí polootevřené spojení."""
+        self._consecutive_timeouts += 1
+        if self._consecutive_timeouts >= HALF_OPEN_TIMEOUTS and self._client.connected:
+            _LOGGER.warning(
+                f"{self._consecutive_timeouts} timeouty po sobě na {self._name}, spojení považuji za polootevřené"
+            )
+            self.mark_failed()
+
+    def mark_failed(self) -> None:
+        """Zavře spojení po chybě a naplánuje obnovu.
+
+        Backoff roste jen při přechodu z připojeného stavu nebo po uplynutí
+        naplánované prodlevy; další chyby téhož výpadku (bloky ve frontě) ho nemění.
+        """
+        was_connected = self._client.connected
+        if was_connected:
+            self._client.close()
+        self._consecutive_timeouts = 0
+        if was_connected or monotonic() >= self._retry_at:
+            self._schedule_retry()
+
+    def close(self) -> None:
+        """Zavře spojení (při ukončení)."""
+        if self._client.connected:
+            self._client.close()
+
+    def _schedule_retry(self) -> None:
+        """Naplánuje další pokus o připojení s backoffem a jitterem."""
+        delay = self._backoff * random.uniform(1 - RECONNECT_JITTER, 1 + RECONNECT_JITTER)
+        self._retry_at = monotonic() + delay
+        self._backoff = min(self._backoff * 2, RECONNECT_BACKOFF_MAX)
+        _LOGGER.debug(f"Další pokus o připojení k {self._name} za {delay:.1f} s")
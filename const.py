@@ -17,12 +17,31 @@ from homeassistant.const import (
     UnitOfFrequency,
     PERCENTAGE,
     UnitOfTime,
+    UnitOfInformation,
     POWER_VOLT_AMPERE_REACTIVE,
 )
+from homeassistant.helpers.entity import EntityCategory
 
 DOMAIN = "sunway_fve"
+DATA_BUSES = f"{DOMAIN}_buses" # hass.data: sdílená spojení (brána / sériová linka) podle endpointu
+DATA_PROFILES = f"{DOMAIN}_profiles" # hass.data: cache profilů podporovaných registrů
 DEFAULT_PORT = 502
 DEFAULT_SLAVE_ID = 1
+
+# --- Transport ---
+CONF_TRANSPORT = "transport"
+TRANSPORT_TCP = "tcp" # Modbus TCP (Wi-Fi/LAN dongle)
+TRANSPORT_RTU_OVER_TCP = "rtu_over_tcp" # RTU rámce přes transparentní sériový/TCP převodník
+TRANSPORT_SERIAL = "serial" # Modbus RTU přes RS485 (USB převodník)
+CONF_SERIAL_PORT = "serial_port"
+CONF_BAUDRATE = "baudrate"
+CONF_PARITY = "parity"
+CONF_STOPBITS = "stopbits"
+CONF_BYTESIZE = "bytesize"
+DEFAULT_BAUDRATE = 9600
+DEFAULT_PARITY = "N"
+DEFAULT_STOPBITS = 1
+DEFAULT_BYTESIZE = 8
 # DEFAULT_SCAN_INTERVAL už nepotřebujeme globálně
 
 # === NOVÉ: Definice skenovacích skupin ===
@@ -30,8 +49,121 @@ SCAN_GROUP_REALTIME = "realtime" # Pro rychle se měnící hodnoty (V, A, W, Hz)
 SCAN_GROUP_DAILY_TOTALS = "daily" # Pro denní součty energie, stavové registry - např. 120s
 SCAN_GROUP_LIFETIME_TOTALS = "totals" # Pro celkové součty energie - např. 600s
 SCAN_GROUP_INFO = "info" # Pro statické informace (SN, FW) - např. 3600s
+# Výchozí intervaly skupin v sekundách (lze změnit v Options)
+DEFAULT_SCAN_INTERVALS = {
+    SCAN_GROUP_REALTIME: 30,
+    SCAN_GROUP_DAILY_TOTALS: 120,
+    SCAN_GROUP_LIFETIME_TOTALS: 600,
+    SCAN_GROUP_INFO: 3600,
+}
 # === KONEC NOVÉ ČÁSTI ===
 
+# --- Adaptivní dotazování ---
+# Interval skupiny se podle aktivity mění mezi floor a ceiling (Options: "<skupina>_floor", "<skupina>_ceiling")
+CONF_SCAN_FLOOR_SUFFIX = "_floor"
+CONF_SCAN_CEILING_SUFFIX = "_ceiling"
+DEFAULT_SCAN_FLOORS = {
+    SCAN_GROUP_REALTIME: 10,
+    SCAN_GROUP_DAILY_TOTALS: 60,
+    SCAN_GROUP_LIFETIME_TOTALS: 300,
+}
+DEFAULT_SCAN_CEILINGS = {
+    SCAN_GROUP_REALTIME: 300,
+    SCAN_GROUP_DAILY_TOTALS: 900,
+    SCAN_GROUP_LIFETIME_TOTALS: 3600,
+}
+ADAPTIVE_STATUS_KEY = "running_status"
+ADAPTIVE_STANDBY_STATUSES = (0,) # Wait - střídač nevyrábí (typicky v noci)
+ADAPTIVE_POWER_KEY = "pv_total_power"
+ADAPTIVE_RAMP_RATE = 0.005 # kW/s (0.3 kW/min) - rychlejší změna FV výkonu zrychlí čtení na floor
+ADAPTIVE_STABLE_TOLERANCE = 0.05 # Relativní změna, pod kterou se hodnota považuje za stabilní
+ADAPTIVE_WRITE_BOOST = 120 # Po zápisu se po tuto dobu čte s intervalem floor (s)
+
+# --- Profil podporovaných registrů ---
+# Podle sériového čísla a firmwaru se vybírá uložený profil (viz profiles.py)
+PROFILE_SERIAL_KEY = "inverter_sn"
+PROFILE_FIRMWARE_KEY = "firmware_version"
+PROFILE_TTL = 30 * 86400 # Po této době se profil otestuje znovu (s)
+PROFILE_CONFIRM_READS = 2 # Odmítnutý rozsah se před uložením do profilu ověří tolika dalšími čteními
+
+# --- Karanténa odmítaných registrů ---
+# Registry, které zařízení odmítá (Illegal Data Address), se po půlení bloku
+# vyřadí z plánu a znovu zkusí až po prodlevě, která se při dalším odmítnutí zdvojnásobí
+QUARANTINE_RETRY_MIN = 600 # První prodleva před dalším pokusem (s)
+QUARANTINE_RETRY_MAX = 86400 # Max. prodleva mezi pokusy (s)
+QUARANTINE_SAVE_DELAY = 10 # Zpoždění uložení karantény do úložiště HA (s)
+# Jen tyto výjimky Modbus znamenají, že zařízení registry nepodporuje (Illegal Data
+# Address, Illegal Data Value); ostatní (Busy, chyby brány) jsou běžné selhání čtení
+MODBUS_REJECT_EXCEPTION_CODES = (0x02, 0x03)
+
+# --- Plán čtení podle registru entit ---
+# Registry zakázaných entit se nečtou; tyto hodnoty potřebuje coordinator sám
+# (adaptivní plánování, identifikace profilu)
+ALWAYS_POLLED_KEYS = (ADAPTIVE_STATUS_KEY, ADAPTIVE_POWER_KEY, PROFILE_SERIAL_KEY, PROFILE_FIRMWARE_KEY)
+
+# --- Blokové čtení registrů ---
+MODBUS_MAX_READ_REGISTERS = 125 # Limit PDU pro funkce 0x03/0x04
+MODBUS_MAX_WRITE_REGISTERS = 123 # Limit PDU pro funkci 0x10
+CONF_MAX_REGISTER_GAP = "max_register_gap" # Max. počet nepotřebných registrů, které se ještě přečtou v rámci bloku
+DEFAULT_MAX_REGISTER_GAP = 8
+
+# --- Fronta požadavků ---
+CONF_MAX_IN_FLIGHT = "max_in_flight" # Max. počet současně rozpracovaných transakcí na zařízení
+DEFAULT_MAX_IN_FLIGHT = 1
+CONF_REQUEST_TIMEOUT = "request_timeout" # Timeout jedné transakce na sběrnici (s)
+DEFAULT_REQUEST_TIMEOUT = 10
+
+# --- Sdružování zápisů ---
+CONF_WRITE_DEBOUNCE = "write_debounce" # Okno, ve kterém se zápisy number entit sdružují (s, 0 = hned)
+DEFAULT_WRITE_DEBOUNCE = 1.0
+
+# --- Historie realtime vzorků ---
+# Vzorky realtime skupiny se drží v paměti (kruhový buffer), do HA se stav
+# zapisuje nejvýše jednou za state_interval s agregáty za interval
+CONF_HISTORY_SIZE = "history_size" # Počet vzorků na hodnotu (0 = bez historie)
+DEFAULT_HISTORY_SIZE = 240
+CONF_STATE_INTERVAL = "state_interval" # Min. interval zápisu stavu hodnot s historií (s)
+DEFAULT_STATE_INTERVAL = 30
+
+# --- Statistiky energie ---
+# Čítače energie (TOTAL_INCREASING) se sčítají v integraci a hodinové součty
+# se importují do dlouhodobých statistik HA jako externí statistiky (viz energy.py)
+CONF_ENERGY_STATISTICS = "energy_statistics" # Import externích statistik energie
+DEFAULT_ENERGY_STATISTICS = True
+ENERGY_GLITCH_POWER = 100.0 # kW - rychlejší přírůstek čítače je podezřelý a čeká na potvrzení
+ENERGY_STEP_TOLERANCE = 1.0 # kWh navíc k limitu přírůstku (rozlišení čítačů, zaokrouhlení)
+ENERGY_RESET_WINDOW = 3600 # Denní čítač se smí vynulovat jen v této době kolem místní půlnoci (s)
+ENERGY_MAX_PENDING_HOURS = 168 # Max. počet hodin čekajících na import (bez recorderu)
+ENERGY_SAVE_DELAY = 30 # Zpoždění uložení stavu čítačů do úložiště HA (s)
+
+# --- Správa spojení ---
+RECONNECT_BACKOFF_MIN = 2 # První prodleva před dalším pokusem o připojení (s)
+RECONNECT_BACKOFF_MAX = 300 # Max. prodleva mezi pokusy o připojení (s)
+RECONNECT_JITTER = 0.2 # Náhodný rozptyl prodlevy (±20 %)
+HALF_OPEN_TIMEOUTS = 2 # Počet timeoutů po sobě, po kterém se spojení považuje za polootevřené
+KEEPALIVE_INTERVAL = 60 # Po této době nečinnosti se spojení ověří levným čtením (s)
+KEEPALIVE_ADDRESS = 10000 # Registr pro keepalive čtení (začátek sériového čísla)
+
+# --- Služby ---
+SERVICE_WRITE_SETTINGS = "write_settings" # Dávkový zápis více RW hodnot najednou
+SERVICE_GET_SAMPLES = "get_samples" # Surové vzorky z historie realtime hodnot
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_VALUES = "values"
+ATTR_KEYS = "keys"
+ATTR_WINDOW = "window"
+
+# --- Zápis stavů entit ---
+DEFAULT_STATE_MAX_AGE = 900 # Heartbeat: nezměněný stav se zapíše nejpozději po 15 minutách
+# Deadbandy realtime analogových hodnot - alespoň jeden krok registru, aby se šum v posledním
+# bitu nezapisoval do HA při každém cyklu (změna <= deadband se zapíše až heartbeatem)
+DEADBAND_VOLTAGE = 0.5 # V (krok 0.1 V)
+DEADBAND_CELL_VOLTAGE = 0.005 # V (napětí článků, krok 0.001 V)
+DEADBAND_CURRENT = 0.15 # A (krok 0.1 A)
+DEADBAND_POWER = 0.02 # kW (krok 0.001 kW)
+DEADBAND_FREQUENCY = 0.025 # Hz (krok 0.01 Hz)
+DEADBAND_TEMPERATURE = 0.15 # °C (krok 0.1 °C)
+DEADBAND_SOC = 0.1 # % (krok 0.01 %)
+
 # --- Definice Dataclass pro Popis Senzoru ---
 @dataclass
 class SunwayModbusSensorEntityDescription(SensorEntityDescription):
@@ -43,9 +175,13 @@ class SunwayModbusSensorEntityDescription(SensorEntityDescription):
     read_only: bool = True
     register_type: str = "holding"
     scan_group: str = SCAN_GROUP_REALTIME # <-- PŘIDÁNO pole, výchozí je realtime
+    deadband: float = 0.0 # Změna menší nebo rovna deadbandu se do HA nezapisuje (0 = přesná shoda)
+    max_state_age: float = DEFAULT_STATE_MAX_AGE # Nezměněná hodnota se přesto zapíše po této době (s)
+    resets_daily: bool = False # Čítač energie, který střídač o půlnoci nuluje
 
 # --- Seznam Definovaných Senzorů ---
 # Nyní s přiřazenou 'scan_group' pro každý senzor
+# Málo používané detailní registry (BMS, chybové kódy) jsou ve výchozím stavu zakázané a nečtou se
 SENSOR_DESCRIPTIONS: list[SunwayModbusSensorEntityDescription] = [
     # === Blok 10000+ ===
     SunwayModbusSensorEntityDescription(
@@ -57,32 +193,32 @@ SENSOR_DESCRIPTIONS: list[SunwayModbusSensorEntityDescription] = [
         register_address=10011, register_count=2, data_type="U32", read_only=True, register_type="holding", scan_group=SCAN_GROUP_INFO,
     ),
     SunwayModbusSensorEntityDescription(
-        key="grid_regulation", name="Grid Regulation Status",
+        key="grid_regulation", name="Grid Regulation Status", entity_registry_enabled_default=False,
         register_address=10104, register_count=1, data_type="U16", read_only=True, register_type="holding", scan_group=SCAN_GROUP_DAILY_TOTALS, # Stav se nemění moc často
     ),
     SunwayModbusSensorEntityDescription(
         key="running_status", name="Inverter Running Status",
-        register_address=10105, register_count=1, data_type="U16", read_only=True, register_type="holding", scan_group=SCAN_GROUP_DAILY_TOTALS, # Stav se nemění moc často
+        register_address=10105, register_count=1, data_type="U16", read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME, # S realtime skupinou: adaptivní plánování potřebuje čerstvý stav (ráno ze standby)
     ),
     SunwayModbusSensorEntityDescription(
-        key="fault_flag1", name="Fault FLAG1",
+        key="fault_flag1", name="Fault FLAG1", entity_registry_enabled_default=False,
         register_address=10112, register_count=2, data_type="U32", read_only=True, register_type="holding", scan_group=SCAN_GROUP_DAILY_TOTALS, # TODO: Needs parsing
     ),
     SunwayModbusSensorEntityDescription(
         key="phase_a_power_on_meter", name="Phase A Power on Meter", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=10114, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=10114, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="phase_b_power_on_meter", name="Phase B Power on Meter", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=10116, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=10116, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="phase_c_power_on_meter", name="Phase C Power on Meter", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=10118, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=10118, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="total_power_on_meter", name="Total Power on Meter", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=10120, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=10120, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="total_grid_injection_energy_meter", name="Total Grid-Injection Energy on Meter", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=2,
@@ -93,52 +229,52 @@ SENSOR_DESCRIPTIONS: list[SunwayModbusSensorEntityDescription] = [
         register_address=10996, register_count=2, data_type="U32", scale=100.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_LIFETIME_TOTALS, # Celkový součet
     ),
     SunwayModbusSensorEntityDescription(
-        key="grid_line_ab_voltage", name="Grid Lines A-B Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=10998, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="grid_line_ab_voltage", name="Grid Lines A-B Voltage", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        register_address=10998, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="grid_line_bc_voltage", name="Grid Lines B-C Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=10999, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="grid_line_bc_voltage", name="Grid Lines B-C Voltage", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        register_address=10999, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="grid_line_ca_voltage", name="Grid Lines C-A Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11000, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="grid_line_ca_voltage", name="Grid Lines C-A Voltage", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        register_address=11000, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="grid_phase_a_voltage", name="Grid Phase A Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11001, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11001, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
     ),
      SunwayModbusSensorEntityDescription(
         key="grid_phase_a_current", name="Grid Phase A Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11002, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11002, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_CURRENT, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="grid_phase_b_voltage", name="Grid Phase B Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11003, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11003, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="grid_phase_b_current", name="Grid Phase B Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11004, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11004, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_CURRENT, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="grid_phase_c_voltage", name="Grid Phase C Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11005, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11005, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="grid_phase_c_current", name="Grid Phase C Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11006, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11006, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_CURRENT, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME,
     ),
      SunwayModbusSensorEntityDescription(
         key="grid_frequency", name="Grid Frequency", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2,
-        register_address=11007, register_count=1, data_type="U16", scale=100.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11007, register_count=1, data_type="U16", scale=100.0, deadband=DEADBAND_FREQUENCY, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="power_ac", name="AC Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=11008, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11008, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="pv_gen_today", name="PV Generation Today", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=1,
-        register_address=11010, register_count=2, data_type="U32", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS, # Denní součet
+        register_address=11010, register_count=2, data_type="U32", scale=10.0, resets_daily=True, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS, # Denní součet
     ),
      SunwayModbusSensorEntityDescription(
         key="pv_gen_total", name="PV Generation Total", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=1,
@@ -150,125 +286,125 @@ SENSOR_DESCRIPTIONS: list[SunwayModbusSensorEntityDescription] = [
     ),
      SunwayModbusSensorEntityDescription(
         key="pv_total_power", name="PV Input Total Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=11016, register_count=2, data_type="U32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11016, register_count=2, data_type="U32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="temp_sensor_1", name="Temperature Sensor 1", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11018, register_count=1, data_type="I16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11018, register_count=1, data_type="I16", scale=10.0, deadband=DEADBAND_TEMPERATURE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="temp_sensor_2", name="Temperature Sensor 2", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11019, register_count=1, data_type="I16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="temp_sensor_2", name="Temperature Sensor 2", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        register_address=11019, register_count=1, data_type="I16", scale=10.0, deadband=DEADBAND_TEMPERATURE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="temp_sensor_3", name="Temperature Sensor 3", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11020, register_count=1, data_type="I16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="temp_sensor_3", name="Temperature Sensor 3", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        register_address=11020, register_count=1, data_type="I16", scale=10.0, deadband=DEADBAND_TEMPERATURE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="temp_sensor_4", name="Temperature Sensor 4", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11021, register_count=1, data_type="I16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="temp_sensor_4", name="Temperature Sensor 4", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        register_address=11021, register_count=1, data_type="I16", scale=10.0, deadband=DEADBAND_TEMPERATURE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="pv1_voltage", name="PV1 Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11028, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11028, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
      SunwayModbusSensorEntityDescription(
         key="pv1_current", name="PV1 Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11029, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME, # OPRAVENO
+        register_address=11029, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_CURRENT, read_only=True, register_type="holding", scan_group=SCAN_GROUP_REALTIME, # OPRAVENO
     ),
     SunwayModbusSensorEntityDescription(
         key="pv2_voltage", name="PV2 Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11030, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11030, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="pv2_current", name="PV2 Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=11031, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME, # Odhad: input
+        register_address=11031, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_CURRENT, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME, # Odhad: input
     ),
     SunwayModbusSensorEntityDescription(
         key="pv1_input_power", name="PV1 Input Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=11032, register_count=2, data_type="U32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11032, register_count=2, data_type="U32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="pv2_input_power", name="PV2 Input Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=11034, register_count=2, data_type="U32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=11034, register_count=2, data_type="U32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="arm_fault_flag1", name="ARM Fault FLAG1",
+        key="arm_fault_flag1", name="ARM Fault FLAG1", entity_registry_enabled_default=False,
         register_address=11036, register_count=2, data_type="U32", read_only=True, register_type="holding", scan_group=SCAN_GROUP_DAILY_TOTALS, # TODO: Needs parsing
     ),
 
     # === Blok 4xxxx (Backup, Battery, Energy totals) ===
     SunwayModbusSensorEntityDescription(
         key="backup_a_v", name="Backup Phase A Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=40200, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40200, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_a_i", name="Backup Phase A Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=40201, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40201, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_CURRENT, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_a_f", name="Backup Phase A Frequency", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2,
-        register_address=40202, register_count=1, data_type="U16", scale=100.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40202, register_count=1, data_type="U16", scale=100.0, deadband=DEADBAND_FREQUENCY, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_a_p", name="Backup Phase A Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=40204, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40204, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_b_v", name="Backup Phase B Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=40210, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40210, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_b_i", name="Backup Phase B Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=40211, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40211, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_CURRENT, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_b_f", name="Backup Phase B Frequency", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2,
-        register_address=40212, register_count=1, data_type="U16", scale=100.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40212, register_count=1, data_type="U16", scale=100.0, deadband=DEADBAND_FREQUENCY, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_b_p", name="Backup Phase B Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=40214, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40214, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_c_v", name="Backup Phase C Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=40220, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40220, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_c_i", name="Backup Phase C Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=40221, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40221, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_CURRENT, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_c_f", name="Backup Phase C Frequency", native_unit_of_measurement=UnitOfFrequency.HERTZ, device_class=SensorDeviceClass.FREQUENCY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2,
-        register_address=40222, register_count=1, data_type="U16", scale=100.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40222, register_count=1, data_type="U16", scale=100.0, deadband=DEADBAND_FREQUENCY, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="backup_c_p", name="Backup Phase C Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=40224, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40224, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="total_backup_p", name="Total Backup Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=40230, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40230, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="invt_a_p", name="Inverter Phase A Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=40236, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40236, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="invt_b_p", name="Inverter Phase B Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=40242, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40242, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="invt_c_p", name="Inverter Phase C Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=40248, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40248, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="battery_v", name="Battery Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=40254, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40254, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
      SunwayModbusSensorEntityDescription(
         key="battery_current", name="Battery Current", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=40255, register_count=1, data_type="I16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40255, register_count=1, data_type="I16", scale=10.0, deadband=DEADBAND_CURRENT, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="battery_mode", name="Battery Mode", # 0:discharge, 1:charge
@@ -276,33 +412,33 @@ SENSOR_DESCRIPTIONS: list[SunwayModbusSensorEntityDescription] = [
     ),
     SunwayModbusSensorEntityDescription(
         key="battery_power", name="Battery Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=40258, register_count=2, data_type="I32", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=40258, register_count=2, data_type="I32", scale=1000.0, deadband=DEADBAND_POWER, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
 
     # === Blok 41xxx ===
     SunwayModbusSensorEntityDescription(
         key="energy_grid_injection_today", name="Energy Grid Injection Today", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=1,
-        register_address=41000, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
+        register_address=41000, register_count=1, data_type="U16", scale=10.0, resets_daily=True, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
     ),
     SunwayModbusSensorEntityDescription(
         key="energy_grid_purchase_today", name="Energy Grid Purchase Today", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=1,
-        register_address=41001, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
+        register_address=41001, register_count=1, data_type="U16", scale=10.0, resets_daily=True, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
     ),
     SunwayModbusSensorEntityDescription(
         key="energy_backup_output_today", name="Energy Backup Output Today", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=1,
-        register_address=41002, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
+        register_address=41002, register_count=1, data_type="U16", scale=10.0, resets_daily=True, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
     ),
     SunwayModbusSensorEntityDescription(
         key="energy_battery_charge_today", name="Energy Battery Charge Today", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=1,
-        register_address=41003, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
+        register_address=41003, register_count=1, data_type="U16", scale=10.0, resets_daily=True, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
     ),
     SunwayModbusSensorEntityDescription(
         key="energy_battery_discharge_today", name="Energy Battery Discharge Today", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=1,
-        register_address=41004, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
+        register_address=41004, register_count=1, data_type="U16", scale=10.0, resets_daily=True, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
     ),
     SunwayModbusSensorEntityDescription(
         key="energy_loading_today", name="Loading Energy Today", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=1,
-        register_address=41006, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
+        register_address=41006, register_count=1, data_type="U16", scale=10.0, resets_daily=True, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS,
     ),
     SunwayModbusSensorEntityDescription(
         key="total_energy_injected_grid", name="Total Energy Injected to Grid", native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR, device_class=SensorDeviceClass.ENERGY, state_class=SensorStateClass.TOTAL_INCREASING, suggested_display_precision=1,
@@ -335,38 +471,38 @@ SENSOR_DESCRIPTIONS: list[SunwayModbusSensorEntityDescription] = [
 
     # === Blok 42xxx ===
     SunwayModbusSensorEntityDescription(
-        key="battery_types", name="Battery Types",
+        key="battery_types", name="Battery Types", entity_registry_enabled_default=False,
         register_address=42000, register_count=1, data_type="U16", read_only=True, register_type="holding", scan_group=SCAN_GROUP_INFO,
     ),
     SunwayModbusSensorEntityDescription(
-        key="battery_strings", name="Battery Strings",
+        key="battery_strings", name="Battery Strings", entity_registry_enabled_default=False,
         register_address=42001, register_count=1, data_type="U16", read_only=True, register_type="holding", scan_group=SCAN_GROUP_INFO,
     ),
     SunwayModbusSensorEntityDescription(
-        key="battery_protocol", name="Battery Protocol",
+        key="battery_protocol", name="Battery Protocol", entity_registry_enabled_default=False,
         register_address=42002, register_count=1, data_type="U16", read_only=True, register_type="holding", scan_group=SCAN_GROUP_INFO,
     ),
     SunwayModbusSensorEntityDescription(
-        key="bms_software_version", name="BMS Software Version",
+        key="bms_software_version", name="BMS Software Version", entity_registry_enabled_default=False,
         register_address=42003, register_count=1, data_type="U16", read_only=True, register_type="holding", scan_group=SCAN_GROUP_INFO,
     ),
      SunwayModbusSensorEntityDescription(
-        key="bms_hardware_version", name="BMS Hardware Version",
+        key="bms_hardware_version", name="BMS Hardware Version", entity_registry_enabled_default=False,
         register_address=42004, register_count=1, data_type="U16", read_only=True, register_type="holding", scan_group=SCAN_GROUP_INFO,
     ),
     SunwayModbusSensorEntityDescription(
-        key="bms_charge_imax", name="BMS Charge Imax", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        key="bms_charge_imax", name="BMS Charge Imax", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
         register_address=42005, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS, # Limit se nemění moc často
     ),
     SunwayModbusSensorEntityDescription(
-        key="bms_discharge_imax", name="BMS Discharge Imax", native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        key="bms_discharge_imax", name="BMS Discharge Imax", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfElectricCurrent.AMPERE, device_class=SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
         register_address=42006, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS, # Limit se nemění moc často
     ),
 
     # === Blok 43xxx ===
     SunwayModbusSensorEntityDescription(
         key="battery_soc", name="Battery SOC", native_unit_of_measurement=PERCENTAGE, device_class=SensorDeviceClass.BATTERY, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2,
-        register_address=43000, register_count=1, data_type="U16", scale=100.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=43000, register_count=1, data_type="U16", scale=100.0, deadband=DEADBAND_SOC, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
         key="battery_soh", name="Battery SOH", native_unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=2,
@@ -378,50 +514,127 @@ SENSOR_DESCRIPTIONS: list[SunwayModbusSensorEntityDescription] = [
     ),
     SunwayModbusSensorEntityDescription(
         key="bms_pack_temp", name="BMS Pack Temperature", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=43003, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        register_address=43003, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_TEMPERATURE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="bms_max_cell_temp_id", name="BMS Max Cell Temperature ID",
+        key="bms_max_cell_temp_id", name="BMS Max Cell Temperature ID", entity_registry_enabled_default=False,
         register_address=43008, register_count=1, data_type="U16", read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
      SunwayModbusSensorEntityDescription(
-        key="bms_max_cell_temp", name="BMS Max Cell Temperature", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=43009, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="bms_max_cell_temp", name="BMS Max Cell Temperature", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        register_address=43009, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_TEMPERATURE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
      SunwayModbusSensorEntityDescription(
-        key="bms_min_cell_temp_id", name="BMS Min Cell Temperature ID",
+        key="bms_min_cell_temp_id", name="BMS Min Cell Temperature ID", entity_registry_enabled_default=False,
         register_address=43010, register_count=1, data_type="U16", read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
      SunwayModbusSensorEntityDescription(
-        key="bms_min_cell_temp", name="BMS Min Cell Temperature", native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
-        register_address=43011, register_count=1, data_type="U16", scale=10.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="bms_min_cell_temp", name="BMS Min Cell Temperature", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        register_address=43011, register_count=1, data_type="U16", scale=10.0, deadband=DEADBAND_TEMPERATURE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
      SunwayModbusSensorEntityDescription(
-        key="bms_max_cell_volt_id", name="BMS Max Cell Voltage ID",
+        key="bms_max_cell_volt_id", name="BMS Max Cell Voltage ID", entity_registry_enabled_default=False,
         register_address=43012, register_count=1, data_type="U16", read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
      SunwayModbusSensorEntityDescription(
-        key="bms_max_cell_volt", name="BMS Max Cell Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=43013, register_count=1, data_type="U16", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="bms_max_cell_volt", name="BMS Max Cell Voltage", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
+        register_address=43013, register_count=1, data_type="U16", scale=1000.0, deadband=DEADBAND_CELL_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="bms_min_cell_volt_id", name="BMS Min Cell Voltage ID",
+        key="bms_min_cell_volt_id", name="BMS Min Cell Voltage ID", entity_registry_enabled_default=False,
         register_address=43014, register_count=1, data_type="U16", read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="bms_min_cell_volt", name="BMS Min Cell Voltage", native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
-        register_address=43015, register_count=1, data_type="U16", scale=1000.0, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
+        key="bms_min_cell_volt", name="BMS Min Cell Voltage", entity_registry_enabled_default=False, native_unit_of_measurement=UnitOfElectricPotential.VOLT, device_class=SensorDeviceClass.VOLTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
+        register_address=43015, register_count=1, data_type="U16", scale=1000.0, deadband=DEADBAND_CELL_VOLTAGE, read_only=True, register_type="input", scan_group=SCAN_GROUP_REALTIME,
     ),
     SunwayModbusSensorEntityDescription(
-        key="bms_error_code", name="BMS ERROR CODE",
+        key="bms_error_code", name="BMS ERROR CODE", entity_registry_enabled_default=False,
         register_address=43016, register_count=2, data_type="U32", read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS, # TODO: Needs parsing
     ),
      SunwayModbusSensorEntityDescription(
-        key="bms_warn_code", name="BMS WARN CODE",
+        key="bms_warn_code", name="BMS WARN CODE", entity_registry_enabled_default=False,
         register_address=43018, register_count=2, data_type="U32", read_only=True, register_type="input", scan_group=SCAN_GROUP_DAILY_TOTALS, # TODO: Needs parsing
     ),
 ]
 
+# --- Odvozené senzory (počítané z přečtených hodnot, viz derived.py) ---
+# Hodnota = scale * Σ(koeficient * vstup) čitatele / Σ(koeficient * vstup) jmenovatele
+@dataclass
+class SunwayDerivedSensorEntityDescription(SensorEntityDescription):
+    _: KW_ONLY
+    numerator: tuple[tuple[str, float], ...] # (klíč vstupu, koeficient)
+    denominator: tuple[tuple[str, float], ...] = () # Prázdný = bez dělení; nulový jmenovatel = neznámá hodnota
+    scale: float = 1.0
+    deadband: float = 0.0
+
+DERIVED_SENSOR_DESCRIPTIONS: list[SunwayDerivedSensorEntityDescription] = [
+    SunwayDerivedSensorEntityDescription(
+        key="pv_strings_power", name="PV Strings Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
+        numerator=(("pv1_input_power", 1.0), ("pv2_input_power", 1.0)), deadband=DEADBAND_POWER,
+    ),
+    SunwayDerivedSensorEntityDescription(
+        # Výstup střídače minus dodávka do sítě (výkon na elektroměru je kladný při dodávce)
+        key="house_load_power", name="House Load Power", native_unit_of_measurement=UnitOfPower.KILO_WATT, device_class=SensorDeviceClass.POWER, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
+        numerator=(("power_ac", 1.0), ("total_power_on_meter", -1.0)), deadband=DEADBAND_POWER,
+    ),
+    SunwayDerivedSensorEntityDescription(
+        key="self_consumption_today", name="Self-Consumption Ratio Today", native_unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        numerator=(("pv_gen_today", 1.0), ("energy_grid_injection_today", -1.0)), denominator=(("pv_gen_today", 1.0),), scale=100.0,
+    ),
+    SunwayDerivedSensorEntityDescription(
+        key="self_sufficiency_today", name="Self-Sufficiency Ratio Today", native_unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        numerator=(("energy_loading_today", 1.0), ("energy_grid_purchase_today", -1.0)), denominator=(("energy_loading_today", 1.0),), scale=100.0,
+    ),
+    SunwayDerivedSensorEntityDescription(
+        key="battery_round_trip_efficiency", name="Battery Round-Trip Efficiency", native_unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=1,
+        numerator=(("total_energy_battery_discharge", 1.0),), denominator=(("total_energy_battery_charge", 1.0),), scale=100.0,
+    ),
+]
+
+# --- Diagnostické senzory (metriky dotazovacích cyklů) ---
+@dataclass
+class SunwayDiagnosticSensorEntityDescription(SensorEntityDescription):
+    _: KW_ONLY
+    metric: str # Atribut PollMetrics, ze kterého se čte hodnota
+    entity_category: EntityCategory = EntityCategory.DIAGNOSTIC
+
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: list[SunwayDiagnosticSensorEntityDescription] = [
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_cycle_duration", name="Poll Cycle Duration", metric="last_cycle_duration", native_unit_of_measurement=UnitOfTime.SECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_cycle_p95", name="Poll Cycle Duration P95", entity_registry_enabled_default=False, metric="cycle_p95", native_unit_of_measurement=UnitOfTime.SECONDS, device_class=SensorDeviceClass.DURATION, suggested_display_precision=3,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_request_latency", name="Modbus Request Latency", entity_registry_enabled_default=False, metric="block_latency_mean", native_unit_of_measurement=UnitOfTime.SECONDS, device_class=SensorDeviceClass.DURATION, suggested_display_precision=3,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_lock_wait", name="Poll Lock Wait", entity_registry_enabled_default=False, metric="last_lock_wait", native_unit_of_measurement=UnitOfTime.SECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_decode_time", name="Poll Decode Time", entity_registry_enabled_default=False, metric="last_decode_time", native_unit_of_measurement=UnitOfTime.SECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=4,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="write_latency", name="Modbus Write Latency", metric="last_write_latency", native_unit_of_measurement=UnitOfTime.SECONDS, device_class=SensorDeviceClass.DURATION, state_class=SensorStateClass.MEASUREMENT, suggested_display_precision=3,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_requests", name="Modbus Requests", metric="requests", state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_timeouts", name="Modbus Timeouts", metric="timeouts", state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_retries", name="Modbus Retries", entity_registry_enabled_default=False, metric="retries", state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_failed_cycles", name="Failed Poll Cycles", metric="failed_cycles", state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SunwayDiagnosticSensorEntityDescription(
+        key="poll_bytes", name="Modbus Bytes Transferred", entity_registry_enabled_default=False, metric="bytes_total", native_unit_of_measurement=UnitOfInformation.BYTES, device_class=SensorDeviceClass.DATA_SIZE, state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+]
+
 # --- Definice pro Ovládací Prvky ---
 # Přidán scan_group, typicky realtime pro zobrazení aktuálního stavu
 RW_REGISTER_MAP = {
@@ -0,0 +1,101 @@
+# custom_components/sunway_fve/derived.py
+"""Odvozené hodnoty počítané z již přečtených registrů.
+
+Součty a poměry (FV výkon ze stringů, spotřeba domu, míra vlastní spotřeby,
+účinnost baterie) si uživatelé stavěli jako template senzory, které se
+přepočítávají při každé změně každého vstupu. Odvozené hodnoty jsou
+deklarované v const.py jako podíl dvou lineárních kombinací hodnot indexu;
+při startu se zkompilují do plochých polí slotů a koeficientů a coordinator
+je přepočítá jednou za cyklus - jen ty, kterým se změnil některý vstup.
+Nevyžadují žádný další Modbus požadavek.
+"""
+
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from .register_index import RegisterIndex
+from .value_store import ValueStore
+
+
+class DerivedValues:
+    """Zkompilované odvozené hodnoty a jejich poslední výsledky."""
+
+    __slots__ = ("keys", "values", "slot_by_key", "_slots", "_coefficients", "_bounds", "_scales", "_dependents")
+
+    def __init__(self, index: RegisterIndex, descriptions: Sequence[Any]) -> None:
+        """Zkompiluje popisy (numerator/denominator/scale) nad sloty indexu."""
+        self.keys = tuple(description.key for description in descriptions)
+        self.values: list[float | None] = [None] * len(self.keys)
+        self.slot_by_key = {key: position for position, key in enumerate(self.keys)}
+        self._slots = array("l") # sloty vstupů všech hodnot za sebou
+        self._coefficients = array("d")
+        self._bounds: list[tuple[int, int, int]] = [] # (začátek čitatele, začátek jmenovatele, konec)
+        self._scales = array("d", (description.scale for description in descriptions))
+        dependents: dict[int, list[int]] = {}
+        for position, description in enumerate(descriptions):
+            start = len(self._slots)
+            self._compile_terms(index, description.key, description.numerator)
+            split = len(self._slots)
+            self._compile_terms(index, description.key, description.denominator)
+            self._bounds.append((start, split, len(self._slots)))
+            for slot in set(self._slots[start:]):
+                dependents.setdefault(slot, []).append(position)
+        self._dependents = {slot: tuple(positions) for slot, positions in dependents.items()}
+
+    def _compile_terms(self, index: RegisterIndex, key: str, terms: Sequence[tuple[str, float]]) -> None:
+        """Připojí členy (klíč vstupu, koeficient) k plochým polím."""
+        for input_key, coefficient in terms:
+            slot = index.slot_by_key.get(input_key)
+            if slot is None or index.data_types[slot] == "STR":
+                raise ValueError(f"Odvozená hodnota {key}: neplatný vstup '{input_key}'")
+            self._slots.append(slot)
+            self._coefficients.append(coefficient)
+
+    def __len__(self) -> int:
+        """Počet odvozených hodnot."""
+        return len(self.keys)
+
+    def value(self, key: str) -> float | None:
+        """Poslední výsledek odvozené hodnoty (None = vstup neplatný nebo dělení nulou)."""
+        return self.values[self.slot_by_key[key]]
+
+    def input_slots(self, keys: Iterable[str]) -> set[int]:
+        """Sloty vstupů daných odvozených hodnot."""
+        slots = set()
+        for key in keys:
+            start, _split, end = self._bounds[self.slot_by_key[key]]
+            slots.update(self._slots[start:end])
+        return slots
+
+    def evaluate(self, store: ValueStore, changed: Iterable[int]) -> list[str]:
+        """Přepočítá hodnoty, kterým se změnil některý vstup; vrátí klíče změněných výsledků."""
+        dependents = self._dependents
+        positions = {position for slot in changed for position in dependents.get(slot, ())}
+        if not positions:
+            return []
+        slots = self._slots
+        coefficients = self._coefficients
+        values = store.values
+        valid = store.valid
+        results = self.values
+        updated = []
+        for position in sorted(positions):
+            start, split, end = self._bounds[position]
+            result = None
+            if all(valid[slots[term]] for term in range(start, end)):
+                numerator = sum(coefficients[term] * values[slots[term]] for term in range(start, split))
+                if split == end:
+                    result = round(numerator * self._scales[position], 6)
+                else:
+                    denominator = sum(coefficients[term] * values[slots[term]] for term in range(split, end))
+                    if denominator:
+                        result = round(numerator / denominator * self._scales[position], 6)
+            if result != results[position]:
+                results[position] = result
+                updated.append(self.keys[position])
+        return updated
+
+    def as_dict(self) -> dict[str, float | None]:
+        """Výsledky pro diagnostiku."""
+        return dict(zip(self.keys, self.values))
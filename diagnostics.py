@@ -0,0 +1,76 @@
+# custom_components/sunway_fve/diagnostics.py
+"""Diagnostika Sunway FVE (stažení z UI integrace)."""
+
+from time import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_SERIAL_PORT
+
+# Identifikátory zařízení a sítě se do stažené diagnostiky nedostanou
+TO_REDACT = {CONF_HOST, CONF_SERIAL_PORT, "inverter_sn"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Vrátí diagnostiku konfiguračního záznamu."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    scheduler = coordinator._scheduler
+    connection = coordinator._connection
+    pipeline = coordinator._pipeline
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "transport": {
+            "transport": coordinator.transport.transport,
+            "inter_frame_delay": coordinator.transport.inter_frame_delay,
+            "connected": connection.connected,
+            "retry_in": connection.retry_in,
+            "reconnects": connection.reconnects,
+            "shared_with_entries": len(coordinator._bus.users),
+        },
+        "scheduler": {
+            "base_intervals": scheduler.intervals,
+            "current_intervals": scheduler.current,
+            "floors": scheduler.floors,
+            "ceilings": scheduler.ceilings,
+        },
+        "pipeline": {
+            "max_in_flight": pipeline.max_in_flight,
+            "request_timeout": pipeline.request_timeout,
+            "queued": pipeline.queued,
+        },
+        "read_plans": {
+            ",".join(sorted(groups)): [
+                {"type": block.register_type, "address": block.address, "count": block.count}
+                for block in blocks
+            ]
+            for groups, blocks in coordinator._read_plans.items()
+        },
+        # Hodnoty zakázaných entit, které se nečtou
+        "disabled_values": sorted(coordinator._index.keys[slot] for slot in coordinator._disabled_slots),
+        # Rozsahy, které zařízení podle profilu nepodporuje, a rozsahy v karanténě
+        "unsupported_ranges": coordinator._unsupported_ranges,
+        "quarantine": coordinator._quarantine.as_dict(time()),
+        "write_queue": {
+            "window": coordinator._write_queue.window,
+            "pending": coordinator._write_queue.pending,
+            "coalesced": coordinator._write_queue.coalesced,
+            "skipped": coordinator._write_queue.skipped,
+        },
+        "history": None if coordinator.history is None else {
+            "capacity": coordinator.history.capacity,
+            "samples": coordinator.history.count,
+            "values": len(coordinator.history.slots),
+            "state_interval": coordinator.state_interval,
+        },
+        "derived": coordinator.derived.as_dict(),
+        "energy": None if coordinator.energy is None else coordinator.energy.as_dict(),
+        "metrics": coordinator.metrics.as_dict(),
+        "data": async_redact_data(dict(coordinator.data or {}), TO_REDACT),
+    }
@@ -0,0 +1,260 @@
+# custom_components/sunway_fve/energy.py
+"""Sčítání čítačů energie a import hodinových statistik do HA.
+
+Čítače TOTAL_INCREASING (celkové i denní) šly do dlouhodobých statistik
+HA přímo: denní čítače se nulují o půlnoci střídače a chybná čtení
+(nuly při restartu donglu) vytvoří v součtu špičku. Akumulátor proto
+přírůstky kontroluje: pokles celkového čítače je vždy chybné čtení, pokles
+denního čítače se jako nulování přijme jen kolem místní půlnoci a po
+potvrzení dalším čtením. Nepravděpodobně velký skok nahoru se přijme až
+po potvrzení (např. po dlouhém výpadku), jinak se zahodí. Součet se drží v hodinových bucketech, které se po
+skončení hodiny importují hromadně jako externí statistiky
+(sunway_fve:<zařízení>_<klíč>); denní a delší přehledy z nich HA skládá sám.
+Stav čítačů se ukládá do úložiště HA, aby součet po restartu navázal.
+"""
+
+import logging
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    DOMAIN,
+    ENERGY_GLITCH_POWER,
+    ENERGY_STEP_TOLERANCE,
+    ENERGY_RESET_WINDOW,
+    ENERGY_MAX_PENDING_HOURS,
+    ENERGY_SAVE_DELAY,
+)
+from .register_index import RegisterIndex
+from .value_store import ValueStore
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def storage_key(entry_id: str) -> str:
+    """Klíč úložiště stavu čítačů konfiguračního záznamu."""
+    return f"{DOMAIN}.energy.{entry_id}"
+
+
+async def async_remove_energy_state(hass: HomeAssistant, entry_id: str) -> None:
+    """Smaže uložený stav čítačů (při odebrání záznamu)."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry_id)).async_remove()
+
+
+def max_step(elapsed: float) -> float:
+    """Největší věrohodný přírůstek čítače (kWh) za elapsed sekund."""
+    return ENERGY_GLITCH_POWER * max(elapsed, 0.0) / 3600 + ENERGY_STEP_TOLERANCE
+
+
+class EnergyCounter:
+    """Stav jednoho čítače: poslední přijatá hodnota, součet a hodinové buckety."""
+
+    __slots__ = (
+        "daily", "last", "last_time", "candidate", "sum", "hours", "day_start", "day_sum", "resets", "glitches"
+    )
+
+    def __init__(self, daily: bool = False) -> None:
+        """Prázdný čítač (první čtení jen nastaví výchozí hodnotu); daily = nuluje se o půlnoci."""
+        self.daily = daily
+        self.last: float | None = None
+        self.last_time = 0.0 # time() poslední přijaté hodnoty
+        self.candidate: tuple[float, float] | None = None # (hodnota, čas) čekající na potvrzení
+        self.sum = 0.0 # součet přírůstků od prvního čtení (kWh)
+        self.hours: dict[int, tuple[float, float]] = {} # začátek hodiny -> (hodnota, součet) na jejím konci
+        self.day_start = 0.0 # začátek místního dne, ke kterému patří day_sum
+        self.day_sum = 0.0 # součet na začátku dne
+        self.resets = 0
+        self.glitches = 0
+
+    def _reset_expected(self, now: float, day_start: float) -> bool:
+        """True, pokud se čítač smí vynulovat (denní čítač kolem místní půlnoci)."""
+        return self.daily and (
+            now - day_start <= ENERGY_RESET_WINDOW or day_start + 86400 - now <= ENERGY_RESET_WINDOW
+        )
+
+    def update(self, value: float, now: float, day_start: float) -> None:
+        """Zpracuje přečtenou hodnotu čítače; day_start = začátek místního dne."""
+        if self.last is None:
+            self.last, self.last_time = value, now
+            return
+        if self.candidate is not None:
+            candidate, candidate_time = self.candidate
+            self.candidate = None
+            # Potvrzení: čítač od podezřelé hodnoty věrohodně pokračuje (po poklesu stále pod původní)
+            if candidate <= value <= candidate + max_step(now - candidate_time) and (
+                candidate > self.last or value < self.last
+            ):
+                if candidate < self.last:
+                    self.resets += 1
+                    self.sum += candidate # čítač začal znovu od nuly
+                else:
+                    self.sum += candidate - self.last
+                self.last, self.last_time = candidate, candidate_time
+            else:
+                self.glitches += 1
+                _LOGGER.debug(f"Chybné čtení čítače zahozeno: {candidate} (předtím {self.last}, potom {value})")
+        delta = value - self.last
+        if 0 <= delta <= max_step(now - self.last_time):
+            self.sum += delta
+            self.last, self.last_time = value, now
+        elif delta > 0 or self._reset_expected(now, day_start):
+            self.candidate = (value, now) # Skok nebo nulování - rozhodne další čtení
+        else:
+            # Celkový čítač neklesá nikdy, denní jen o půlnoci
+            self.glitches += 1
+            _LOGGER.debug(f"Pokles čítače zahozen: {value} (předtím {self.last})")
+
+    def bucket(self, hour: int) -> None:
+        """Zapíše stav na konec hodiny hour (přepisuje se do jejího konce)."""
+        if self.last is not None:
+            self.hours[hour] = (self.last, round(self.sum, 6))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Stav pro úložiště a diagnostiku."""
+        return {
+            "last": self.last,
+            "last_time": self.last_time,
+            "sum": self.sum,
+            "hours": [[hour, state, total] for hour, (state, total) in sorted(self.hours.items())],
+            "day_start": self.day_start,
+            "day_sum": self.day_sum,
+            "resets": self.resets,
+            "glitches": self.glitches,
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Obnoví stav z úložiště."""
+        self.last = data["last"]
+        self.last_time = data["last_time"]
+        self.sum = data["sum"]
+        self.hours = {hour: (state, total) for hour, state, total in data["hours"]}
+        self.day_start = data["day_start"]
+        self.day_sum = data["day_sum"]
+        self.resets = data["resets"]
+        self.glitches = data["glitches"]
+
+
+class EnergyAccumulator:
+    """Čítače energie jednoho zařízení a import jejich hodinových statistik."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        device_id: str,
+        index: RegisterIndex,
+        descriptions: Sequence[Any],
+    ) -> None:
+        """descriptions = popisy TOTAL_INCREASING čítačů; device_id je součástí statistic_id."""
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, storage_key(entry_id))
+        self._loaded = False
+        self._descriptions = {description.key: description for description in descriptions}
+        self._slots = {description.key: index.slot_by_key[description.key] for description in descriptions}
+        self._groups = {description.key: description.scan_group for description in descriptions}
+        self._statistic_prefix = f"{DOMAIN}:{slugify(device_id)}_"
+        self.counters = {description.key: EnergyCounter(description.resets_daily) for description in descriptions}
+        self._current_hour = 0
+
+    def statistic_id(self, key: str) -> str:
+        """Id externí statistiky čítače."""
+        return f"{self._statistic_prefix}{key}"
+
+    async def async_load(self) -> None:
+        """Načte stav čítačů z úložiště (jen jednou)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load() or {}
+        for key, counter_data in data.get("counters", {}).items():
+            if key in self.counters:
+                self.counters[key].load(counter_data)
+        if data:
+            _LOGGER.debug(f"Načten stav {len(self.counters)} čítačů energie")
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Data pro úložiště."""
+        return {"counters": {key: counter.as_dict() for key, counter in self.counters.items()}}
+
+    @callback
+    def record(self, store: ValueStore, groups: Iterable[str], now: float) -> None:
+        """Zpracuje čítače přečtené v tomto cyklu; po konci hodiny importuje statistiky."""
+        groups = set(groups)
+        hour = int(now // 3600 * 3600)
+        day_start = dt_util.start_of_local_day(dt_util.utc_from_timestamp(now)).timestamp()
+        updated = False
+        for key, counter in self.counters.items():
+            slot = self._slots[key]
+            # Neplatná hodnota (timeout, zakázaná entita) se nepočítá vůbec
+            if self._groups[key] not in groups or not store.valid[slot]:
+                continue
+            counter.update(float(store.values[slot]), now, day_start)
+            if counter.day_start != day_start:
+                counter.day_start, counter.day_sum = day_start, counter.sum
+            counter.bucket(hour)
+            updated = True
+        if not updated:
+            return
+        if hour != self._current_hour:
+            self._current_hour = hour
+            self._async_import_finished(hour)
+        self._store.async_delay_save(self._data_to_save, ENERGY_SAVE_DELAY)
+
+    @callback
+    def _async_import_finished(self, current_hour: int) -> None:
+        """Importuje dokončené hodiny všech čítačů (jedna dávka na čítač)."""
+        if "recorder" not in self._hass.config.components:
+            # Bez recorderu buckety čekají; nejstarší se zahodí
+            for counter in self.counters.values():
+                for hour in sorted(counter.hours)[:-ENERGY_MAX_PENDING_HOURS]:
+                    del counter.hours[hour]
+            return
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        for key, counter in self.counters.items():
+            finished = sorted(hour for hour in counter.hours if hour < current_hour)
+            if not finished:
+                continue
+            description = self._descriptions[key]
+            metadata = {
+                "has_mean": False,
+                "has_sum": True,
+                "name": f"Sunway {description.name}",
+                "source": DOMAIN,
+                "statistic_id": self.statistic_id(key),
+                "unit_of_measurement": description.native_unit_of_measurement,
+            }
+            statistics = [
+                {
+                    "start": datetime.fromtimestamp(hour, timezone.utc),
+                    "state": counter.hours[hour][0],
+                    "sum": counter.hours[hour][1],
+                }
+                for hour in finished
+            ]
+            async_add_external_statistics(self._hass, metadata, statistics)
+            for hour in finished:
+                del counter.hours[hour]
+        _LOGGER.debug(f"Importovány hodinové statistiky energie do {datetime.fromtimestamp(current_hour, timezone.utc)}")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Souhrn čítačů pro diagnostiku."""
+        return {
+            key: {
+                "statistic_id": self.statistic_id(key),
+                "sum": round(counter.sum, 6),
+                "today": round(counter.sum - counter.day_sum, 6),
+                "pending_hours": len(counter.hours),
+                "resets": counter.resets,
+                "glitches": counter.glitches,
+            }
+            for key, counter in self.counters.items()
+        }
@@ -0,0 +1,166 @@
+# custom_components/sunway_fve/metrics.py
+"""Metriky dotazovacích cyklů (latence, počty požadavků, přenesená data)."""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+# Horní meze košů histogramu latence (s)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Velikost PDU (bez hlavičky transportu) v bajtech
+PDU_READ_REQUEST = 5 # funkce + adresa + počet
+PDU_READ_RESPONSE = 2 # funkce + počet bajtů (+ 2 B na registr)
+PDU_ERROR_RESPONSE = 2 # funkce + kód výjimky
+PDU_WRITE_SINGLE = 5 # funkce + adresa + hodnota (požadavek i odpověď)
+PDU_WRITE_MULTIPLE_REQUEST = 6 # funkce + adresa + počet + počet bajtů (+ 2 B na registr)
+PDU_WRITE_MULTIPLE_RESPONSE = 5 # funkce + adresa + počet
+
+
+@dataclass
+class LatencyHistogram:
+    """Histogram latencí s pevnými koši."""
+
+    buckets: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Zaznamená jednu hodnotu."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float | None:
+        """Průměrná latence."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Odhad kvantilu - horní mez koše, do kterého kvantil padne."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Histogram pro diagnostiku."""
+        labels = [f"le_{bound:g}" for bound in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class PollMetrics:
+    """Kumulativní metriky coordinatora od startu integrace."""
+
+    cycles: int = 0
+    failed_cycles: int = 0
+    requests: int = 0
+    errors: int = 0 # chybové odpovědi zařízení (výjimky Modbus)
+    timeouts: int = 0
+    expired: int = 0 # požadavky zahozené ve frontě po uplynutí deadline
+    retries: int = 0 # opakovaná čtení bloků, které minule selhaly
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    lock_wait_total: float = 0.0
+    lock_wait_max: float = 0.0
+    decode_time_total: float = 0.0
+    last_cycle_duration: float | None = None
+    last_lock_wait: float | None = None
+    last_decode_time: float | None = None
+    last_cycle_blocks: int = 0
+    writes: int = 0
+    failed_writes: int = 0
+    last_write_latency: float | None = None
+    cycle_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    block_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    write_latency: LatencyHistogram = field(default_factory=LatencyHistogram) # od volání po potvrzení zápisu
+
+    def record_lock_wait(self, wait: float) -> None:
+        """Zaznamená čekání na zámek coordinatora."""
+        self.last_lock_wait = wait
+        self.lock_wait_total += wait
+        self.lock_wait_max = max(self.lock_wait_max, wait)
+
+    def record_request(self, latency: float | None, sent: int, received: int) -> None:
+        """Zaznamená jednu transakci (latence None = bez odpovědi)."""
+        self.requests += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+        if latency is not None:
+            self.block_latency.observe(latency)
+
+    def record_cycle(self, duration: float, decode_time: float, blocks: int) -> None:
+        """Zaznamená dokončený cyklus čtení."""
+        self.cycles += 1
+        self.last_cycle_duration = duration
+        self.last_decode_time = decode_time
+        self.last_cycle_blocks = blocks
+        self.decode_time_total += decode_time
+        self.cycle_latency.observe(duration)
+
+    def record_write(self, latency: float, success: bool) -> None:
+        """Zaznamená dávku zápisů (latence od požadavku po potvrzení zařízením)."""
+        self.writes += 1
+        if not success:
+            self.failed_writes += 1
+            return
+        self.last_write_latency = latency
+        self.write_latency.observe(latency)
+
+    @property
+    def bytes_total(self) -> int:
+        """Celkem přenesených bajtů (oběma směry)."""
+        return self.bytes_sent + self.bytes_received
+
+    @property
+    def cycle_p95(self) -> float | None:
+        """95. percentil doby cyklu."""
+        return self.cycle_latency.quantile(0.95)
+
+    @property
+    def block_latency_mean(self) -> float | None:
+        """Průměrná latence jednoho požadavku (včetně čekání ve frontě)."""
+        return self.block_latency.mean
+
+    def as_dict(self) -> dict[str, Any]:
+        """Všechny metriky pro diagnostiku."""
+        return {
+            "cycles": self.cycles,
+            "failed_cycles": self.failed_cycles,
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "expired": self.expired,
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "lock_wait_total": self.lock_wait_total,
+            "lock_wait_max": self.lock_wait_max,
+            "decode_time_total": self.decode_time_total,
+            "last_cycle_duration": self.last_cycle_duration,
+            "last_lock_wait": self.last_lock_wait,
+            "last_decode_time": self.last_decode_time,
+            "last_cycle_blocks": self.last_cycle_blocks,
+            "writes": self.writes,
+            "failed_writes": self.failed_writes,
+            "last_write_latency": self.last_write_latency,
+            "cycle_latency": self.cycle_latency.as_dict(),
+            "block_latency": self.block_latency.as_dict(),
+            "write_latency": self.write_latency.as_dict(),
+        }
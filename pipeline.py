@@ -0,0 +1,172 @@
+# custom_components/sunway_fve/pipeline.py
+"""Fronta Modbus požadavků s omezeným počtem souběžných transakcí."""
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Hashable, TypeVar
+
+from .const import DEFAULT_MAX_IN_FLIGHT, DEFAULT_REQUEST_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class RequestExpired(asyncio.TimeoutError):
+    """Požadavek nestihl opustit frontu do svého deadline a nebyl odeslán."""
+
+
+@dataclass
+class PipelineStats:
+    """Souhrnné metriky fronty požadavků."""
+
+    requests: int = 0
+    timeouts: int = 0
+    expired: int = 0 # požadavky zahozené ve frontě po uplynutí deadline
+    queue_wait: float = 0.0
+    bus_time: float = 0.0
+    max_queue_wait: float = 0.0
+
+    def reset(self) -> None:
+        """Vynuluje metriky."""
+        self.requests = self.timeouts = self.expired = 0
+        self.queue_wait = self.bus_time = self.max_queue_wait = 0.0
+
+
+class ModbusRequestPipeline:
+    """Omezuje počet rozpracovaných transakcí na jedno spojení.
+
+    Levné Wi-Fi dongly zvládají jen jednu až dvě transakce současně, ostatní
+    požadavky proto čekají ve frontě na uvolnění slotu. Fronta je rozdělena
+    do pruhů (lane, typicky slave ID) obsluhovaných střídavě (round-robin),
+    takže více střídačů za jednou bránou se na sběrnici pravidelně střídá.
+    V rámci jednoho pruhu platí FIFO. Prioritní požadavky (zápisy a jejich
+    ověřovací čtení) mají vlastní frontu, která se obslouží před všemi
+    pruhy - předběhnou čekající bloky cyklu hned po dokončení rozpracované
+    transakce.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        inter_frame_delay: float = 0.0,
+    ) -> None:
+        """Inicializace fronty.
+
+        inter_frame_delay je povinná pauza mezi rámci (RTU t3.5); v tom
+        případě je sběrnice sdílená a souběh je vždy 1.
+        """
+        self.max_in_flight = 1 if inter_frame_delay else max(1, max_in_flight)
+        self.request_timeout = request_timeout
+        self.inter_frame_delay = inter_frame_delay
+        self._bus_free_at = 0.0
+        self._stats: dict[Hashable, PipelineStats] = {}
+        self._in_flight = 0
+        self._waiters: dict[Hashable, deque[asyncio.Future]] = {}
+        self._lanes: deque[Hashable] = deque() # pořadí obsluhy pruhů s čekajícími
+        self._priority: deque[asyncio.Future] = deque() # prioritní požadavky (FIFO)
+
+    @property
+    def queued(self) -> int:
+        """Počet požadavků čekajících ve frontě (všechny pruhy i prioritní)."""
+        return sum(
+            1 for waiters in (self._priority, *self._waiters.values()) for waiter in waiters if not waiter.done()
+        )
+
+    def stats_for(self, lane: Hashable = None) -> PipelineStats:
+        """Metriky jednoho pruhu (slave ID)."""
+        if (stats := self._stats.get(lane)) is None:
+            stats = self._stats[lane] = PipelineStats()
+        return stats
+
+    async def submit(
+        self,
+        request: Callable[[], Awaitable[_T]],
+        deadline: float | None = None,
+        lane: Hashable = None,
+        priority: bool = False,
+    ) -> _T:
+        """Zařadí požadavek do pruhu lane a vrátí jeho výsledek.
+
+        deadline je absolutní čas smyčky, do kdy musí požadavek opustit
+        frontu; jinak se vůbec neodešle a vyvolá RequestExpired.
+        Samotná transakce na sběrnici je omezena request_timeout.
+        S priority=True požadavek předběhne všechny pruhy.
+        """
+        stats = self.stats_for(lane)
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+        try:
+            await self._acquire(deadline, lane, priority)
+        except asyncio.TimeoutError as err:
+            stats.expired += 1
+            raise RequestExpired from err
+        started = loop.time()
+        wait = started - queued_at
+        stats.queue_wait += wait
+        stats.max_queue_wait = max(stats.max_queue_wait, wait)
+        try:
+            if (silence := self._bus_free_at - loop.time()) > 0:
+                # RTU: dodržíme klidový interval mezi rámci, ale ne déle
+                await asyncio.sleep(silence)
+            return await asyncio.wait_for(request(), self.request_timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise
+        finally:
+            now = loop.time()
+            stats.requests += 1
+            stats.bus_time += now - started
+            self._bus_free_at = now + self.inter_frame_delay
+            self._release()
+
+    async def _acquire(self, deadline: float | None, lane: Hashable, priority: bool = False) -> None:
+        """Počká na volný slot."""
+        if self._in_flight < self.max_in_flight and not self.queued:
+            self._in_flight += 1
+            return
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        if priority:
+            self._priority.append(waiter)
+        else:
+            if lane not in self._waiters:
+                self._waiters[lane] = deque()
+                self._lanes.append(lane)
+            self._waiters[lane].append(waiter)
+        timeout = None if deadline is None else max(0.0, deadline - loop.time())
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if waiter.done() and not waiter.cancelled():
+                # Slot jsme dostali těsně před zrušením - vrátíme ho
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Předá slot prioritnímu požadavku, jinak prvnímu čekajícímu z dalšího pruhu, případně ho uvolní."""
+        while self._priority:
+            waiter = self._priority.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        while self._lanes:
+            lane = self._lanes.popleft()
+            waiters = self._waiters[lane]
+            while waiters and waiters[0].done():
+                waiters.popleft() # zrušené nebo expirované požadavky
+            if not waiters:
+                del self._waiters[lane]
+                continue
+            waiters.popleft().set_result(None)
+            # Pruh s dalšími požadavky se zařadí na konec - ostatní jdou dřív
+            if waiters:
+                self._lanes.append(lane)
+            else:
+                del self._waiters[lane]
+            return
+        self._in_flight -= 1
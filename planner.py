@@ -0,0 +1,245 @@
+# custom_components/sunway_fve/planner.py
+"""Plánovač blokového čtení Modbus registrů."""
+
+import logging
+import struct
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from .const import (
+    SENSOR_DESCRIPTIONS,
+    RW_REGISTER_MAP,
+    MODBUS_MAX_READ_REGISTERS,
+    DEFAULT_MAX_REGISTER_GAP,
+    SCAN_GROUP_REALTIME,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Formáty struct pro podporované datové typy (big endian, big word order)
+_STRUCT_FORMATS = {"U16": "H", "I16": "h", "U32": "I", "I32": "i"}
+
+# Způsob převodu surové hodnoty
+_CONVERT_RAW = 0 # bez škálování (int)
+_CONVERT_DIVIDE = 1 # raw / scale (scale > 1)
+_CONVERT_MULTIPLY = 2 # raw * scale (scale < 1)
+_CONVERT_STRING = 3 # řetězec ukončený nulami
+
+# Rozsah registrů: (typ registru, adresa, počet)
+RegisterRange = tuple[str, int, int]
+
+
+@dataclass(frozen=True)
+class RegisterSpec:
+    """Popis jedné čtené hodnoty (senzor nebo RW registr)."""
+
+    key: str
+    address: int
+    count: int
+    data_type: str
+    scale: float = 1.0
+    register_type: str = "holding"
+    scan_group: str = SCAN_GROUP_REALTIME
+    slot: int = -1 # pozice v RegisterIndex / ValueStore
+
+    @property
+    def end(self) -> int:
+        """První adresa za hodnotou."""
+        return self.address + self.count
+
+
+def _conversion(spec: RegisterSpec) -> tuple[int, float]:
+    """Určí způsob převodu surové hodnoty (stejná pravidla jako dříve u dekodéru)."""
+    if spec.data_type == "STR":
+        return _CONVERT_STRING, 1.0
+    if spec.scale == 1.0:
+        return _CONVERT_RAW, 1.0
+    if spec.scale > 1:
+        return _CONVERT_DIVIDE, spec.scale
+    if spec.scale != 0:
+        return _CONVERT_MULTIPLY, spec.scale
+    return _CONVERT_MULTIPLY, 1.0
+
+
+@dataclass
+class ReadBlock:
+    """Souvislý rozsah registrů čtený jedním Modbus požadavkem.
+
+    Po sestavení plánu se blok zkompiluje do jednoho struct formátu pro
+    celý buffer, takže dekódování všech hodnot je jediné unpack_from
+    a výsledky se zapisují rovnou do slotů ValueStore.
+    """
+
+    address: int
+    count: int
+    register_type: str = "holding" # "holding" (0x03) nebo "input" (0x04)
+    specs: list[RegisterSpec] = field(default_factory=list)
+    _registers_struct: struct.Struct | None = field(default=None, init=False, repr=False)
+    _layout: struct.Struct | None = field(default=None, init=False, repr=False)
+    _fields: list[tuple[int, int, float]] = field(default_factory=list, init=False, repr=False)
+    _overlapping: list[tuple[int, int, float, int, struct.Struct]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    @property
+    def end(self) -> int:
+        """První adresa za blokem."""
+        return self.address + self.count
+
+    @property
+    def register_range(self) -> RegisterRange:
+        """Rozsah registrů bloku (zároveň jeho identifikátor)."""
+        return (self.register_type, self.address, self.count)
+
+    def compile(self) -> None:
+        """Předpočítá struct formát a tabulku převodů pro celý blok."""
+        self._registers_struct = struct.Struct(f">{self.count}H")
+        layout = ">"
+        cursor = self.address
+        self._fields = []
+        self._overlapping = []
+        for spec in sorted(self.specs, key=lambda s: s.address):
+            if spec.data_type == "STR":
+                fmt = f"{spec.count * 2}s"
+            elif spec.data_type in _STRUCT_FORMATS:
+                fmt = _STRUCT_FORMATS[spec.data_type]
+            else:
+                _LOGGER.warning(f"Neznámý datový typ '{spec.data_type}' pro adresu {spec.address}")
+                continue
+            mode, scale = _conversion(spec)
+            if spec.address < cursor:
+                # Překrývající se hodnoty nejdou do společného formátu
+                offset = (spec.address - self.address) * 2
+                self._overlapping.append((spec.slot, mode, scale, offset, struct.Struct(">" + fmt)))
+                continue
+            if spec.address > cursor:
+                layout += f"{(spec.address - cursor) * 2}x"
+            layout += fmt
+            cursor = spec.end
+            self._fields.append((spec.slot, mode, scale))
+        self._layout = struct.Struct(layout)
+
+    def decode_into(self, registers: list[int], store, now: float) -> None:
+        """Dekóduje všechny hodnoty bloku a zapíše je do slotů store (ValueStore)."""
+        buffer = self._registers_struct.pack(*registers)
+        values, previous, valid, updated_at = store.values, store.previous, store.valid, store.updated_at
+        for (slot, mode, scale), raw in zip(self._fields, self._layout.unpack_from(buffer)):
+            value = _convert(raw, mode, scale)
+            old = values[slot] if valid[slot] else None
+            if old is None or old != value:
+                store.mark_changed(slot)
+            previous[slot] = old
+            values[slot] = value
+            valid[slot] = 1
+            updated_at[slot] = now
+        for slot, mode, scale, offset, value_struct in self._overlapping:
+            store.set(slot, _convert(value_struct.unpack_from(buffer, offset)[0], mode, scale), now)
+
+
+def _convert(raw, mode: int, scale: float):
+    """Převede surovou hodnotu podle předpočítaného způsobu."""
+    if mode == _CONVERT_DIVIDE:
+        return raw / scale
+    if mode == _CONVERT_MULTIPLY:
+        return raw * scale
+    if mode == _CONVERT_STRING:
+        return raw.rstrip(b"\x00").decode("utf-8", errors="ignore")
+    return raw
+
+
+def encode_value(data_type: str, scale: float, value: float) -> list[int]:
+    """Převede hodnotu na 16bitové registry pro zápis (opak dekódování včetně scale).
+
+    Vyvolá ValueError pro nepodporovaný typ nebo hodnotu mimo rozsah typu.
+    """
+    if scale > 1:
+        raw = round(value * scale)
+    elif scale < 1 and scale != 0:
+        raw = round(value / scale) # Dělení scale (např. value / 0.1)
+    else:
+        raw = round(value)
+    fmt = _STRUCT_FORMATS.get(data_type)
+    if fmt is None:
+        raise ValueError(f"Nepodporovaný datový typ {data_type} pro zápis")
+    try:
+        packed = struct.pack(">" + fmt, raw)
+    except struct.error as e:
+        raise ValueError(f"Hodnota {raw} je mimo rozsah typu {data_type}") from e
+    return list(struct.unpack(f">{len(packed) // 2}H", packed))
+
+
+def build_register_specs() -> list[RegisterSpec]:
+    """Sestaví seznam čtených hodnot ze SENSOR_DESCRIPTIONS a RW_REGISTER_MAP.
+
+    Slot hodnoty je její pozice v seznamu.
+    """
+    specs = [
+        RegisterSpec(
+            key=desc.key,
+            address=desc.register_address,
+            count=desc.register_count,
+            data_type=desc.data_type,
+            scale=desc.scale,
+            register_type=desc.register_type,
+            scan_group=desc.scan_group,
+            slot=slot,
+        )
+        for slot, desc in enumerate(SENSOR_DESCRIPTIONS)
+    ]
+    for key, params in RW_REGISTER_MAP.items():
+        specs.append(
+            RegisterSpec(
+                key=key,
+                address=params["address"],
+                count=params.get("count", 1),
+                data_type=params.get("data_type", "U16"),
+                scale=params.get("scale", 1.0),
+                register_type=params.get("register_type", "holding"),
+                scan_group=params.get("scan_group", SCAN_GROUP_REALTIME),
+                slot=len(specs),
+            )
+        )
+    return specs
+
+
+def _gap_avoided(avoid: Sequence[RegisterRange], register_type: str, start: int, end: int) -> bool:
+    """True, pokud mezera [start, end) zasahuje do některého rozsahu z avoid."""
+    return any(
+        avoid_type == register_type and address < end and start < address + count
+        for avoid_type, address, count in avoid
+    )
+
+
+def plan_read_blocks(
+    specs: list[RegisterSpec],
+    max_gap: int = DEFAULT_MAX_REGISTER_GAP,
+    max_count: int = MODBUS_MAX_READ_REGISTERS,
+    avoid: Sequence[RegisterRange] = (),
+) -> list[ReadBlock]:
+    """Seskupí hodnoty do souvislých bloků a zkompiluje jejich dekodéry.
+
+    Sousední hodnoty se slučují, pokud mají stejný typ registru (holding /
+    input se čtou jinou funkcí), mezera mezi nimi nepřesáhne max_gap
+    registrů, blok nepřekročí max_count registrů (limit PDU) a mezera
+    nezasahuje do žádného rozsahu z avoid (registry, které zařízení odmítá).
+    """
+    blocks: list[ReadBlock] = []
+    current: ReadBlock | None = None
+    for spec in sorted(specs, key=lambda s: (s.register_type, s.address, s.count)):
+        if current is not None and current.register_type == spec.register_type:
+            new_end = max(current.end, spec.end)
+            if (
+                spec.address - current.end <= max_gap
+                and new_end - current.address <= max_count
+                and not _gap_avoided(avoid, spec.register_type, current.end, spec.address)
+            ):
+                current.count = new_end - current.address
+                current.specs.append(spec)
+                continue
+        current = ReadBlock(
+            address=spec.address, count=spec.count, register_type=spec.register_type, specs=[spec]
+        )
+        blocks.append(current)
+    for block in blocks:
+        block.compile()
+    return blocks
@@ -0,0 +1,81 @@
+# custom_components/sunway_fve/profiles.py
+"""Cache profilů podporovaných registrů podle sériového čísla a firmwaru.
+
+Ne každý model Sunway implementuje všechny bloky mapy (elektroměr, baterie,
+EPS); nepodporovaný blok vrací výjimku v každém cyklu. Při prvním startu
+se každý blok otestuje jedním čtením a rozsahy, které zařízení odmítlo,
+se uloží do úložiště HA. Další starty je převezmou bez zkoušení.
+"""
+
+import asyncio
+import logging
+from time import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_PROFILES, DOMAIN, PROFILE_TTL
+from .planner import RegisterRange
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.register_profiles"
+
+
+def profile_key(serial_number: str, firmware_version: Any) -> str:
+    """Klíč profilu - nový firmware se otestuje znovu."""
+    return f"{serial_number}:{firmware_version}"
+
+
+class RegisterProfileCache:
+    """Profily uložené v .storage/sunway_fve.register_profiles (sdílené všemi záznamy).
+
+    Profil platí jen pro rozložení registrů (RegisterIndex.layout), pro které
+    byl zjištěn; po změně mapy v nové verzi integrace nebo po PROFILE_TTL se
+    zařízení otestuje znovu.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Vytvoří cache (data se načtou při prvním použití)."""
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._profiles: dict[str, dict[str, Any]] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def _async_profiles(self) -> dict[str, dict[str, Any]]:
+        """Načte profily z úložiště (jen jednou)."""
+        async with self._load_lock:
+            if self._profiles is None:
+                data = await self._store.async_load() or {}
+                self._profiles = data.get("profiles", {})
+        return self._profiles
+
+    async def async_get(self, key: str, layout: str) -> list[RegisterRange] | None:
+        """Vrátí nepodporované rozsahy profilu, nebo None, pokud profil chybí nebo vypršel."""
+        profile = (await self._async_profiles()).get(key)
+        if profile is None or profile.get("layout") != layout:
+            return None
+        if time() - profile.get("checked", 0) > PROFILE_TTL:
+            _LOGGER.debug(f"Profil registrů {key} vypršel, otestuje se znovu")
+            return None
+        return [tuple(entry) for entry in profile["unsupported"]]
+
+    async def async_save(self, key: str, layout: str, unsupported: list[RegisterRange]) -> None:
+        """Uloží profil zařízení."""
+        profiles = await self._async_profiles()
+        profiles[key] = {
+            "layout": layout,
+            "checked": time(),
+            "unsupported": [list(entry) for entry in unsupported],
+        }
+        await self._store.async_save({"profiles": profiles})
+
+
+@callback
+def async_get_profile_cache(hass: HomeAssistant) -> RegisterProfileCache:
+    """Vrátí sdílenou cache profilů, případně ji vytvoří."""
+    cache = hass.data.get(DATA_PROFILES)
+    if cache is None:
+        cache = hass.data[DATA_PROFILES] = RegisterProfileCache(hass)
+    return cache
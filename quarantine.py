@@ -0,0 +1,111 @@
+# custom_components/sunway_fve/quarantine.py
+"""Karanténa rozsahů registrů, které zařízení odmítá chybovou odpovědí.
+
+Firmware s dírami v mapě vrací Illegal Data Address pro celý blok, i když
+chybí jediný registr. Coordinator odmítnutý blok rozpůlí, vadný rozsah
+najde a zařadí sem; plán čtení ho pak vynechá a zdravé sousední hodnoty
+čte dál jedním požadavkem. Po uplynutí prodlevy se rozsah zkusí znovu,
+při dalším odmítnutí se prodleva zdvojnásobí. Karanténa se ukládá do
+úložiště HA, takže po restartu se vadné rozsahy nehledají znovu.
+"""
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, QUARANTINE_RETRY_MIN, QUARANTINE_RETRY_MAX, QUARANTINE_SAVE_DELAY
+from .planner import RegisterRange
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def storage_key(entry_id: str) -> str:
+    """Klíč úložiště karantény konfiguračního záznamu."""
+    return f"{DOMAIN}.quarantine.{entry_id}"
+
+
+class RegisterQuarantine:
+    """Rozsahy v karanténě s časem dalšího pokusu (time.time()) a prodlevou."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Vytvoří prázdnou karanténu (uložená data načte async_load)."""
+        self._store = Store(hass, STORAGE_VERSION, storage_key(entry_id))
+        self._entries: dict[RegisterRange, tuple[float, float]] = {} # rozsah -> (retry_at, backoff)
+        self._loaded = False
+
+    def __bool__(self) -> bool:
+        """True, pokud je v karanténě nějaký rozsah (i po uplynutí prodlevy)."""
+        return bool(self._entries)
+
+    async def async_load(self) -> None:
+        """Načte karanténu z úložiště (jen jednou)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load() or {}
+        for register_type, address, count, retry_at, backoff in data.get("ranges", []):
+            self._entries[(register_type, address, count)] = (retry_at, backoff)
+        if self._entries:
+            _LOGGER.debug(f"Načteno {len(self._entries)} rozsahů registrů v karanténě")
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Data pro úložiště."""
+        return {
+            "ranges": [
+                [register_type, address, count, retry_at, backoff]
+                for (register_type, address, count), (retry_at, backoff) in self._entries.items()
+            ]
+        }
+
+    @callback
+    def add(self, register_range: RegisterRange, now: float) -> float:
+        """Zařadí rozsah do karantény; opakované odmítnutí zdvojnásobí prodlevu. Vrátí prodlevu."""
+        previous = self._entries.get(register_range)
+        backoff = QUARANTINE_RETRY_MIN if previous is None else min(previous[1] * 2, QUARANTINE_RETRY_MAX)
+        self._entries[register_range] = (now + backoff, backoff)
+        self._store.async_delay_save(self._data_to_save, QUARANTINE_SAVE_DELAY)
+        return backoff
+
+    @callback
+    def release(self, register_type: str, address: int, end: int) -> None:
+        """Vyřadí z karantény rozsahy, které se podařilo přečíst v rámci [address, end)."""
+        released = [
+            register_range
+            for register_range in self._entries
+            if register_range[0] == register_type
+            and address <= register_range[1]
+            and register_range[1] + register_range[2] <= end
+        ]
+        for register_range in released:
+            del self._entries[register_range]
+            _LOGGER.info(f"Registry {register_range} se znovu daří číst, vyřazeny z karantény")
+        if released:
+            self._store.async_delay_save(self._data_to_save, QUARANTINE_SAVE_DELAY)
+
+    def active_ranges(self, now: float) -> list[RegisterRange]:
+        """Rozsahy, jejichž prodleva ještě neuplynula (plán čtení je vynechá)."""
+        return sorted(
+            register_range for register_range, (retry_at, _backoff) in self._entries.items() if retry_at > now
+        )
+
+    def as_dict(self, now: float) -> list[dict[str, Any]]:
+        """Karanténa pro diagnostiku."""
+        return [
+            {
+                "type": register_type,
+                "address": address,
+                "count": count,
+                "retry_in": max(0.0, retry_at - now),
+                "backoff": backoff,
+            }
+            for (register_type, address, count), (retry_at, backoff) in sorted(self._entries.items())
+        ]
+
+    async def async_remove(self) -> None:
+        """Smaže uloženou karanténu (při odebrání záznamu)."""
+        await self._store.async_remove()
@@ -0,0 +1,99 @@
+# custom_components/sunway_fve/register_index.py
+"""Zkompilovaný index registrů sestavený jednou při importu.
+
+Popisy senzorů (SENSOR_DESCRIPTIONS) a RW registrů (RW_REGISTER_MAP) se
+převedou do paralelních polí indexovaných slotem; slot je pozice hodnoty
+v indexu. Coordinator i entity pak pracují se sloty místo opakovaného
+procházení dataclass a slovníků s výchozími hodnotami.
+"""
+
+import zlib
+from array import array
+
+from .const import SENSOR_DESCRIPTIONS, RW_REGISTER_MAP
+from .planner import RegisterSpec, build_register_specs
+
+
+class RegisterIndex:
+    """Paralelní pole popisů hodnot a vyhledávací tabulky."""
+
+    __slots__ = (
+        "specs",
+        "keys",
+        "addresses",
+        "counts",
+        "data_types",
+        "scales",
+        "register_types",
+        "scan_groups",
+        "deadbands",
+        "writable",
+        "layout",
+        "slot_by_key",
+        "group_slots",
+        "write_maps",
+        "state_maps",
+        "_slots_by_address",
+    )
+
+    def __init__(self, specs: list[RegisterSpec], rw_map: dict[str, dict], deadbands: dict[str, float]) -> None:
+        """Sestaví index ze seznamu čtených hodnot."""
+        self.specs = tuple(specs)
+        self.keys = tuple(spec.key for spec in specs)
+        self.addresses = array("I", (spec.address for spec in specs))
+        self.counts = array("B", (spec.count for spec in specs))
+        self.data_types = tuple(spec.data_type for spec in specs)
+        self.scales = array("d", (spec.scale for spec in specs))
+        self.register_types = tuple(spec.register_type for spec in specs)
+        self.scan_groups = tuple(spec.scan_group for spec in specs)
+        self.deadbands = array("d", (deadbands.get(spec.key, 0.0) for spec in specs))
+        self.writable = array("b", (spec.key in rw_map for spec in specs))
+        # Otisk rozložení registrů - uložené profily zařízení platí jen pro stejnou mapu
+        self.layout = format(
+            zlib.crc32(repr([(spec.register_type, spec.address, spec.count) for spec in specs]).encode()), "08x"
+        )
+        self.slot_by_key = {key: slot for slot, key in enumerate(self.keys)}
+
+        group_slots: dict[str, list[int]] = {}
+        slots_by_address: dict[tuple[str, int], list[int]] = {}
+        for slot, spec in enumerate(specs):
+            group_slots.setdefault(spec.scan_group, []).append(slot)
+            # Reverzní index pokrývá všechny registry hodnoty (i druhé slovo U32)
+            for address in range(spec.address, spec.end):
+                slots_by_address.setdefault((spec.register_type, address), []).append(slot)
+        self.group_slots = {group: tuple(slots) for group, slots in group_slots.items()}
+        self._slots_by_address = {address: tuple(slots) for address, slots in slots_by_address.items()}
+
+        # Mapování stavů přepínačů oběma směry (True/False <-> hodnota registru)
+        self.write_maps: dict[int, dict[bool, int]] = {}
+        self.state_maps: dict[int, dict[int, bool]] = {}
+        for key, params in rw_map.items():
+            if "write_map" in params:
+                slot = self.slot_by_key[key]
+                self.write_maps[slot] = dict(params["write_map"])
+                self.state_maps[slot] = {raw: state for state, raw in params["write_map"].items()}
+
+    def __len__(self) -> int:
+        """Počet hodnot v indexu."""
+        return len(self.keys)
+
+    def slots_at(self, register_type: str, address: int) -> tuple[int, ...]:
+        """Sloty hodnot, které obsahují daný registr."""
+        return self._slots_by_address.get((register_type, address), ())
+
+    def slots_overlapping(self, register_type: str, address: int, end: int) -> list[int]:
+        """Sloty hodnot zasahujících do rozsahu registrů [address, end)."""
+        slots: list[int] = []
+        for register in range(address, end):
+            for slot in self.slots_at(register_type, register):
+                if slot not in slots:
+                    slots.append(slot)
+        return slots
+
+
+# Sdílený index pro všechny konfigurační záznamy
+REGISTER_INDEX = RegisterIndex(
+    build_register_specs(),
+    RW_REGISTER_MAP,
+    {desc.key: desc.deadband for desc in SENSOR_DESCRIPTIONS},
+)
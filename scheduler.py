@@ -0,0 +1,97 @@
+# custom_components/sunway_fve/scheduler.py
+"""Plánovač dotazování jednotlivých skenovacích skupin."""
+
+import math
+
+from .const import SCAN_GROUP_INFO
+
+# Skupina je považována za "na řadě", pokud zbývá méně než tato doba (s).
+# DataUpdateCoordinator plánuje další běh zaokrouhleně na celé sekundy.
+SCHEDULE_TOLERANCE = 1.0
+
+# Aktivita skupiny zjištěná po čtení
+ACTIVITY_BUSY = "busy" # hodnoty se rychle mění - čteme co nejčastěji (floor)
+ACTIVITY_NORMAL = "normal" # běžné změny - základní interval
+ACTIVITY_IDLE = "idle" # stabilní hodnoty nebo standby - exponenciální backoff až k ceiling
+
+
+class ScanGroupScheduler:
+    """Sleduje, kdy má být která skenovací skupina znovu přečtena.
+
+    Každá skupina má vlastní základní interval, který se podle aktivity
+    zkracuje až na floor nebo exponenciálně prodlužuje až na ceiling.
+    Statické skupiny (INFO) se přečtou při startu a dokud se čtení
+    nepovede, zkouší se v každém cyklu znovu. Přečtené statické údaje
+    platí až do obnovy spojení (rearm_static) nebo reloadu záznamu.
+    """
+
+    def __init__(
+        self,
+        intervals: dict[str, float],
+        static_groups: tuple[str, ...] = (SCAN_GROUP_INFO,),
+        floors: dict[str, float] | None = None,
+        ceilings: dict[str, float] | None = None,
+    ):
+        """Inicializace plánovače; všechny skupiny jsou na řadě hned."""
+        self.intervals = dict(intervals)
+        self._static_groups = static_groups
+        floors = floors or {}
+        ceilings = ceilings or {}
+        # floor <= základní interval <= ceiling
+        self.floors = {group: min(floors.get(group, base), base) for group, base in self.intervals.items()}
+        self.ceilings = {group: max(ceilings.get(group, base), base) for group, base in self.intervals.items()}
+        self.current = dict(self.intervals)
+        self.last_polled: dict[str, float] = {}
+        self._next_due: dict[str, float] = {group: 0.0 for group in self.intervals}
+        self._boost_until = 0.0
+
+    @property
+    def fastest_group(self) -> str:
+        """Skupina s nejkratším základním intervalem."""
+        return min(self.intervals, key=self.intervals.get)
+
+    def due_groups(self, now: float) -> list[str]:
+        """Vrátí skupiny, které mají být přečteny v tomto cyklu."""
+        return [group for group, due in self._next_due.items() if due - now <= SCHEDULE_TOLERANCE]
+
+    def mark_polled(self, group: str, now: float, success: bool, activity: str = ACTIVITY_NORMAL) -> None:
+        """Naplánuje další čtení skupiny podle její aktivity."""
+        self.last_polled[group] = now
+        if group in self._static_groups:
+            # Přečtené statické údaje se už nečtou; dokud je nemáme, zkusíme to v příštím cyklu
+            self._next_due[group] = math.inf if success else now
+            return
+        self.current[group] = self._adapt(group, now, activity if success else ACTIVITY_NORMAL)
+        self._next_due[group] = now + self.current[group]
+
+    def rearm_static(self) -> None:
+        """Naplánuje statické skupiny k novému přečtení (např. po obnově spojení)."""
+        for group in self._static_groups:
+            if group in self._next_due:
+                self._next_due[group] = 0.0
+
+    def boost(self, now: float, duration: float) -> None:
+        """Na dobu duration čte všechny nestatické skupiny s intervalem floor (např. po zápisu)."""
+        self._boost_until = now + duration
+        for group in self.intervals:
+            if group in self._static_groups:
+                continue
+            self.current[group] = self.floors[group]
+            self._next_due[group] = min(self._next_due[group], now + self.floors[group])
+
+    def seconds_until_next(self, now: float) -> float:
+        """Počet sekund do nejbližšího čtení některé skupiny."""
+        next_due = min(self._next_due.values(), default=now)
+        # Neúspěšné statické skupiny nesmí zahltit smyčku - čekáme aspoň nejkratší interval
+        if next_due <= now or math.isinf(next_due):
+            return self.current[self.fastest_group]
+        return next_due - now
+
+    def _adapt(self, group: str, now: float, activity: str) -> float:
+        """Vypočte nový interval skupiny."""
+        if activity == ACTIVITY_BUSY or now < self._boost_until:
+            return self.floors[group]
+        if activity == ACTIVITY_IDLE:
+            # Exponenciální backoff - z kratšího intervalu se vracíme přes základní
+            return min(max(self.current[group], self.intervals[group]) * 2, self.ceilings[group])
+        return self.intervals[group]
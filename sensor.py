@@ -1,9 +1,11 @@
 # custom_components/sunway_fve/sensor.py
 import logging
+from time import monotonic, time
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
-from .const import DOMAIN, SENSOR_DESCRIPTIONS # Import definic
+from .const import DOMAIN, SENSOR_DESCRIPTIONS, DERIVED_SENSOR_DESCRIPTIONS, DIAGNOSTIC_SENSOR_DESCRIPTIONS # Import definic
+from .register_index import REGISTER_INDEX
 from . import SunwayFveCoordinator # Import coordinatora
 
 _LOGGER = logging.getLogger(__name__)
@@ -17,19 +19,30 @@ async def async_setup_entry(hass, entry, async_add_entities):
         # Vytvoříme senzory pro všechny definované entity (RO i RW)
         entities.append(SunwayModbusSensor(coordinator, description))
         _LOGGER.debug(f"Setting up sensor: {description.name} ({description.key})")
+    # Odvozené hodnoty počítané coordinatorem z přečtených registrů
+    for description in DERIVED_SENSOR_DESCRIPTIONS:
+        entities.append(SunwayDerivedSensor(coordinator, description))
+    # Diagnostické senzory s metrikami dotazování
+    for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS:
+        entities.append(SunwayDiagnosticSensor(coordinator, description))
 
     async_add_entities(entities)
 
 class SunwayModbusSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Sunway FVE Modbus sensor."""
 
+    # Aggregates change with every state write - keep them out of the recorder
+    _unrecorded_attributes = frozenset({"min", "max", "mean", "samples"})
+
     def __init__(self, coordinator: SunwayFveCoordinator, description):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        self._slot = REGISTER_INDEX.slot_by_key[description.key] # Slot hodnoty v úložišti coordinatora
+        # Context = slot hodnoty; coordinator entitu probudí jen při změně slotu
+        super().__init__(coordinator, context=self._slot)
         self.entity_description = description # Použijeme dataclass jako entity_description
         self._attr_name = f"Sunway {description.name}" # Název v HA
-        # Unikátní ID = doména + identifikátor zařízení (např. host) + klíč senzoru
-        self._attr_unique_id = f"{DOMAIN}_{coordinator.host}_{description.key}"
+        # Unikátní ID = doména + identifikátor zařízení (host) + slave ID + klíč senzoru
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{description.key}"
         # Device Info - propojí všechny entity k jednomu zařízení
         # Můžete sem přidat Sériové číslo (SN) a Verzi firmwaru, pokud je čtete
         self._attr_device_info = {
@@ -41,29 +54,72 @@ class SunwayModbusSensor(CoordinatorEntity, SensorEntity):
             # "serial_number": coordinator.data.get("inverter_sn"), # Příklad
         }
         self._attr_native_value = self._get_coordinator_value() # Počáteční hodnota
+        # Realtime hodnoty s historií vzorků zapisují stav nejvýše jednou za state_interval
+        history = coordinator.history
+        self._history = history if history is not None and self._slot in history else None
+        # Poslední zapsaný stav - pro potlačení zápisů nezměněných hodnot
+        self._written_available = None
+        self._written_at = monotonic()
 
     def _get_coordinator_value(self):
         """Helper to get value from coordinator data."""
-        return self.coordinator.data.get(self.entity_description.key)
+        return self.coordinator.data.value(self._slot)
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        # Hodnota se bere přímo z coordinator.data
-        val = self._get_coordinator_value()
+        # Hodnota je poslední zapsaná hodnota z coordinator.data (viz _handle_coordinator_update)
+        val = self._attr_native_value
         # Zde můžete přidat specifické parsování, pokud je potřeba
         # Např. pro statusy, bitové masky atd.
         # if self.entity_description.key == "running_status":
         #     return self._map_status(val)
         return val
 
+    def _state_changed(self, value, now: float) -> bool:
+        """Return True if the new value should be written to HA."""
+        if self.available != self._written_available:
+            return True
+        max_state_age = self.entity_description.max_state_age
+        if self.coordinator.full_dispatch:
+            # Heartbeat coordinatora běží na vlastních hodinách: hodnota zapsaná těsně
+            # po něm by jinak přeskočila i další a zapsala se až po ~2x max_state_age
+            max_state_age -= self.coordinator.heartbeat
+        if now - self._written_at >= max_state_age:
+            return True # Heartbeat pro dlouho stabilní hodnoty
+        if self._history is not None and now - self._written_at < self.coordinator.state_interval:
+            return False # Rychlé vzorky zůstávají v historii, stav se zapíše v dalším intervalu
+        previous = self._attr_native_value
+        deadband = self.entity_description.deadband
+        if (
+            deadband
+            and isinstance(value, float)
+            and isinstance(previous, (int, float))
+        ):
+            return abs(value - previous) > deadband
+        # Enumy, řetězce a celá čísla - přesná shoda
+        return value != previous
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = self._get_coordinator_value()
+        value = self._get_coordinator_value()
+        now = monotonic()
+        if not self._state_changed(value, now):
+            return
+        self._attr_native_value = value
+        self._written_available = self.available
+        self._written_at = now
         self.async_write_ha_state()
         _LOGGER.debug(f"Updating sensor {self.name}: {self.native_value}")
 
+    @property
+    def extra_state_attributes(self):
+        """Min/max/mean of the buffered samples over the last state interval."""
+        if self._history is None:
+            return None
+        return self._history.aggregate(self._slot, time() - self.coordinator.state_interval)
+
     # --- Volitelné vlastnosti pro lepší integraci ---
     @property
     def native_unit_of_measurement(self):
@@ -80,4 +136,64 @@ class SunwayModbusSensor(CoordinatorEntity, SensorEntity):
     # Příklad funkce pro mapování statusu (pokud by byla potřeba)
     # def _map_status(self, value):
     #     status_map = {0: "Wait", 1: "Check", 2: "On Grid", 3: "Fault", 4: "Flash", 5: "Off Grid"}
-    #     return status_map.get(value, f"Unknown ({value})")
\ No newline at end of file
+    #     return status_map.get(value, f"Unknown ({value})")
+
+
+class SunwayDerivedSensor(CoordinatorEntity, SensorEntity):
+    """Sensor computed by the coordinator from already-read values."""
+
+    def __init__(self, coordinator: SunwayFveCoordinator, description):
+        """Initialize the derived sensor."""
+        # Context = klíč odvozené hodnoty; coordinator entitu probudí jen při změně výsledku
+        super().__init__(coordinator, context=description.key)
+        self.entity_description = description
+        self._attr_name = f"Sunway {description.name}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.host, coordinator.slave_id)},
+            "name": f"Sunway FVE ({coordinator.host})",
+            "manufacturer": "Sunway",
+        }
+        self._attr_native_value = coordinator.derived.value(description.key)
+        self._written_available = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the result or availability changed."""
+        value = self.coordinator.derived.value(self.entity_description.key)
+        previous = self._attr_native_value
+        deadband = self.entity_description.deadband
+        if self.available == self._written_available:
+            if value == previous:
+                return
+            if deadband and value is not None and previous is not None and abs(value - previous) <= deadband:
+                return
+        self._attr_native_value = value
+        self._written_available = self.available
+        self.async_write_ha_state()
+
+
+class SunwayDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor exposing a poll-cycle metric of the coordinator."""
+
+    def __init__(self, coordinator: SunwayFveCoordinator, description):
+        """Initialize the diagnostic sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = f"Sunway {description.name}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.host, coordinator.slave_id)},
+            "name": f"Sunway FVE ({coordinator.host})",
+            "manufacturer": "Sunway",
+        }
+
+    @property
+    def available(self) -> bool:
+        """Metrics stay available even when the last poll failed."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the current value of the metric."""
+        return getattr(self.coordinator.metrics, self.entity_description.metric)
@@ -3,6 +3,7 @@ import logging
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN, RW_REGISTER_MAP
+from .register_index import REGISTER_INDEX
 from . import SunwayFveCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,11 +25,17 @@ class SunwayModbusSwitch(CoordinatorEntity, SwitchEntity):
 
     def __init__(self, coordinator: SunwayFveCoordinator, key: str, params: dict):
         """Initialize the switch."""
-        super().__init__(coordinator)
+        # Context = slot hodnoty; coordinator entitu probudí jen při změně slotu
+        super().__init__(coordinator, context=REGISTER_INDEX.slot_by_key[key])
         self._key = key
         self._params = params
+        # Slot ve zkompilovaném indexu - adresa a mapování stavů bez hledání ve slovnících
+        self._slot = REGISTER_INDEX.slot_by_key[key]
+        self._address = REGISTER_INDEX.addresses[self._slot]
+        self._write_map = REGISTER_INDEX.write_maps.get(self._slot, {})
+        self._state_map = REGISTER_INDEX.state_maps.get(self._slot, {})
         self._attr_name = f"Sunway {key.replace('_', ' ').title()}" # Název
-        self._attr_unique_id = f"{DOMAIN}_{coordinator.host}_{key}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}{key}"
         # Propojení k zařízení
         self._attr_device_info = {
             "identifiers": {(DOMAIN, coordinator.host, coordinator.slave_id)},
@@ -39,32 +46,31 @@ class SunwayModbusSwitch(CoordinatorEntity, SwitchEntity):
     def is_on(self) -> bool | None:
         """Return true if switch is on."""
         # Hodnota se čte z coordinatora, mapovaná zpět na True/False
-        raw_value = self.coordinator.data.get(self._key)
+        raw_value = self.coordinator.data.value(self._slot)
         if raw_value is None:
             return None
-        # Najdeme klíč v write_map, jehož hodnota odpovídá přečtené hodnotě
-        for state, write_val in self._params.get("write_map", {}).items():
-            if write_val == raw_value:
-                return state # Vrací True nebo False
-        _LOGGER.warning(f"Unknown state {raw_value} for switch {self.name}")
-        return None # Neznámý stav
+        # Reverzní mapování write_map (hodnota registru -> True/False)
+        state = self._state_map.get(raw_value)
+        if state is None:
+            _LOGGER.warning(f"Unknown state {raw_value} for switch {self.name}")
+        return state
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the entity on."""
-        value_to_write = self._params.get("write_map", {}).get(True)
+        value_to_write = self._write_map.get(True)
         if value_to_write is not None:
-            address = self._params["address"]
+            address = self._address
             _LOGGER.debug(f"Turning ON switch {self.name} (Register: {address}, Value: {value_to_write})")
             success = await self.coordinator.async_write_register(address, value_to_write)
             if not success:
                  _LOGGER.error(f"Failed to turn ON switch {self.name}")
-            # Coordinator si po úspěšném zápisu sám vyžádá refresh
+            # Coordinator po úspěšném zápisu sám přečte zapsaný registr zpět
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the entity off."""
-        value_to_write = self._params.get("write_map", {}).get(False)
+        value_to_write = self._write_map.get(False)
         if value_to_write is not None:
-            address = self._params["address"]
+            address = self._address
             _LOGGER.debug(f"Turning OFF switch {self.name} (Register: {address}, Value: {value_to_write})")
             success = await self.coordinator.async_write_register(address, value_to_write)
             if not success:
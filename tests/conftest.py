@@ -0,0 +1,145 @@
+"""Testy integrace - komponenta se importuje jako balíček podle názvu adresáře."""
+
+import asyncio
+import importlib
+import inspect
+import sys
+from pathlib import Path
+
+import pytest
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+if str(INTEGRATION_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(INTEGRATION_DIR.parent))
+
+ENTRY_ID = "test_entry"
+SCAN_INTERVALS = {"realtime": 30, "daily": 120, "totals": 600, "info": 3600}
+
+
+def integration_module(name: str):
+    """Modul integrace podle názvu (např. "planner")."""
+    return importlib.import_module(f"{INTEGRATION_DIR.name}.{name}")
+
+
+class FakeModbusClient:
+    """Modbus klient bez sítě: registry v paměti, vybrané adresy odmítá (Illegal Data Address)."""
+
+    connected = True
+
+    def __init__(self) -> None:
+        self.registers: dict[tuple[str, int], int] = {} # (typ, adresa) -> hodnota, chybějící = 0
+        self.rejected: set[tuple[str, int]] = set()
+        self.requests: list[tuple[str, int, int]] = [] # (typ nebo "write", adresa, počet)
+
+    def _read(self, register_type: str, function_code: int, address: int, count: int):
+        from pymodbus.pdu import ExceptionResponse
+        from pymodbus.register_read_message import ReadHoldingRegistersResponse
+
+        self.requests.append((register_type, address, count))
+        if any((register_type, register) in self.rejected for register in range(address, address + count)):
+            return ExceptionResponse(function_code, 0x02)
+        return ReadHoldingRegistersResponse(
+            [self.registers.get((register_type, register), 0) for register in range(address, address + count)]
+        )
+
+    async def read_holding_registers(self, address: int, count: int, slave: int):
+        return self._read("holding", 0x03, address, count)
+
+    async def read_input_registers(self, address: int, count: int, slave: int):
+        return self._read("input", 0x04, address, count)
+
+    async def write_registers(self, address: int, values: list[int], slave: int):
+        from pymodbus.register_write_message import WriteMultipleRegistersResponse
+
+        self.requests.append(("write", address, len(values)))
+        for offset, value in enumerate(values):
+            self.registers[("holding", address + offset)] = value
+        return WriteMultipleRegistersResponse(address, len(values))
+
+    async def write_register(self, address: int, value: int, slave: int):
+        from pymodbus.register_write_message import WriteSingleRegisterResponse
+
+        self.requests.append(("write", address, 1))
+        self.registers[("holding", address)] = value
+        return WriteSingleRegisterResponse(address, value)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Async testy běží v event loopu fixture event_loop (nebo ve vlastním)."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    loop = pyfuncitem.funcargs.get("event_loop")
+    if loop is None:
+        asyncio.run(pyfuncitem.obj(**arguments))
+    else:
+        loop.run_until_complete(pyfuncitem.obj(**arguments))
+    return True
+
+
+@pytest.fixture
+def energy():
+    """Modul energy.py integrace."""
+    return integration_module("energy")
+
+
+@pytest.fixture
+def event_loop():
+    """Event loop testu (HA objekty se musí vytvořit uvnitř běžícího loopu)."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def hass(event_loop, tmp_path):
+    """Instance Home Assistant s načteným registrem entit a zařízení."""
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+    async def create():
+        hass = HomeAssistant(str(tmp_path))
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        return hass
+
+    hass = event_loop.run_until_complete(create())
+    yield hass
+    event_loop.run_until_complete(hass.async_stop(force=True))
+
+
+@pytest.fixture
+def config_entry():
+    """Konfigurační záznam coordinatoru (pro entity v registru)."""
+    from homeassistant.config_entries import ConfigEntry
+
+    return ConfigEntry(
+        version=1, minor_version=1, domain="sunway_fve", title="Sunway", data={}, source="user", entry_id=ENTRY_ID
+    )
+
+
+@pytest.fixture
+def coordinator(event_loop, hass):
+    """Coordinator bez spojení (Modbus klient se nepřipojuje)."""
+    integration = importlib.import_module(INTEGRATION_DIR.name)
+    transport = integration_module("transport").TransportConfig(host="127.0.0.1", port=5020)
+
+    async def create():
+        return integration.SunwayFveCoordinator(hass, transport, 1, dict(SCAN_INTERVALS), ENTRY_ID)
+
+    coordinator = event_loop.run_until_complete(create())
+    yield coordinator
+    event_loop.run_until_complete(coordinator.async_shutdown())
+
+
+@pytest.fixture
+def modbus(coordinator):
+    """Falešný Modbus klient podstrčený coordinatoru (profil zařízení se nenačítá)."""
+    client = FakeModbusClient()
+    coordinator._client = coordinator._connection._client = client
+    coordinator._profile_checked = True
+    return client
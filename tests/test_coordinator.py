@@ -0,0 +1,72 @@
+"""Coordinator - plán čtení podle registru entit a souběh cyklu se zápisy."""
+
+import asyncio
+
+from homeassistant.helpers import entity_registry as er
+
+DISABLED_KEY = "grid_line_ab_voltage" # realtime hodnota, na které nezávisí žádná odvozená
+
+
+def planned_slots(coordinator, group):
+    """Sloty hodnot, které plán čtení skupiny dekóduje."""
+    return {spec.slot for block in coordinator._read_plan_for([group]) for spec in block.specs}
+
+
+async def test_disabled_entity_dropped_from_read_plan(hass, coordinator, config_entry):
+    """Zakázání entity v registru (událost EVENT_ENTITY_REGISTRY_UPDATED) vyřadí její slot z plánu."""
+    registry = er.async_get(hass)
+    entity = registry.async_get_or_create(
+        "sensor", "sunway_fve", f"{coordinator.unique_id_prefix}{DISABLED_KEY}", config_entry=config_entry
+    )
+    await hass.async_block_till_done()
+    slot = coordinator._index.slot_by_key[DISABLED_KEY]
+    assert slot in planned_slots(coordinator, "realtime")
+
+    registry.async_update_entity(entity.entity_id, disabled_by=er.RegistryEntryDisabler.USER)
+    await hass.async_block_till_done()
+    assert slot not in planned_slots(coordinator, "realtime")
+
+    registry.async_update_entity(entity.entity_id, disabled_by=None)
+    await hass.async_block_till_done()
+    assert slot in planned_slots(coordinator, "realtime")
+
+
+async def test_block_overlapping_cycle_write_is_reread(coordinator, modbus):
+    """Blok přečtený před souběžným zápisem se po zápisu přečte znovu - i jeho ostatní hodnoty."""
+    store = await coordinator._async_update_data()
+    assert store.get("phase_b_power_setting") == 0
+    modbus.registers[("holding", 50205)] = 150 # změna mimo zapisovaný registr
+    read = modbus.read_holding_registers
+    write = None
+
+    async def read_then_write(address, count, slave):
+        nonlocal write
+        result = await read(address, count, slave)
+        if write is None and address <= 50204 < address + count:
+            # Zápis dorazí, zatímco je čtení bloku rozpracované
+            write = asyncio.ensure_future(coordinator.async_write_values({"phase_a_power_setting": 3.0}))
+            await asyncio.sleep(0)
+        return result
+
+    modbus.read_holding_registers = read_then_write
+    modbus.requests.clear()
+    await coordinator._async_update_data()
+    assert await write
+    assert store.get("phase_a_power_setting") == 3.0
+    assert store.get("phase_b_power_setting") == 1.5
+    block_reads = [
+        request for request in modbus.requests if request[0] == "holding" and request[1] <= 50205 < request[1] + request[2]
+    ]
+    assert len(block_reads) >= 2
+
+
+def test_history_skips_values_not_read_this_cycle(coordinator):
+    """Do vzorku historie jdou jen hodnoty přečtené od začátku cyklu, ostatní jako NaN."""
+    history = coordinator.history
+    store = coordinator._store
+    fresh, stale = history.slots[:2]
+    store.set(fresh, 1.0, 100.0)
+    store.set(stale, 2.0, 50.0)
+    history.record(1000.0, store, 100.0)
+    assert history.samples(fresh) == [(1000.0, 1.0)]
+    assert history.samples(stale) == []
@@ -0,0 +1,45 @@
+"""Akumulátor čítačů energie - nulování a chybná čtení."""
+
+DAY_START = 1_800_000_000.0 # místní půlnoc
+NOON = DAY_START + 12 * 3600
+
+
+def feed(counter, readings, start, step=60.0):
+    """Předá čítači hodnoty po step sekundách od start."""
+    for offset, value in enumerate(readings):
+        counter.update(value, start + offset * step, DAY_START)
+
+
+def test_double_zero_on_daily_counter_is_glitch(energy):
+    """Dvě nuly za sebou přes den (restart donglu) nejsou nulování denního čítače."""
+    counter = energy.EnergyCounter(daily=True)
+    feed(counter, [25.0, 25.4, 0.0, 0.0, 25.4, 25.5], NOON)
+    assert round(counter.sum, 3) == 0.5
+    assert counter.resets == 0
+    assert counter.glitches >= 2
+
+
+def test_zero_on_lifetime_counter_is_glitch(energy):
+    """Celkový čítač se nikdy nenuluje - ani opakovaná nula nepřidá jeho hodnotu do součtu."""
+    counter = energy.EnergyCounter()
+    feed(counter, [12345.0, 0.0, 0.0, 0.0, 12345.2], DAY_START + 60)
+    assert round(counter.sum, 3) == 0.2
+    assert counter.resets == 0
+    assert counter.last == 12345.2
+
+
+def test_daily_counter_resets_at_midnight(energy):
+    """Nulování denního čítače kolem půlnoci se přijme a součet pokračuje od nuly."""
+    counter = energy.EnergyCounter(daily=True)
+    feed(counter, [30.0, 30.1], DAY_START - 180)
+    feed(counter, [0.0, 0.0, 0.2], DAY_START + 60)
+    assert round(counter.sum, 3) == 0.3
+    assert counter.resets == 1
+
+
+def test_single_spike_is_dropped(energy):
+    """Nepotvrzený skok nahoru se zahodí."""
+    counter = energy.EnergyCounter()
+    feed(counter, [100.0, 5000.0, 100.1], NOON)
+    assert round(counter.sum, 3) == 0.1
+    assert counter.glitches == 1
@@ -0,0 +1,134 @@
+"""Fronta Modbus požadavků - limit souběhu, pruhy, priorita a deadline."""
+
+import asyncio
+
+import pytest
+
+from conftest import integration_module
+
+pipeline_module = integration_module("pipeline")
+
+
+class StubBus:
+    """Požadavky, které drží slot, dokud je test neuvolní."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.order: list[str] = []
+        self.gates: dict[str, asyncio.Event] = {}
+
+    def request(self, name: str, hold: bool = False):
+        """Vrátí továrnu požadavku name; s hold=True čeká na release(name)."""
+        gate = self.gates.setdefault(name, asyncio.Event())
+        if not hold:
+            gate.set()
+
+        async def run():
+            self.order.append(name)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await gate.wait()
+            finally:
+                self.in_flight -= 1
+            return name
+
+        return run
+
+    def release(self, name: str) -> None:
+        self.gates[name].set()
+
+
+async def settle() -> None:
+    """Nechá proběhnout naplánované úlohy."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_in_flight_limit_respected():
+    """Najednou běží nejvýše max_in_flight transakcí, ostatní čekají ve frontě."""
+    pipeline = pipeline_module.ModbusRequestPipeline(max_in_flight=2)
+    bus = StubBus()
+    tasks = [asyncio.ensure_future(pipeline.submit(bus.request(f"r{n}", hold=True))) for n in range(6)]
+    await settle()
+    assert bus.in_flight == 2
+    assert pipeline.queued == 4
+    for n in range(6):
+        bus.release(f"r{n}")
+        await settle()
+    assert await asyncio.gather(*tasks) == [f"r{n}" for n in range(6)]
+    assert bus.max_in_flight == 2
+    assert pipeline._in_flight == 0
+
+
+async def test_lanes_round_robin():
+    """Pruhy (slave ID) se střídají po jednom požadavku, v pruhu platí FIFO."""
+    pipeline = pipeline_module.ModbusRequestPipeline(max_in_flight=1)
+    bus = StubBus()
+    holder = asyncio.ensure_future(pipeline.submit(bus.request("hold", hold=True), lane=0))
+    await settle()
+    tasks = [
+        asyncio.ensure_future(pipeline.submit(bus.request(name), lane=lane))
+        for name, lane in (("a1", 1), ("a2", 1), ("a3", 1), ("b1", 2))
+    ]
+    await settle()
+    bus.release("hold")
+    await asyncio.gather(holder, *tasks)
+    assert bus.order == ["hold", "a1", "b1", "a2", "a3"]
+
+
+async def test_priority_goes_first():
+    """Prioritní požadavek předběhne všechny čekající pruhy."""
+    pipeline = pipeline_module.ModbusRequestPipeline(max_in_flight=1)
+    bus = StubBus()
+    holder = asyncio.ensure_future(pipeline.submit(bus.request("hold", hold=True), lane=1))
+    await settle()
+    cycle = [asyncio.ensure_future(pipeline.submit(bus.request(f"block{n}"), lane=1)) for n in range(3)]
+    await settle()
+    write = asyncio.ensure_future(pipeline.submit(bus.request("write"), lane=1, priority=True))
+    await settle()
+    bus.release("hold")
+    await asyncio.gather(holder, write, *cycle)
+    assert bus.order == ["hold", "write", "block0", "block1", "block2"]
+
+
+async def test_expired_request_frees_slot():
+    """Požadavek, který do deadline neopustí frontu, se neodešle a slot neblokuje."""
+    pipeline = pipeline_module.ModbusRequestPipeline(max_in_flight=1)
+    bus = StubBus()
+    holder = asyncio.ensure_future(pipeline.submit(bus.request("hold", hold=True)))
+    await settle()
+    loop = asyncio.get_running_loop()
+    with pytest.raises(pipeline_module.RequestExpired):
+        await pipeline.submit(bus.request("late"), deadline=loop.time() + 0.01)
+    assert "late" not in bus.order
+    assert pipeline.stats_for(None).expired == 1
+
+    bus.release("hold")
+    await holder
+    assert pipeline._in_flight == 0
+    assert await pipeline.submit(bus.request("next")) == "next"
+    assert pipeline._in_flight == 0
+    assert pipeline.queued == 0
+
+
+async def test_cancel_after_grant_returns_slot():
+    """Požadavek zrušený těsně po přidělení slotu ho vrátí (žádný únik ani dvojí uvolnění)."""
+    pipeline = pipeline_module.ModbusRequestPipeline(max_in_flight=1)
+    bus = StubBus()
+    holder = asyncio.ensure_future(pipeline.submit(bus.request("hold", hold=True)))
+    await settle()
+    waiting = asyncio.ensure_future(pipeline.submit(bus.request("cancelled")))
+    queued = asyncio.ensure_future(pipeline.submit(bus.request("after")))
+    await settle()
+
+    # Zrušení dorazí ve stejném průchodu smyčkou, ve kterém holder slot předal
+    holder.add_done_callback(lambda _task: waiting.cancel())
+    bus.release("hold")
+    await asyncio.gather(holder, waiting, return_exceptions=True)
+    assert await queued == "after"
+    assert pipeline._in_flight == 0
+    assert pipeline.queued == 0
+    assert await pipeline.submit(bus.request("next")) == "next"
+    assert pipeline._in_flight == 0
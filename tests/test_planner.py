@@ -0,0 +1,141 @@
+"""Plánovač blokového čtení - slučování mezer, limity bloku, dekódování a kódování."""
+
+import pytest
+
+from conftest import integration_module
+
+planner = integration_module("planner")
+RegisterSpec = planner.RegisterSpec
+
+
+class Store:
+    """Minimální úložiště hodnot se stejnými poli jako ValueStore."""
+
+    def __init__(self, size: int) -> None:
+        self.values = [None] * size
+        self.previous = [None] * size
+        self.valid = [0] * size
+        self.updated_at = [0.0] * size
+        self.changed = []
+
+    def mark_changed(self, slot: int) -> None:
+        self.changed.append(slot)
+
+    def set(self, slot: int, value, now: float) -> None:
+        self.mark_changed(slot)
+        self.values[slot], self.valid[slot], self.updated_at[slot] = value, 1, now
+
+
+def spec(slot, address, count=1, data_type="U16", scale=1.0, register_type="holding"):
+    """Popis hodnoty pro plánovač."""
+    return RegisterSpec(
+        key=f"value_{slot}", address=address, count=count, data_type=data_type,
+        scale=scale, register_type=register_type, slot=slot,
+    )
+
+
+def ranges(blocks):
+    """Rozsahy bloků plánu."""
+    return [block.register_range for block in blocks]
+
+
+def test_gap_within_max_gap_is_merged():
+    """Mezera do max_gap registrů se přečte v rámci bloku, větší blok rozdělí."""
+    specs = [spec(0, 100), spec(1, 105), spec(2, 115)]
+    assert ranges(planner.plan_read_blocks(specs, max_gap=4)) == [("holding", 100, 6), ("holding", 115, 1)]
+    assert ranges(planner.plan_read_blocks(specs, max_gap=9)) == [("holding", 100, 16)]
+
+
+def test_register_types_are_not_merged():
+    """Holding a input registry se čtou jinou funkcí - nikdy jeden blok."""
+    specs = [spec(0, 100), spec(1, 101, register_type="input")]
+    assert ranges(planner.plan_read_blocks(specs)) == [("holding", 100, 1), ("input", 101, 1)]
+
+
+def test_block_split_at_max_count():
+    """Blok nepřekročí max_count registrů (limit PDU)."""
+    specs = [spec(slot, 1000 + 2 * slot, count=2, data_type="U32") for slot in range(100)]
+    blocks = planner.plan_read_blocks(specs)
+    assert all(block.count <= planner.MODBUS_MAX_READ_REGISTERS for block in blocks)
+    assert ranges(blocks) == [("holding", 1000, 124), ("holding", 1124, 76)]
+    assert ranges(planner.plan_read_blocks(specs[:10], max_count=6)) == [
+        ("holding", 1000, 6), ("holding", 1006, 6), ("holding", 1012, 6), ("holding", 1018, 2)
+    ]
+
+
+def test_gap_over_avoided_range_is_split():
+    """Mezera zasahující do obcházeného rozsahu se nečte - blok se rozdělí."""
+    specs = [spec(0, 100), spec(1, 104)]
+    assert ranges(planner.plan_read_blocks(specs, avoid=[("holding", 102, 1)])) == [
+        ("holding", 100, 1), ("holding", 104, 1)
+    ]
+    # Rozsah jiného typu registrů slučování neovlivní
+    assert ranges(planner.plan_read_blocks(specs, avoid=[("input", 102, 1)])) == [("holding", 100, 5)]
+
+
+def test_decode_signed_u32_and_scale():
+    """Jedno unpack dekóduje znaménkové, 32bitové, škálované hodnoty i řetězce přes mezery."""
+    specs = [
+        spec(0, 10, data_type="I16", scale=10.0),
+        spec(1, 11, count=2, data_type="U32"),
+        spec(2, 14, count=2, data_type="I32", scale=1000.0),
+        spec(3, 16, data_type="U16", scale=0.1),
+        spec(4, 17, count=2, data_type="STR"),
+    ]
+    (block,) = planner.plan_read_blocks(specs)
+    registers = [0xFF38, 0x0001, 0x0002, 0xBEEF, 0xFFFF, 0xFC18, 123, 0x534E, 0x0000]
+    store = Store(5)
+    block.decode_into(registers, store, 5.0)
+    assert store.values == [-20.0, 0x00010002, -1.0, pytest.approx(12.3), "SN"]
+    assert store.valid == [1] * 5
+    assert sorted(store.changed) == [0, 1, 2, 3, 4]
+
+
+def test_decode_overlapping_values():
+    """Hodnoty sdílející registry (32bitová a její horní polovina) se dekódují obě."""
+    specs = [spec(0, 20, count=2, data_type="U32"), spec(1, 20)]
+    (block,) = planner.plan_read_blocks(specs)
+    store = Store(2)
+    block.decode_into([0x0001, 0x0000], store, 0.0)
+    assert store.values == [0x00010000, 1]
+
+
+def test_unchanged_value_not_marked():
+    """Nezměněná hodnota se znovu neoznačí jako změněná."""
+    (block,) = planner.plan_read_blocks([spec(0, 30)])
+    store = Store(1)
+    block.decode_into([7], store, 0.0)
+    block.decode_into([7], store, 1.0)
+    assert store.changed == [0]
+    assert store.previous == [7]
+
+
+@pytest.mark.parametrize(
+    ("data_type", "scale", "value"),
+    [
+        ("U16", 10.0, 230.5),
+        ("I16", 100.0, -12.34),
+        ("U32", 1.0, 70000),
+        ("I32", 1000.0, -1.5),
+        ("U16", 0.1, 55.0),
+    ],
+)
+def test_encode_decode_round_trip(data_type, scale, value):
+    """encode_value je inverzí dekódování včetně scale."""
+    registers = planner.encode_value(data_type, scale, value)
+    count = 2 if data_type in ("U32", "I32") else 1
+    assert len(registers) == count
+    (block,) = planner.plan_read_blocks([spec(0, 40, count=count, data_type=data_type, scale=scale)])
+    store = Store(1)
+    block.decode_into(registers, store, 0.0)
+    assert store.values[0] == pytest.approx(value)
+
+
+def test_encode_out_of_range():
+    """Hodnota mimo rozsah typu nebo nepodporovaný typ vyvolá ValueError."""
+    with pytest.raises(ValueError):
+        planner.encode_value("U16", 1.0, 70000)
+    with pytest.raises(ValueError):
+        planner.encode_value("U16", 10.0, -1.0)
+    with pytest.raises(ValueError):
+        planner.encode_value("STR", 1.0, 1)
@@ -0,0 +1,80 @@
+"""Půlení odmítnutých bloků a karanténa registrů."""
+
+import importlib
+
+import pytest
+
+from conftest import INTEGRATION_DIR, integration_module
+
+const = integration_module("const")
+BAD_KEY = "grid_phase_b_voltage" # holding 11003 uprostřed realtime bloku 11001-11006
+BAD_RANGE = ("holding", 11003, 1)
+
+
+def covers(request, register_range):
+    """True, pokud čtení request zasahuje do rozsahu register_range."""
+    register_type, address, count = register_range
+    return request[0] == register_type and request[1] < address + count and address < request[1] + request[2]
+
+
+@pytest.fixture
+def wall_clock(monkeypatch):
+    """Řízený čas karantény (time.time() v coordinatoru)."""
+    clock = {"now": 1_800_000_000.0}
+    monkeypatch.setattr(importlib.import_module(INTEGRATION_DIR.name), "time", lambda: clock["now"])
+    return clock
+
+
+async def test_rejected_register_quarantined_and_retried(coordinator, modbus, wall_clock):
+    """Jen odmítnutý registr jde do karantény; po prodlevě se zkusí znovu a pak se uvolní."""
+    modbus.rejected.add(BAD_RANGE[:2])
+    for register in range(11001, 11007):
+        modbus.registers[("holding", register)] = 2300 + register - 11001
+    store = await coordinator._async_update_data()
+
+    assert coordinator._quarantine.active_ranges(wall_clock["now"]) == [BAD_RANGE]
+    # Sousední hodnoty odmítnutého bloku se přečetly půlením
+    assert store.get("grid_phase_a_voltage") == 230.0
+    assert store.get("grid_phase_b_current") == 230.3
+    assert store.get(BAD_KEY) is None
+
+    # Další cyklus karanténní registr obejde, sousedy čte dál
+    modbus.requests.clear()
+    await coordinator._async_update_data()
+    assert modbus.requests
+    assert not any(covers(request, BAD_RANGE) for request in modbus.requests)
+    assert store.get("grid_phase_a_voltage") == 230.0
+
+    # Po prodlevě se rozsah zkusí znovu; další odmítnutí prodlevu zdvojnásobí
+    wall_clock["now"] += const.QUARANTINE_RETRY_MIN + 1
+    modbus.requests.clear()
+    await coordinator._async_update_data()
+    assert any(covers(request, BAD_RANGE) for request in modbus.requests)
+    (entry,) = coordinator._quarantine.as_dict(wall_clock["now"])
+    assert entry["backoff"] == 2 * const.QUARANTINE_RETRY_MIN
+
+    # Registr opravený firmwarem se po další prodlevě přečte a z karantény vyřadí
+    modbus.rejected.clear()
+    wall_clock["now"] += 2 * const.QUARANTINE_RETRY_MIN + 1
+    await coordinator._async_update_data()
+    assert not coordinator._quarantine
+    assert store.get(BAD_KEY) == 230.2
+
+
+async def test_busy_response_not_quarantined(coordinator, modbus, wall_clock):
+    """Slave Device Busy (0x06) blok nepůlí ani neposílá do karantény."""
+    from pymodbus.pdu import ExceptionResponse
+
+    async def busy(address, count, slave):
+        modbus.requests.append(("holding", address, count))
+        return ExceptionResponse(0x03, 0x06)
+
+    modbus.read_holding_registers = busy
+    await coordinator._async_update_data()
+    assert not coordinator._quarantine
+    # Každý holding blok plánu se zkusil jen jednou (bez půlení)
+    holding_blocks = [
+        block.register_range for block in coordinator._read_plan_for(list(const.DEFAULT_SCAN_INTERVALS))
+        if block.register_type == "holding"
+    ]
+    assert sorted(request for request in modbus.requests if request[0] == "holding") == sorted(holding_blocks)
@@ -0,0 +1,42 @@
+"""Plánovač skenovacích skupin - statické skupiny a adaptivní intervaly."""
+
+from conftest import integration_module
+
+scheduler_module = integration_module("scheduler")
+INTERVALS = {"realtime": 30, "daily": 120, "info": 3600}
+
+
+def test_static_group_read_once_and_rearmed():
+    """INFO se po úspěšném čtení už nečte; znovu až po rearm_static (obnova spojení)."""
+    scheduler = scheduler_module.ScanGroupScheduler(INTERVALS)
+    assert set(scheduler.due_groups(0.0)) == set(INTERVALS)
+    for group in INTERVALS:
+        scheduler.mark_polled(group, 0.0, True)
+    for now in (30.0, 3600.0, 86400.0 * 30):
+        assert "info" not in scheduler.due_groups(now)
+    assert scheduler.seconds_until_next(0.0) == 30
+
+    scheduler.rearm_static()
+    assert "info" in scheduler.due_groups(100.0)
+
+
+def test_failed_static_group_retried_next_cycle():
+    """Nepřečtená statická skupina se zkusí v dalším cyklu, smyčku ale nezahltí."""
+    scheduler = scheduler_module.ScanGroupScheduler(INTERVALS)
+    scheduler.mark_polled("realtime", 0.0, True)
+    scheduler.mark_polled("daily", 0.0, True)
+    scheduler.mark_polled("info", 0.0, False)
+    assert scheduler.due_groups(1.0) == ["info"]
+    assert scheduler.seconds_until_next(1.0) == 30
+
+
+def test_idle_backoff_and_busy_floor():
+    """Stabilní skupina zpomaluje až k ceiling, rychlá změna skočí na floor."""
+    scheduler = scheduler_module.ScanGroupScheduler(INTERVALS, floors={"realtime": 10}, ceilings={"realtime": 100})
+    now = 0.0
+    for expected in (60, 100, 100):
+        scheduler.mark_polled("realtime", now, True, scheduler_module.ACTIVITY_IDLE)
+        assert scheduler.current["realtime"] == expected
+        now += expected
+    scheduler.mark_polled("realtime", now, True, scheduler_module.ACTIVITY_BUSY)
+    assert scheduler.current["realtime"] == 10
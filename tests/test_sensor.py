@@ -0,0 +1,83 @@
+"""Senzory - zápis stavu při změně a heartbeat nezměněných hodnot."""
+
+import importlib
+
+import pytest
+from homeassistant.helpers.entity import Entity
+
+from conftest import INTEGRATION_DIR, integration_module
+
+KEY = "pv_gen_today"
+CYCLE = 30.0
+
+
+class Clock:
+    """Ručně posouvaný čas místo monotonic()."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(coordinator, monkeypatch):
+    """Společný řízený čas senzorů i coordinatoru."""
+    clock = Clock()
+    monkeypatch.setattr(integration_module("sensor"), "monotonic", clock)
+    monkeypatch.setattr(importlib.import_module(INTEGRATION_DIR.name), "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def writes(clock, monkeypatch):
+    """Časy zápisů stavu (async_write_ha_state se jen zaznamená)."""
+    writes = []
+    monkeypatch.setattr(Entity, "async_write_ha_state", lambda entity: writes.append(clock.now))
+    return writes
+
+
+def add_sensor(coordinator, key, value, now):
+    """Senzor hodnoty key s počáteční hodnotou, přihlášený ke svému slotu."""
+    sensor_module = integration_module("sensor")
+    coordinator._store.set(coordinator._index.slot_by_key[key], value, now)
+    coordinator.data = coordinator._store
+    description = next(desc for desc in sensor_module.SENSOR_DESCRIPTIONS if desc.key == key)
+    sensor = sensor_module.SunwayModbusSensor(coordinator, description)
+    coordinator.async_add_listener(sensor._handle_coordinator_update, sensor._slot)
+    return sensor
+
+
+def test_heartbeat_writes_within_max_state_age(coordinator, clock, writes):
+    """Stabilní hodnota zapsaná těsně po heartbeatu se zapíše znovu nejpozději po max_state_age."""
+    sensor = add_sensor(coordinator, KEY, 10.0, clock.now)
+    coordinator.async_update_listeners() # první (úplné) upozornění
+    clock.now += CYCLE
+    coordinator._store.set(sensor._slot, 10.5, clock.now) # změna těsně po heartbeatu
+    coordinator.async_update_listeners()
+    assert writes == [1000.0, 1000.0 + CYCLE]
+
+    max_state_age = sensor.entity_description.max_state_age
+    end = clock.now + 4 * max_state_age
+    while clock.now < end:
+        clock.now += CYCLE
+        coordinator.async_update_listeners() # hodnota se už nemění
+    gaps = [later - earlier for earlier, later in zip(writes, writes[1:])]
+    assert len(writes) >= 5
+    assert max(gaps) <= max_state_age
+
+
+def test_deadband_suppresses_lsb_noise(coordinator, clock, writes):
+    """Šum v posledním bitu realtime napětí se nezapisuje, větší změna ano."""
+    sensor = add_sensor(coordinator, "grid_phase_a_voltage", 230.0, clock.now)
+    coordinator.async_update_listeners()
+    for value in (230.1, 230.0, 229.9, 230.1):
+        clock.now += CYCLE
+        coordinator._store.set(sensor._slot, value, clock.now)
+        coordinator.async_update_listeners()
+    assert writes == [1000.0]
+    clock.now += CYCLE
+    coordinator._store.set(sensor._slot, 231.2, clock.now)
+    coordinator.async_update_listeners()
+    assert len(writes) == 2
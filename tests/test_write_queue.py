@@ -0,0 +1,63 @@
+"""Dávkové zápisy RW hodnot - sloučení sousedních registrů a vynechání shodných hodnot."""
+
+import asyncio
+import importlib
+
+from conftest import INTEGRATION_DIR
+
+PHASE_KEYS = (
+    "inverter_ac_power_setting_mode", # 50202
+    "total_ac_power_setting", # 50203
+    "phase_a_power_setting", # 50204
+    "phase_b_power_setting", # 50205
+    "phase_c_power_setting", # 50206
+)
+
+
+def writes(modbus):
+    """Zápisové požadavky falešného klienta (adresa, počet registrů)."""
+    return [(address, count) for kind, address, count in modbus.requests if kind == "write"]
+
+
+async def test_adjacent_registers_written_as_one_run(coordinator, modbus):
+    """Sousední registry jdou jedním požadavkem 0x10, mezera dávku rozdělí."""
+    values = {"inverter_ac_power_setting_mode": 1, "total_ac_power_setting": 5.0, "phase_a_power_setting": 1.5,
+              "phase_c_power_setting": -2.0}
+    assert await coordinator.async_write_values(values)
+    assert writes(modbus) == [(50202, 3), (50206, 1)]
+    assert modbus.registers[("holding", 50203)] == 500
+    assert modbus.registers[("holding", 50206)] == 0x10000 - 200
+
+
+async def test_run_split_at_write_limit(coordinator, modbus, monkeypatch):
+    """Souvislý rozsah delší než limit PDU se rozdělí na více požadavků."""
+    monkeypatch.setattr(importlib.import_module(INTEGRATION_DIR.name), "MODBUS_MAX_WRITE_REGISTERS", 2)
+    assert await coordinator.async_write_values({key: 1 for key in PHASE_KEYS})
+    assert writes(modbus) == [(50202, 2), (50204, 2), (50206, 1)]
+
+
+async def test_queue_skips_confirmed_and_coalesces(coordinator, modbus):
+    """Hodnota shodná s potvrzeným stavem se nezapíše; v okně vyhrává poslední hodnota."""
+    store = coordinator._store
+    store.set(coordinator._index.slot_by_key["phase_a_power_setting"], 1.5, 0.0)
+    queue = coordinator._write_queue
+    pending = [
+        asyncio.ensure_future(coordinator.async_queue_write("phase_a_power_setting", 1.5)),
+        asyncio.ensure_future(coordinator.async_queue_write("phase_b_power_setting", 1.0)),
+        asyncio.ensure_future(coordinator.async_queue_write("phase_b_power_setting", 2.5)),
+    ]
+    await asyncio.sleep(0)
+    assert queue.pending == {"phase_a_power_setting": 1.5, "phase_b_power_setting": 2.5}
+    await queue.async_flush()
+    assert await asyncio.gather(*pending) == [True, True, True]
+    assert writes(modbus) == [(50205, 1)]
+    assert modbus.registers[("holding", 50205)] == 250
+    assert (queue.coalesced, queue.skipped) == (1, 1)
+
+    # Celá dávka shodná s potvrzeným (ověřeným zpětným čtením) stavem se nezapíše vůbec
+    modbus.requests.clear()
+    again = asyncio.ensure_future(coordinator.async_queue_write("phase_b_power_setting", 2.5))
+    await asyncio.sleep(0)
+    await queue.async_flush()
+    assert await again
+    assert modbus.requests == []
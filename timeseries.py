@@ -0,0 +1,87 @@
+# custom_components/sunway_fve/timeseries.py
+"""Lokální kruhový buffer vzorků realtime hodnot.
+
+Při rychlém čtení realtime skupiny (jednotky sekund) by každý vzorek
+skončil v recorderu HA. Vzorky se proto drží jen v paměti: jedno pole
+časových značek sdílené celou skupinou a jedno pole double na hodnotu.
+Entity zapisují stav v normálním intervalu s agregáty (min/max/průměr)
+za interval a surová data vrací služba get_samples.
+"""
+
+import math
+from array import array
+from typing import Any
+
+from .value_store import ValueStore
+
+_NAN = float("nan")
+
+
+class SampleHistory:
+    """Kruhový buffer vzorků pro pevnou sadu slotů (sdílené časové značky)."""
+
+    __slots__ = ("slots", "capacity", "timestamps", "_columns", "_column_by_slot", "_head", "count")
+
+    def __init__(self, slots: list[int], capacity: int) -> None:
+        """Alokuje buffer pro capacity vzorků každého slotu."""
+        self.slots = tuple(slots)
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity)) # time() vzorku
+        self._columns = [array("d", bytes(8 * capacity)) for _ in self.slots]
+        self._column_by_slot = {slot: column for slot, column in zip(self.slots, self._columns)}
+        self._head = 0 # pozice dalšího zápisu
+        self.count = 0
+
+    def __contains__(self, slot: int) -> bool:
+        """True, pokud se pro slot ukládají vzorky."""
+        return slot in self._column_by_slot
+
+    def record(self, timestamp: float, store: ValueStore, since: float = 0.0) -> None:
+        """Uloží aktuální hodnoty všech slotů jako jeden vzorek.
+
+        Neplatné hodnoty a hodnoty aktualizované před since (čas smyčky
+        začátku cyklu - v cyklu se nepřečetly) se uloží jako NaN.
+        """
+        position = self._head
+        self.timestamps[position] = timestamp
+        valid = store.valid
+        values = store.values
+        updated_at = store.updated_at
+        for slot, column in zip(self.slots, self._columns):
+            column[position] = values[slot] if valid[slot] and updated_at[slot] >= since else _NAN
+        self._head = (position + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _positions(self, since: float) -> list[int]:
+        """Pozice vzorků od nejstaršího po nejnovější s časem >= since."""
+        start = (self._head - self.count) % self.capacity
+        positions = [(start + offset) % self.capacity for offset in range(self.count)]
+        timestamps = self.timestamps
+        for index, position in enumerate(positions):
+            if timestamps[position] >= since:
+                return positions[index:]
+        return []
+
+    def samples(self, slot: int, since: float = 0.0) -> list[tuple[float, float]]:
+        """Platné vzorky slotu (čas, hodnota) od since."""
+        column = self._column_by_slot[slot]
+        timestamps = self.timestamps
+        return [
+            (timestamps[position], column[position])
+            for position in self._positions(since)
+            if not math.isnan(column[position])
+        ]
+
+    def aggregate(self, slot: int, since: float) -> dict[str, Any] | None:
+        """Minimum, maximum a průměr platných vzorků slotu od since."""
+        column = self._column_by_slot[slot]
+        values = [column[position] for position in self._positions(since) if not math.isnan(column[position])]
+        if not values:
+            return None
+        return {
+            "min": min(values),
+            "max": max(values),
+            "mean": round(sum(values) / len(values), 6),
+            "samples": len(values),
+        }
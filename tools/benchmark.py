@@ -0,0 +1,210 @@
+# custom_components/sunway_fve/tools/benchmark.py
+"""Benchmark dotazovací cesty SunwayFveCoordinator proti offline simulátoru.
+
+Pro každý počet střídačů (výchozí 1, 5 a 20) spustí simulátor v samostatném
+procesu, vytvoří coordinatory a změří dobu cyklu, počet požadavků na cyklus,
+CPU čas na cyklus a paměť. První (studený) cyklus čte všechny skupiny,
+ustálené cykly jen nejrychlejší skupinu (realtime).
+
+    python tools/benchmark.py --inverters 1 5 20 --cycles 20 --latency 0.02
+    python tools/benchmark.py --json results.json
+    python tools/benchmark.py --compare results.json --tolerance 0.2
+
+S --compare skončí s kódem 1, pokud se doba cyklu nebo CPU na cyklus
+zhorší o víc než tolerance, nebo vzroste počet požadavků.
+"""
+
+import argparse
+import asyncio
+import gc
+import importlib
+import json
+import logging
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from simulator import (
+    INTEGRATION_DIR,
+    DeviceProfile,
+    add_profile_arguments,
+    async_start_simulator,
+    profile_from_args,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+integration = importlib.import_module(INTEGRATION_DIR.name)
+transport_module = importlib.import_module(f"{INTEGRATION_DIR.name}.transport")
+const = importlib.import_module(f"{INTEGRATION_DIR.name}.const")
+
+_LOGGER = logging.getLogger(__name__)
+
+BENCHMARK_PORT = 5520
+
+
+def _run_simulator(port: int, inverters: int, gateway: bool, profile: DeviceProfile, ready) -> None:
+    """Proces simulátoru (server neovlivňuje měřený CPU čas coordinatorů)."""
+
+    async def serve() -> None:
+        await async_start_simulator("127.0.0.1", port, inverters, gateway, profile)
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def _coordinator_args(index: int, port: int, gateway: bool):
+    """Transport a slave ID pro index střídače."""
+    if gateway:
+        return transport_module.TransportConfig(host="127.0.0.1", port=port), index + 1
+    return transport_module.TransportConfig(host="127.0.0.1", port=port + index), 1
+
+
+async def _async_measure(inverters: int, cycles: int, port: int, gateway: bool, request_timeout: int) -> dict:
+    """Změří cykly všech coordinatorů (souběžně, jako v HA)."""
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="sunway_bench_"))
+    # Coordinator se při plánování čtení ptá registru entit (prázdný = vše povolené)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    tracemalloc.start()
+    baseline_memory = tracemalloc.get_traced_memory()[0]
+    coordinators = []
+    for index in range(inverters):
+        transport, slave_id = _coordinator_args(index, port, gateway)
+        coordinators.append(
+            integration.SunwayFveCoordinator(
+                hass, transport, slave_id, const.DEFAULT_SCAN_INTERVALS, f"bench_{index}",
+                request_timeout=request_timeout,
+            )
+        )
+
+    async def refresh_all() -> tuple[float, float, int]:
+        requests_before = sum(c.metrics.requests for c in coordinators)
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        await asyncio.gather(*(c.async_refresh() for c in coordinators))
+        return (
+            time.perf_counter() - started,
+            time.process_time() - cpu_started,
+            sum(c.metrics.requests for c in coordinators) - requests_before,
+        )
+
+    cold_time, cold_cpu, cold_requests = await refresh_all()
+    gc.collect()
+    # Paměť držená coordinatory po studeném cyklu (plány, data, metriky)
+    retained_memory = tracemalloc.get_traced_memory()[0] - baseline_memory
+    tracemalloc.stop()
+
+    durations, cpu_times, requests = [], [], []
+    for _ in range(cycles):
+        duration, cpu, count = await refresh_all()
+        durations.append(duration)
+        cpu_times.append(cpu)
+        requests.append(count)
+
+    failed = sum(c.metrics.failed_cycles for c in coordinators)
+    timeouts = sum(c.metrics.timeouts for c in coordinators)
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+    durations.sort()
+    return {
+        "inverters": inverters,
+        "cold_cycle_ms": cold_time * 1000,
+        "cold_cpu_ms": cold_cpu * 1000,
+        "cold_requests": cold_requests,
+        "cycle_ms_mean": statistics.mean(durations) * 1000,
+        "cycle_ms_p95": durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000,
+        "cpu_ms_per_cycle": statistics.mean(cpu_times) * 1000,
+        "requests_per_cycle": statistics.mean(requests),
+        "memory_kib_per_inverter": retained_memory / 1024 / inverters,
+        "failed_cycles": failed,
+        "timeouts": timeouts,
+    }
+
+
+def run_benchmark(args: argparse.Namespace, inverters: int) -> dict:
+    """Spustí simulátor pro daný počet střídačů a změří coordinatory."""
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    process = context.Process(
+        target=_run_simulator,
+        args=(BENCHMARK_PORT, inverters, args.gateway, profile_from_args(args), ready),
+        daemon=True,
+    )
+    process.start()
+    try:
+        if not ready.wait(30):
+            raise RuntimeError("Simulátor se nespustil")
+        return asyncio.run(
+            _async_measure(inverters, args.cycles, BENCHMARK_PORT, args.gateway, args.request_timeout)
+        )
+    finally:
+        process.terminate()
+        process.join()
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Vrátí seznam regresí oproti uloženému výsledku."""
+    regressions = []
+    previous = {row["inverters"]: row for row in baseline}
+    for row in results:
+        old = previous.get(row["inverters"])
+        if old is None:
+            continue
+        for metric in ("cycle_ms_mean", "cpu_ms_per_cycle"):
+            if row[metric] > old[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{row['inverters']} střídač(ů): {metric} {old[metric]:.2f} -> {row[metric]:.2f}"
+                )
+        for metric in ("requests_per_cycle", "cold_requests"):
+            if row[metric] > old[metric]:
+                regressions.append(
+                    f"{row['inverters']} střídač(ů): {metric} {old[metric]:g} -> {row[metric]:g}"
+                )
+    return regressions
+
+
+def main() -> int:
+    """Vstupní bod příkazové řádky."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inverters", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--cycles", type=int, default=20, help="počet ustálených cyklů")
+    parser.add_argument("--gateway", action="store_true", help="všechny střídače za jednou bránou")
+    parser.add_argument("--request-timeout", type=int, default=const.DEFAULT_REQUEST_TIMEOUT)
+    parser.add_argument("--json", type=Path, help="uloží výsledky do souboru")
+    parser.add_argument("--compare", type=Path, help="porovná s dříve uloženými výsledky")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="povolené zhoršení (0.2 = 20 %%)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    results = [run_benchmark(args, inverters) for inverters in args.inverters]
+
+    header = f"{'inv':>4} {'cold ms':>9} {'cold req':>8} {'cycle ms':>9} {'p95 ms':>9} {'cpu ms':>8} {'req/cyc':>8} {'KiB/inv':>8} {'fail':>5}"
+    print(header)
+    for row in results:
+        print(
+            f"{row['inverters']:>4} {row['cold_cycle_ms']:>9.1f} {row['cold_requests']:>8} "
+            f"{row['cycle_ms_mean']:>9.1f} {row['cycle_ms_p95']:>9.1f} {row['cpu_ms_per_cycle']:>8.2f} "
+            f"{row['requests_per_cycle']:>8.1f} {row['memory_kib_per_inverter']:>8.1f} {row['failed_cycles']:>5}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESE: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+# custom_components/sunway_fve/tools/simulator.py
+"""Offline simulátor střídače Sunway (pymodbus server) pro vývoj a benchmarky.
+
+Registry se naplní podle SENSOR_DESCRIPTIONS a RW_REGISTER_MAP integrace,
+takže coordinator čte stejné bloky jako ze skutečného zařízení. Zařízení
+lze zpomalit (latence + jitter), omezit počet souběžně zpracovávaných
+požadavků (jako levný Wi-Fi dongle) a nechat náhodně vracet chyby nebo
+neodpovídat vůbec. Rozsahy zadané jako --hole zařízení neimplementuje
+(vrací Illegal Data Address), jako modely bez baterie nebo elektroměru.
+
+Použití (z adresáře integrace, v prostředí s Home Assistant):
+
+    python tools/simulator.py --port 5020 --inverters 3 --latency 0.05 --jitter 0.02
+
+Každý střídač poslouchá na vlastním portu (port, port + 1, ...); s volbou
+--gateway jsou všechny za jednou bránou na jednom portu se slave ID 1..N.
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import random
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pymodbus.datastore import ModbusSequentialDataBlock, ModbusServerContext, ModbusSlaveContext
+from pymodbus.server import ModbusTcpServer
+
+# Integrace se importuje jako balíček podle názvu svého adresáře (sunway_fve)
+INTEGRATION_DIR = Path(__file__).resolve().parents[1]
+if str(INTEGRATION_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(INTEGRATION_DIR.parent))
+const = importlib.import_module(f"{INTEGRATION_DIR.name}.const")
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rozsahy náhodných surových hodnot podle datového typu
+_RAW_RANGES = {"U16": (0, 2000), "I16": (-1000, 1000), "U32": (0, 100000), "I32": (-50000, 50000)}
+_STRUCT_FORMATS = {"U16": ">H", "I16": ">h", "U32": ">I", "I32": ">i"}
+
+# Stav "On Grid" - simulovaný střídač vyrábí
+SIMULATED_RUNNING_STATUS = 2
+
+
+@dataclass
+class DeviceProfile:
+    """Chování simulovaného zařízení (dongle / brány)."""
+
+    latency: float = 0.0 # základní doba zpracování požadavku (s)
+    jitter: float = 0.0 # náhodný rozptyl latence (± s)
+    max_in_flight: int = 1 # počet současně zpracovávaných požadavků, další čekají
+    error_rate: float = 0.0 # pravděpodobnost chybové odpovědi (Illegal Data Address)
+    drop_rate: float = 0.0 # pravděpodobnost, že zařízení vůbec neodpoví
+    holes: list[tuple[str, int, int]] = field(default_factory=list) # neimplementované (typ, adresa, počet)
+
+
+def _pack_registers(data_type: str, raw) -> list[int]:
+    """Zakóduje surovou hodnotu do 16bitových registrů."""
+    packed = struct.pack(_STRUCT_FORMATS[data_type], raw)
+    return list(struct.unpack(f">{len(packed) // 2}H", packed))
+
+
+def _seed_values(rng: random.Random, unit: int) -> dict[str, dict[int, int]]:
+    """Vytvoří hodnoty registrů (holding/input) pro jeden střídač."""
+    registers: dict[str, dict[int, int]] = {"holding": {}, "input": {}}
+    entries = [
+        (desc.key, desc.register_address, desc.register_count, desc.data_type, desc.register_type)
+        for desc in const.SENSOR_DESCRIPTIONS
+    ] + [
+        (key, params["address"], params.get("count", 1), params.get("data_type", "U16"),
+         params.get("register_type", "holding"))
+        for key, params in const.RW_REGISTER_MAP.items()
+    ]
+    for key, address, count, data_type, register_type in entries:
+        if data_type == "STR":
+            text = f"SIM{unit:04d}{key}".encode()[: count * 2].ljust(count * 2, b"\x00")
+            values = list(struct.unpack(f">{count}H", text))
+        elif key == const.ADAPTIVE_STATUS_KEY:
+            values = _pack_registers(data_type, SIMULATED_RUNNING_STATUS)
+        elif data_type in _RAW_RANGES:
+            values = _pack_registers(data_type, rng.randint(*_RAW_RANGES[data_type]))
+        else:
+            continue
+        for offset, value in enumerate(values):
+            registers[register_type][address + offset] = value
+    return registers
+
+
+class SimulatedInverterContext(ModbusSlaveContext):
+    """Datastore jednoho střídače se zpožděním a injekcí chyb."""
+
+    def __init__(self, registers: dict[str, dict[int, int]], profile: DeviceProfile,
+                 limiter: asyncio.Semaphore, rng: random.Random) -> None:
+        """Vytvoří datastore a naplní ho hodnotami."""
+        super().__init__(
+            hr=ModbusSequentialDataBlock(0, [0] * 65536),
+            ir=ModbusSequentialDataBlock(0, [0] * 65536),
+            zero_mode=True,
+        )
+        for register_type, fc in (("holding", 3), ("input", 4)):
+            for address, value in registers[register_type].items():
+                self.setValues(fc, address, [value])
+        self._profile = profile
+        self._limiter = limiter
+        self._rng = rng
+
+    def validate(self, fc_as_hex, address, count=1):
+        """Odmítne čtení neimplementovaných registrů a náhodně i další požadavky."""
+        register_type = "input" if fc_as_hex == 4 else "holding"
+        for hole_type, hole_address, hole_count in self._profile.holes:
+            if hole_type == register_type and address < hole_address + hole_count and hole_address < address + count:
+                return False
+        if self._profile.error_rate and self._rng.random() < self._profile.error_rate:
+            return False
+        return super().validate(fc_as_hex, address, count)
+
+    async def _delay(self) -> None:
+        """Simuluje dobu zpracování s omezeným souběhem."""
+        async with self._limiter:
+            delay = self._profile.latency + self._rng.uniform(-self._profile.jitter, self._profile.jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def async_getValues(self, fc_as_hex, address, count=1):
+        """Přečte hodnoty po simulované latenci."""
+        await self._delay()
+        return self.getValues(fc_as_hex, address, count)
+
+    async def async_setValues(self, fc_as_hex, address, values):
+        """Zapíše hodnoty po simulované latenci."""
+        await self._delay()
+        self.setValues(fc_as_hex, address, values)
+
+
+def _response_dropper(profile: DeviceProfile, rng: random.Random):
+    """Vrátí response_manipulator, který náhodně zahodí odpověď."""
+
+    def manipulate(response):
+        if profile.drop_rate and rng.random() < profile.drop_rate:
+            response.should_respond = False
+        return response, False
+
+    return manipulate
+
+
+async def async_start_simulator(
+    host: str = "127.0.0.1",
+    port: int = 5020,
+    inverters: int = 1,
+    gateway: bool = False,
+    profile: DeviceProfile | None = None,
+    seed: int = 1,
+) -> list[ModbusTcpServer]:
+    """Spustí simulované střídače a vrátí běžící servery.
+
+    Bez gateway má každý střídač vlastní port (a vlastní limit souběhu),
+    s gateway sdílí všechny jednu bránu a jeden limit.
+    """
+    profile = profile or DeviceProfile()
+    rng = random.Random(seed)
+    layout = [(port, tuple(range(1, inverters + 1)))] if gateway else [
+        (port + index, (1,)) for index in range(inverters)
+    ]
+    servers = []
+    unit = 0
+    for server_port, slaves in layout:
+        limiter = asyncio.Semaphore(max(1, profile.max_in_flight))
+        contexts = {}
+        for slave in slaves:
+            unit += 1
+            contexts[slave] = SimulatedInverterContext(_seed_values(rng, unit), profile, limiter, rng)
+        server = ModbusTcpServer(
+            ModbusServerContext(slaves=contexts, single=False),
+            address=(host, server_port),
+            response_manipulator=_response_dropper(profile, rng),
+        )
+        asyncio.create_task(server.serve_forever())
+        servers.append(server)
+        _LOGGER.info(f"Simulátor {host}:{server_port}, slave ID {list(slaves)}")
+    await asyncio.sleep(0.2) # servery začnou poslouchat
+    return servers
+
+
+def _parse_hole(value: str) -> tuple[str, int, int]:
+    """Převede 'typ:adresa:počet' na rozsah registrů."""
+    register_type, address, count = value.split(":")
+    if register_type not in ("holding", "input"):
+        raise argparse.ArgumentTypeError(f"Neznámý typ registru: {register_type}")
+    return register_type, int(address), int(count)
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Přidá parametry chování zařízení do parseru."""
+    parser.add_argument("--latency", type=float, default=0.0, help="doba zpracování požadavku (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="náhodný rozptyl latence (± s)")
+    parser.add_argument("--max-in-flight", type=int, default=1, help="souběžně zpracovávané požadavky")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="podíl chybových odpovědí (0-1)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="podíl požadavků bez odpovědi (0-1)")
+    parser.add_argument(
+        "--hole", type=_parse_hole, action="append", default=[],
+        help="neimplementovaný rozsah typ:adresa:počet, např. input:43000:20 (lze opakovat)",
+    )
+
+
+def profile_from_args(args: argparse.Namespace) -> DeviceProfile:
+    """Sestaví DeviceProfile z parametrů příkazové řádky."""
+    return DeviceProfile(
+        latency=args.latency,
+        jitter=args.jitter,
+        max_in_flight=args.max_in_flight,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        holes=args.hole,
+    )
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Spustí simulátor a běží do přerušení."""
+    await async_start_simulator(
+        args.host, args.port, args.inverters, args.gateway, profile_from_args(args), args.seed
+    )
+    await asyncio.Event().wait()
+
+
+def main() -> None:
+    """Vstupní bod příkazové řádky."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--inverters", type=int, default=1)
+    parser.add_argument("--gateway", action="store_true", help="všechny střídače za jednou bránou")
+    parser.add_argument("--seed", type=int, default=1)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# custom_components/sunway_fve/transport.py
+"""Konfigurace transportu (Modbus TCP, RTU přes sériovou linku, RTU přes TCP)."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+
+from .const import (
+    CONF_TRANSPORT,
+    CONF_SERIAL_PORT,
+    CONF_BAUDRATE,
+    CONF_PARITY,
+    CONF_STOPBITS,
+    CONF_BYTESIZE,
+    TRANSPORT_TCP,
+    TRANSPORT_RTU_OVER_TCP,
+    TRANSPORT_SERIAL,
+    DEFAULT_BAUDRATE,
+    DEFAULT_PARITY,
+    DEFAULT_STOPBITS,
+    DEFAULT_BYTESIZE,
+)
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """Parametry fyzického spojení se střídačem."""
+
+    transport: str = TRANSPORT_TCP
+    host: str | None = None
+    port: int | None = None
+    serial_port: str | None = None
+    baudrate: int = DEFAULT_BAUDRATE
+    parity: str = DEFAULT_PARITY
+    stopbits: int = DEFAULT_STOPBITS
+    bytesize: int = DEFAULT_BYTESIZE
+
+    @classmethod
+    def from_entry_data(cls, data: dict[str, Any]) -> "TransportConfig":
+        """Sestaví konfiguraci z dat config entry (starší záznamy jsou TCP)."""
+        return cls(
+            transport=data.get(CONF_TRANSPORT, TRANSPORT_TCP),
+            host=data.get(CONF_HOST),
+            port=data.get(CONF_PORT),
+            serial_port=data.get(CONF_SERIAL_PORT),
+            baudrate=data.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+            parity=data.get(CONF_PARITY, DEFAULT_PARITY),
+            stopbits=data.get(CONF_STOPBITS, DEFAULT_STOPBITS),
+            bytesize=data.get(CONF_BYTESIZE, DEFAULT_BYTESIZE),
+        )
+
+    @property
+    def endpoint(self) -> str:
+        """Identifikace spojení pro logy ("host:port" nebo sériový port)."""
+        if self.transport == TRANSPORT_SERIAL:
+            return self.serial_port
+        return f"{self.host}:{self.port}"
+
+    @property
+    def is_rtu(self) -> bool:
+        """True pro RTU rámce (sériová linka nebo transparentní brána)."""
+        return self.transport in (TRANSPORT_SERIAL, TRANSPORT_RTU_OVER_TCP)
+
+    @property
+    def frame_overhead(self) -> int:
+        """Bajty rámce navíc k PDU: hlavička MBAP (TCP) nebo adresa + CRC (RTU)."""
+        return 3 if self.is_rtu else 7
+
+    @property
+    def inter_frame_delay(self) -> float:
+        """Povinná pauza mezi RTU rámci (t3.5) v sekundách; pro TCP 0.
+
+        Podle specifikace Modbus RTU je nad 19200 Bd pevně 1.75 ms.
+        """
+        if not self.is_rtu:
+            return 0.0
+        if self.baudrate > 19200:
+            return 0.00175
+        bits_per_char = 1 + self.bytesize + self.stopbits + (0 if self.parity == "N" else 1)
+        return 3.5 * bits_per_char / self.baudrate
+
+    def create_client(self, timeout: float):
+        """Vytvoří pymodbus klienta pro daný transport.
+
+        Automatické obnovení spojení v pymodbus je vypnuté (reconnect_delay=0),
+        obnovu s backoffem řídí ModbusConnectionManager.
+        """
+        if self.transport == TRANSPORT_SERIAL:
+            return AsyncModbusSerialClient(
+                self.serial_port,
+                framer="rtu",
+                baudrate=self.baudrate,
+                parity=self.parity,
+                stopbits=self.stopbits,
+                bytesize=self.bytesize,
+                timeout=timeout,
+                reconnect_delay=0,
+            )
+        if self.transport == TRANSPORT_RTU_OVER_TCP:
+            return AsyncModbusTcpClient(
+                self.host, port=self.port, framer="rtu", timeout=timeout, reconnect_delay=0
+            )
+        return AsyncModbusTcpClient(self.host, port=self.port, timeout=timeout, reconnect_delay=0)
@@ -0,0 +1,82 @@
+# custom_components/sunway_fve/value_store.py
+"""Předalokované úložiště hodnot coordinatora (jeden slot na hodnotu indexu)."""
+
+from array import array
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .register_index import RegisterIndex
+
+
+class ValueStore(Mapping):
+    """Hodnoty, platnost a čas poslední aktualizace podle slotů indexu.
+
+    Úložiště se alokuje jednou a každý cyklus se aktualizuje na místě.
+    Entity čtou hodnotu přímo podle slotu (value); pro diagnostiku a
+    starší kód se chová i jako read-only slovník klíč -> platná hodnota.
+    Sloty, jejichž hodnota nebo platnost se od posledního pop_changed
+    změnila, se sbírají do seznamu changed.
+    """
+
+    __slots__ = ("index", "values", "previous", "valid", "updated_at", "dirty", "changed")
+
+    def __init__(self, index: RegisterIndex) -> None:
+        """Alokuje sloty pro všechny hodnoty indexu (zatím neplatné)."""
+        size = len(index)
+        self.index = index
+        self.values: list[Any] = [None] * size
+        self.previous: list[Any] = [None] * size # hodnota před poslední aktualizací (None = nebyla platná)
+        self.valid = bytearray(size)
+        self.updated_at = array("d", bytes(8 * size)) # čas smyčky poslední aktualizace
+        self.dirty = bytearray(size)
+        self.changed: list[int] = []
+
+    def value(self, slot: int) -> Any | None:
+        """Platná hodnota slotu, jinak None."""
+        return self.values[slot] if self.valid[slot] else None
+
+    def set(self, slot: int, value: Any, now: float) -> None:
+        """Zapíše hodnotu slotu."""
+        old = self.values[slot] if self.valid[slot] else None
+        if old is None or old != value:
+            self.mark_changed(slot)
+        self.previous[slot] = old
+        self.values[slot] = value
+        self.valid[slot] = 1
+        self.updated_at[slot] = now
+
+    def invalidate(self, slot: int) -> None:
+        """Označí hodnotu slotu jako neplatnou (čtení selhalo)."""
+        if self.valid[slot]:
+            self.valid[slot] = 0
+            self.mark_changed(slot)
+
+    def mark_changed(self, slot: int) -> None:
+        """Zařadí slot mezi změněné (nejvýše jednou)."""
+        if not self.dirty[slot]:
+            self.dirty[slot] = 1
+            self.changed.append(slot)
+
+    def pop_changed(self) -> list[int]:
+        """Vrátí změněné sloty a začne sbírat znovu."""
+        changed = self.changed
+        for slot in changed:
+            self.dirty[slot] = 0
+        self.changed = []
+        return changed
+
+    def __getitem__(self, key: str) -> Any:
+        """Platná hodnota podle klíče."""
+        slot = self.index.slot_by_key[key]
+        if not self.valid[slot]:
+            raise KeyError(key)
+        return self.values[slot]
+
+    def __iter__(self) -> Iterator[str]:
+        """Klíče platných hodnot."""
+        keys = self.index.keys
+        return (keys[slot] for slot, valid in enumerate(self.valid) if valid)
+
+    def __len__(self) -> int:
+        """Počet platných hodnot."""
+        return sum(self.valid)
@@ -0,0 +1,82 @@
+# custom_components/sunway_fve/write_queue.py
+"""Sdružování a potlačení zápisů rychle se měnících RW hodnot.
+
+Posuvník nebo automatizace, která hledá hodnotu, pošle během chvíle
+mnoho zápisů téže hodnoty; každý by skončil ve flash paměti střídače.
+Fronta drží poslední požadovanou hodnotu každého klíče po dobu okna,
+pak zapíše jednou dávkou jen hodnoty, které se liší od potvrzeného stavu
+zařízení. Sousední registry dávky zapíše coordinator jedním požadavkem.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WriteCoalescer:
+    """Zápisy RW hodnot sdružené v časovém okně (poslední hodnota vyhrává)."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write: Callable[[dict[str, Any]], Awaitable[bool]],
+        is_confirmed: Callable[[str, Any], bool],
+        window: float,
+    ) -> None:
+        """write zapíše dávku hodnot, is_confirmed ověří shodu s potvrzeným stavem."""
+        self._hass = hass
+        self._write = write
+        self._is_confirmed = is_confirmed
+        self.window = window
+        self._pending: dict[str, Any] = {}
+        self._batch: asyncio.Future | None = None # výsledek dávky pro všechny čekající
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self.coalesced = 0 # hodnoty přepsané novější hodnotou ještě před zápisem
+        self.skipped = 0 # hodnoty shodné s potvrzeným stavem (nezapsané)
+
+    @property
+    def pending(self) -> dict[str, Any]:
+        """Hodnoty čekající na zápis."""
+        return dict(self._pending)
+
+    async def async_write(self, key: str, value: Any) -> bool:
+        """Zařadí hodnotu do dávky a počká na její zápis."""
+        if key in self._pending:
+            self.coalesced += 1
+        self._pending[key] = value
+        if self._batch is None:
+            self._batch = asyncio.get_running_loop().create_future()
+            # Okno začíná prvním zápisem - při trvalém tažení se zapisuje nejpozději po window
+            self._unsub_flush = async_call_later(self._hass, self.window, self._async_flush)
+        return await asyncio.shield(self._batch)
+
+    async def async_flush(self) -> None:
+        """Zapíše čekající dávku hned (např. při ukončení)."""
+        if self._batch is not None:
+            await self._async_flush()
+
+    async def _async_flush(self, _now=None) -> None:
+        """Zapíše hodnoty dávky, které se liší od potvrzeného stavu."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        pending, self._pending = self._pending, {}
+        batch, self._batch = self._batch, None
+        if batch is None:
+            return
+        values = {key: value for key, value in pending.items() if not self._is_confirmed(key, value)}
+        self.skipped += len(pending) - len(values)
+        if not values:
+            _LOGGER.debug(f"Zápis {pending} vynechán - shoduje se s potvrzeným stavem")
+            batch.set_result(True)
+            return
+        try:
+            batch.set_result(await self._write(values))
+        except Exception as err:
+            batch.set_exception(err)